@@ -0,0 +1,313 @@
+"""Batched account book for multi-player sessions.
+
+One price stream can drive hundreds of players (a classroom or tournament
+session). Instead of one Account object per player, AccountBook keeps every
+player's state in NumPy arrays (balance, position, entry price, margin,
+realized P&L), so a tick marks all players to market, updates margin usage
+and runs the liquidation check in one vectorized step.
+
+The per-player trading rules are those of engine.Account: 10% margin, one
+net position at a time, margin released and P&L realized on close.
+``book.account(i)`` returns an Account-compatible view of one player, e.g.
+for SimulationEngine or the single-player UI.
+
+    python account_book.py test
+    python account_book.py bench [players]
+"""
+import sys
+
+import numpy as np
+
+
+class AccountBook:
+    """Accounts of many players stored column-wise.
+
+    Args:
+        initial_balance (float): Starting cash of every player.
+        lot_size (int): Contract multiplier applied to P&L.
+        margin_rate (float): Fraction of notional locked as margin on open.
+        maintenance_rate (float): A player is liquidated when equity falls
+            below this fraction of the margin they hold.
+        capacity (int): Initial number of player slots (grows as needed).
+    """
+    def __init__(self, initial_balance=100000.0, lot_size=1, margin_rate=0.1,
+                 maintenance_rate=0.5, capacity=64):
+        self.initial_balance = float(initial_balance)
+        self.lot_size = lot_size
+        self.margin_rate = margin_rate
+        self.maintenance_rate = maintenance_rate
+        self.names = []
+        self._ids = {}
+        self.n = 0
+        self._alloc(capacity)
+        self.last_price = 0.0
+
+    def _alloc(self, capacity):
+        old = getattr(self, "_cols", None)
+        self._cols = {
+            "balance": np.zeros(capacity),
+            "position": np.zeros(capacity, dtype=np.int64),
+            "entry": np.zeros(capacity),
+            "margin": np.zeros(capacity),
+            "realized": np.zeros(capacity),
+            "floating": np.zeros(capacity),
+            "liquidated": np.zeros(capacity, dtype=bool),
+        }
+        if old is not None:
+            for key, col in self._cols.items():
+                col[:self.n] = old[key][:self.n]
+
+    # Views of the live players (length n)
+    @property
+    def balance(self):
+        return self._cols["balance"][:self.n]
+
+    @property
+    def position(self):
+        return self._cols["position"][:self.n]
+
+    @property
+    def entry(self):
+        return self._cols["entry"][:self.n]
+
+    @property
+    def margin(self):
+        return self._cols["margin"][:self.n]
+
+    @property
+    def realized(self):
+        return self._cols["realized"][:self.n]
+
+    @property
+    def floating(self):
+        return self._cols["floating"][:self.n]
+
+    @property
+    def liquidated(self):
+        return self._cols["liquidated"][:self.n]
+
+    def equity(self):
+        """Cash + margin held + floating P&L, per player."""
+        return self.balance + self.margin + self.floating
+
+    def __len__(self):
+        return self.n
+
+    # ---------- Players ----------
+    def add_player(self, name):
+        """Register a player (or return the existing id for the name)."""
+        name = str(name)
+        if name in self._ids:
+            return self._ids[name]
+        if self.n == len(self._cols["balance"]):
+            self._alloc(2 * self.n)
+        i = self.n
+        self.n += 1
+        self.names.append(name)
+        self._ids[name] = i
+        self.balance[i] = self.initial_balance
+        return i
+
+    def player_id(self, name):
+        return self._ids[str(name)]
+
+    def account(self, i):
+        """Account-compatible view of player i."""
+        return BookAccount(self, i)
+
+    # ---------- Trading (vectorized over player ids) ----------
+    def open(self, ids, quantities, price):
+        """
+        Open positions for several players at one price (quantity > 0 long, < 0 short).
+
+        Players that already hold a position, were liquidated, or cannot cover the
+        margin are skipped; a player listed twice fills at most once (the first order
+        that can), as if the orders ran one by one. Returns a boolean mask (per id) of fills.
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        qty = np.broadcast_to(np.asarray(quantities, dtype=np.int64), ids.shape)
+        need = price * np.abs(qty) * self.margin_rate
+        can = (qty != 0) & (self.position[ids] == 0) & ~self.liquidated[ids] & (self.balance[ids] >= need)
+        candidates = np.flatnonzero(can)
+        _uniq, first = np.unique(ids[candidates], return_index=True)
+        ok = np.zeros(ids.shape, dtype=bool)
+        ok[candidates[first]] = True
+        filled = ids[ok]
+        self.position[filled] = qty[ok]
+        self.entry[filled] = price
+        self.margin[filled] = need[ok]
+        self.balance[filled] -= need[ok]
+        return ok
+
+    def close(self, ids, price):
+        """Close the positions of several players; returns realized P&L per id (0 if flat, or if repeated)."""
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        unique, first = np.unique(ids, return_index=True)
+        pnl = np.zeros(ids.shape, dtype=np.float64)
+        closed = (price - self.entry[unique]) * self.position[unique] * self.lot_size
+        closed[self.position[unique] == 0] = 0.0
+        pnl[first] = closed
+        ids = unique
+        self.balance[ids] += closed + self.margin[ids]
+        self.realized[ids] += closed
+        self.position[ids] = 0
+        self.entry[ids] = 0.0
+        self.margin[ids] = 0.0
+        self.floating[ids] = 0.0
+        return pnl
+
+    # ---------- Per tick ----------
+    def mark(self, price):
+        """Floating P&L of every player at price (one vectorized pass)."""
+        self.last_price = price
+        np.multiply(price - self.entry, self.position, out=self.floating)
+        if self.lot_size != 1:
+            self.floating *= self.lot_size
+        return self.floating
+
+    def step(self, price):
+        """
+        Mark everyone to market and liquidate under-margined players.
+
+        Returns:
+            ids (np.ndarray) of players liquidated on this tick.
+        """
+        self.mark(price)
+        under = (self.position != 0) & (self.equity() < self.maintenance_rate * self.margin)
+        ids = np.flatnonzero(under)
+        if len(ids):
+            self.close(ids, price)
+            self.liquidated[ids] = True
+        return ids
+
+    def summary(self):
+        """(final_balance, profit_loss, return_rate_pct) arrays, as engine.SimulationEngine.summary."""
+        pl = self.balance + self.margin - self.initial_balance
+        return self.balance + self.margin, pl, pl / self.initial_balance * 100.0
+
+    def leaderboard(self, k=10):
+        """[(name, equity)] of the top-k players by equity at the last mark."""
+        equity = self.equity()
+        k = min(k, self.n)
+        top = np.argpartition(-equity, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+        top = top[np.argsort(-equity[top], kind="stable")]
+        return [(self.names[i], float(equity[i])) for i in top]
+
+
+class BookAccount:
+    """One player of an AccountBook with the engine.Account interface."""
+    def __init__(self, book, i):
+        self.book = book
+        self.i = i
+        self.name = book.names[i]
+        self.initial_balance = book.initial_balance
+        self.lot_size = book.lot_size
+
+    @property
+    def balance(self):
+        return float(self.book.balance[self.i])
+
+    @property
+    def position(self):
+        return int(self.book.position[self.i])
+
+    @property
+    def entry_price(self):
+        return float(self.book.entry[self.i])
+
+    @property
+    def realized_pnl(self):
+        return float(self.book.realized[self.i])
+
+    def _open(self, price, quantity):
+        if self.position != 0:
+            return "Existing a position, please close first.", False
+        if not self.book.open(self.i, quantity, price)[0]:
+            return "Insufficient funds to open a position.", False
+        side = "long" if quantity > 0 else "short"
+        return (f"Successfully {side} {abs(quantity)} lots @ {price:.2f}, "
+                f"margin used: {self.book.margin[self.i]:.2f}."), True
+
+    def buy(self, price, quantity):
+        return self._open(price, quantity)
+
+    def sell(self, price, quantity):
+        return self._open(price, -quantity)
+
+    def close_position(self, current_price):
+        pos = self.position
+        if pos == 0:
+            return "No positions to close.", 0.0
+        margin_released = float(self.book.margin[self.i])
+        pnl = float(self.book.close(self.i, current_price)[0])
+        msg = (f"Position closed successfully ({'long' if pos>0 else 'short'} {abs(pos)} lots)! "
+               f"Profit and loss for this period: {pnl:.2f}, released margin: {margin_released:.2f}. "
+               f"Account balance: {self.balance:.2f}.")
+        return msg, pnl
+
+    def floating_pnl(self, current_price):
+        if self.position == 0:
+            return 0.0
+        return (current_price - self.entry_price) * self.position * self.lot_size
+
+
+if __name__ == "__main__":
+    if "test" in sys.argv:
+        from engine import Account
+        print("Tests begin.")
+        book = AccountBook(initial_balance=10000)
+        ids = [book.add_player(f"p{i}") for i in range(100)]
+        acc = book.account(ids[0])
+        ref = Account(initial_balance=10000)
+        for a in (acc, ref):
+            a.buy(1000, 1)
+        print("Buy Test:", acc.balance == ref.balance, "Balance:", acc.balance)
+        book.mark(1010)
+        print("Floating Test:", book.floating[0] == ref.floating_pnl(1010))
+        print("Close Test:", acc.close_position(1020)[1] == ref.close_position(1020)[1], acc.balance == ref.balance)
+
+        # Everyone shorts 8 lots; a rally liquidates those without enough cash behind the margin
+        book.open(ids, -8, 1000.0)
+        book.balance[:50] = 0.0
+        gone = book.step(1070.0)
+        print("Liquidation Test:", len(gone), "liquidated; ids 0-49 only:", bool(np.all(gone < 50)))
+        print("Leaderboard:", book.leaderboard(3))
+
+        # A player listed twice in one batch fills once, as sequential orders would
+        book = AccountBook(initial_balance=10000)
+        a, b = book.add_player("a"), book.add_player("b")
+        ok = book.open([a, a, b, b], [0, 2, 1, 3], 1000.0)
+        refs = [Account(initial_balance=10000) for _ in range(2)]
+        fills = [refs[i].buy(1000.0, q)[1] if q else False for i, q in ((0, 0), (0, 2), (1, 1), (1, 3))]
+        pnl = book.close([a, b, a], 1100.0)
+        ref_pnl = [refs[0].close_position(1100.0)[1], refs[1].close_position(1100.0)[1], 0.0]
+        print("Duplicate Ids Test:", ok.tolist() == fills, pnl.tolist() == ref_pnl,
+              book.balance[[a, b]].tolist() == [r.balance for r in refs], pnl.sum() == book.realized.sum())
+        print("Tests finish.")
+
+    elif "bench" in sys.argv:
+        import time
+        from engine import Account
+        n = int(sys.argv[sys.argv.index("bench") + 1]) if len(sys.argv) > sys.argv.index("bench") + 1 else 500
+        prices = 900 + np.cumsum(np.random.default_rng(0).normal(0, 10, 253))
+
+        accounts = [Account() for _ in range(n)]
+        for i, a in enumerate(accounts):
+            a.buy(prices[0], 1 + i % 5) if i % 2 else a.sell(prices[0], 1 + i % 5)
+        t = time.perf_counter()
+        for p in prices:
+            floating = [a.floating_pnl(p) for a in accounts]
+            _ = [a.balance + a.entry_price * abs(a.position) * 0.1 + f for a, f in zip(accounts, floating)]
+        t_loop = time.perf_counter() - t
+
+        book = AccountBook()
+        for i in range(n):
+            book.add_player(i)
+        q = 1 + np.arange(n) % 5
+        book.open(np.arange(n), np.where(np.arange(n) % 2, q, -q), prices[0])
+        t = time.perf_counter()
+        for p in prices:
+            book.step(p)
+        t_book = time.perf_counter() - t
+        print(f"{n} players x {len(prices)} ticks: per-account loop {t_loop * 1e6 / len(prices):.1f} us/tick, "
+              f"AccountBook.step {t_book * 1e6 / len(prices):.1f} us/tick")
@@ -0,0 +1,236 @@
+"""Parallel grid-search backtester over the historical price files.
+
+Every combination of strategy parameters (see strategies.py) is played over
+each price CSV (gold_2008.csv by default) under the game's Account margin
+rules, headless and without random news. Combinations fan out over a process
+pool; the price columns are copied once into a shared-memory block that every
+worker attaches by name, so tasks only carry a strategy name and parameters.
+Results stream back as they finish and are summarised, best return first.
+
+A grid is "Strategy:param=v1,v2;param=v1,..." (values are Python literals,
+module:Strategy works too); repeat --grid for several strategies:
+
+    python backtest.py
+    python backtest.py --grid "Momentum:lookback=5,10,20;qty=1,5" --grid MeanReversion:band=0.01,0.02
+    python backtest.py --prices gold_2008.csv other.csv --csv grid.csv
+    python backtest.py bench
+"""
+import argparse
+import ast
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from montecarlo import load_strategy, make_strategy, play_session
+from pricecache import load_prices, to_price_df
+
+DEFAULT_GRID = [
+    "Momentum:lookback=2,3,5,8,10,15,20,30,40,60;qty=1,2,5",
+    "MeanReversion:window=5,10,20,40,60;band=0.005,0.01,0.02,0.03,0.05;qty=1,2,5",
+    "NewsTrader:hold=1,2,3,5,10;qty=1,5",
+    "BuyAndHold:qty=1,5",
+]
+COLUMNS = ("return_pct", "max_drawdown_pct", "min_equity", "orders")
+
+
+def parse_grid(spec):
+    """Expand "Strategy:a=1,2;b=x" into [(strategy spec, {a: 1, b: x}), ...] (Cartesian product)."""
+    name, sep, params = spec.rpartition(":")
+    if not sep or "=" not in params:  # no parameters: "Strategy" or "module:Strategy"
+        name, params = spec, ""
+    axes = {}
+    for part in filter(None, params.split(";")):
+        key, _, values = part.partition("=")
+        axes[key.strip()] = [ast.literal_eval(v.strip()) for v in values.split(",")]
+    return [(name, dict(zip(axes, combo))) for combo in itertools.product(*axes.values())]
+
+
+# =============== Shared price columns ===============
+class SharedPrices:
+    """All price files' dates (int64 ns) and closes (float64) in one shared-memory block.
+
+    Created in the parent with SharedPrices.create(); workers get the small
+    picklable `spec` (block name + per-file offsets) and call attach().
+    """
+    def __init__(self, shm, layout, owner):
+        self.shm = shm
+        self.layout = layout        # [(csv name, start, length)], rows into both columns
+        self.owner = owner
+        total = sum(n for _name, _start, n in layout)
+        self.dates = np.ndarray(total, dtype=np.int64, buffer=shm.buf)
+        self.closes = np.ndarray(total, dtype=np.float64, buffer=shm.buf, offset=total * 8)
+
+    @classmethod
+    def create(cls, csv_files):
+        columns = [load_prices(f) for f in csv_files]
+        layout, start = [], 0
+        for f, (dates, _closes) in zip(csv_files, columns):
+            layout.append((f, start, len(dates)))
+            start += len(dates)
+        shm = shared_memory.SharedMemory(create=True, size=max(start, 1) * 16)
+        shared = cls(shm, layout, owner=True)
+        for (_f, s, n), (dates, closes) in zip(layout, columns):
+            shared.dates[s:s + n] = dates
+            shared.closes[s:s + n] = closes
+        return shared
+
+    @property
+    def spec(self):
+        return self.shm.name, self.layout
+
+    @classmethod
+    def attach(cls, spec):
+        name, layout = spec
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    def series(self, csv_file):
+        """(dates, closes) views of one file's rows, without copying."""
+        for f, s, n in self.layout:
+            if f == csv_file:
+                return self.dates[s:s + n], self.closes[s:s + n]
+        raise KeyError(csv_file)
+
+    def close(self):
+        self.dates = self.closes = None  # release the buffer views before closing the block
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# =============== Workers ===============
+_shared = None
+_frames = {}
+
+
+def _init_worker(spec):
+    """Pool initializer: attach the shared price block once per worker process."""
+    global _shared
+    _shared = SharedPrices.attach(spec)
+    _frames.clear()
+
+
+def _run_combo(job):
+    """Worker: play one (csv, strategy, params) combination; returns (job, metrics)."""
+    csv_file, strategy_spec, params = job
+    price_df = _frames.get(csv_file)
+    if price_df is None:
+        price_df = _frames[csv_file] = to_price_df(*_shared.series(csv_file))
+    strategy = make_strategy(load_strategy(strategy_spec), **params)
+    return job, play_session(price_df, strategy)
+
+
+def run_grid(csv_files, grids, workers=None, on_result=None):
+    """
+    Backtest every grid combination on every price file in a process pool.
+
+    Args:
+        csv_files (list): Price CSVs (loaded through the binary price cache).
+        grids (list): Grid specs, see parse_grid.
+        workers (int): Pool size (default: CPU count).
+        on_result (callable): Called as on_result(job, metrics, done, total) as results arrive.
+
+    Returns:
+        list of ((csv, strategy, params), (return %, max drawdown %, min equity, orders)), in completion order.
+    """
+    combos = [c for spec in grids for c in parse_grid(spec)]
+    for strategy_spec, params in combos:  # fail fast on a bad grid, before starting workers
+        make_strategy(load_strategy(strategy_spec), **params)
+    jobs = [(f, s, p) for f in csv_files for s, p in combos]
+    shared = SharedPrices.create(csv_files)
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.spec,)) as pool:
+            for future in as_completed([pool.submit(_run_combo, job) for job in jobs]):
+                job, metrics = future.result()
+                results.append((job, metrics))
+                if on_result is not None:
+                    on_result(job, metrics, len(results), len(jobs))
+    finally:
+        shared.close()
+    return results
+
+
+# =============== Output ===============
+def _label(strategy_spec, params):
+    args = ", ".join(f"{k}={v!r}" for k, v in params.items())
+    return f"{strategy_spec}({args})"
+
+
+def print_progress(job, metrics, done, total):
+    csv_file, strategy_spec, params = job
+    rr, dd, _min_equity, orders = metrics
+    print(f"[{done:>{len(str(total))}}/{total}] {os.path.basename(csv_file)} {_label(strategy_spec, params)}: "
+          f"return {rr:+.2f}%  drawdown {dd:.2f}%  orders {orders}", flush=True)
+
+
+def summary_table(results, top=20):
+    """Text table of the best `top` results by return (ties: smaller drawdown first)."""
+    ranked = sorted(results, key=lambda r: (-r[1][0], r[1][1]))[:top]
+    rows = [(os.path.basename(f), _label(s, p), f"{rr:+.2f}", f"{dd:.2f}", f"{eq:,.0f}", str(n))
+            for (f, s, p), (rr, dd, eq, n) in ranked]
+    header = ("prices", "strategy", "return %", "max dd %", "min equity", "orders")
+    widths = [max(len(r[i]) for r in rows + [header]) for i in range(len(header))]
+    lines = ["  ".join(h.ljust(w) if i < 2 else h.rjust(w) for i, (h, w) in enumerate(zip(header, widths)))]
+    for row in rows:
+        lines.append("  ".join(c.ljust(w) if i < 2 else c.rjust(w) for i, (c, w) in enumerate(zip(row, widths))))
+    return "\n".join(lines)
+
+
+def write_csv(path, results):
+    import csv
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("prices", "strategy", "params") + COLUMNS)
+        for (csv_file, strategy_spec, params), metrics in results:
+            writer.writerow((csv_file, strategy_spec, ";".join(f"{k}={v!r}" for k, v in params.items()))
+                            + tuple(metrics))
+
+
+def bench(grids=DEFAULT_GRID, csv_files=("gold_2008.csv",)):
+    """Time the same grid with 1 worker and with every core."""
+    cores = os.cpu_count() or 1
+    n = sum(len(parse_grid(g)) for g in grids) * len(csv_files)
+    timings = {}
+    for workers in sorted({1, cores}):
+        t = time.perf_counter()
+        run_grid(list(csv_files), grids, workers=workers)
+        timings[workers] = time.perf_counter() - t
+        print(f"{workers} worker(s): {n} backtests in {timings[workers]:.2f} s ({n / timings[workers]:.0f}/s)")
+    if cores > 1:
+        print(f"speedup on {cores} cores: {timings[1] / timings[cores]:.2f}x")
+    else:
+        print("only one core available: no speedup to measure")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grid-search backtests of scripted strategies over price files.")
+    parser.add_argument("--prices", nargs="+", default=["gold_2008.csv"], help="price CSV files")
+    parser.add_argument("--grid", action="append", help="Strategy:param=v1,v2;... (repeatable; default: a built-in grid)")
+    parser.add_argument("--workers", type=int, default=None, help=f"default: {os.cpu_count()}")
+    parser.add_argument("--top", type=int, default=20, help="rows in the summary table")
+    parser.add_argument("--quiet", action="store_true", help="do not print results as they arrive")
+    parser.add_argument("--csv", help="write every result to this CSV")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    results = run_grid(args.prices, args.grid or DEFAULT_GRID, args.workers,
+                       on_result=None if args.quiet else print_progress)
+    elapsed = time.perf_counter() - t
+    print(f"\n{len(results)} backtests in {elapsed:.1f} s ({len(results) / elapsed:.0f}/s)\n")
+    print(summary_table(results, args.top))
+    if args.csv:
+        write_csv(args.csv, results)
+        print("\nAll results written to", args.csv)
+
+
+if __name__ == "__main__":
+    if "bench" in sys.argv:
+        bench()
+    else:
+        main()
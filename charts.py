@@ -0,0 +1,209 @@
+"""Incremental chart rendering helpers for the Tk game windows.
+
+A full ``canvas.draw()`` re-rasterizes the title, grid, ticks and labels on
+every trading day. ``BlitLineChart`` draws the static parts once, caches them
+as a background bitmap, and per tick only restores that bitmap and paints
+the updated line on top. A full redraw happens only when the data grows past
+the current axis limits (or the window is resized).
+
+``ProfitChartWindow`` builds on it for the "Profit" popup: it keeps its
+artists alive between refreshes and stops its own timer when closed.
+"""
+import tkinter as tk
+
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+
+class BlitLineChart:
+    """Blit-based renderer for one line artist on a FigureCanvasTkAgg.
+
+    Args:
+        canvas: The FigureCanvasTkAgg that hosts the axes.
+        ax: Axes containing the line.
+        line: Line2D artist updated on each tick.
+        artists: Extra animated artists (e.g. a marker line or text) repainted with the line.
+        headroom (float): Extra y-range (fraction of the data span) added when
+            limits grow, so that a rising price does not force a redraw every day.
+    """
+    def __init__(self, canvas, ax, line, artists=(), headroom=0.1):
+        self.canvas = canvas
+        self.ax = ax
+        self.line = line
+        self.artists = (line,) + tuple(artists)
+        self.headroom = headroom
+
+        self.full_draws = 0
+        self.blits = 0
+
+        self._background = None
+        self._scaled = False      # y-limits set from data yet?
+        self._xmax = None
+        self._lo = np.inf
+        self._hi = -np.inf
+        self._seen = 0
+        self._style = None        # (marker, antialiased) saved while simplified
+
+        # Animated artists are skipped by canvas.draw(); we paint them ourselves.
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_x_extent(self, n_points):
+        """Fix the x-axis to the session length so only the y-range can grow."""
+        self._xmax = n_points
+        self.ax.set_xlim(0, n_points)
+
+    def update(self, x, y):
+        """Show new data; blit if it fits the current limits, else rescale and redraw."""
+        self.line.set_data(x, y)
+        n = len(y)
+        if n > self._seen:
+            new = np.asarray(y[self._seen:], dtype=np.float64)
+            self._lo = min(self._lo, float(new.min()))
+            self._hi = max(self._hi, float(new.max()))
+        elif n < self._seen:
+            # History was reset: rescan from scratch
+            arr = np.asarray(y, dtype=np.float64)
+            self._lo = float(arr.min()) if n else np.inf
+            self._hi = float(arr.max()) if n else -np.inf
+        self._seen = n
+
+        if self._background is None or not self._scaled or self._out_of_range(n):
+            self._rescale(n)
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.ax.bbox)
+        self.blits += 1
+
+    def redraw(self):
+        """Force a full redraw (also refreshes the cached background)."""
+        self._rescale(self._seen)
+        self.canvas.draw()
+
+    def set_simplified(self, simplified):
+        """Cheaper rendering for slow machines: no markers and no antialiasing on the line."""
+        if simplified:
+            if self._style is None:
+                self._style = (self.line.get_marker(), self.line.get_antialiased())
+            self.line.set_marker("None")
+            self.line.set_antialiased(False)
+        elif self._style is not None:
+            marker, antialiased = self._style
+            self.line.set_marker(marker)
+            self.line.set_antialiased(antialiased)
+            self._style = None
+
+    # ---------- internals ----------
+    def _out_of_range(self, n):
+        if self._seen == 0:
+            return False
+        y0, y1 = self.ax.get_ylim()
+        if self._lo < y0 or self._hi > y1:
+            return True
+        return self._xmax is None and n > self.ax.get_xlim()[1]
+
+    def _rescale(self, n):
+        if self._seen:
+            span = self._hi - self._lo
+            pad = max(span * self.headroom, abs(self._hi) * 0.01, 1e-9)
+            y0, y1 = self.ax.get_ylim() if self._scaled else (np.inf, -np.inf)
+            self.ax.set_ylim(min(y0, self._lo - pad), max(y1, self._hi + pad))
+            self._scaled = True
+        if self._xmax is None:
+            # Unknown session length: double the x-range whenever it fills up
+            self.ax.set_xlim(0, max(10, 2 * n))
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+        self.full_draws += 1
+
+
+class ProfitChartWindow:
+    """Popup showing the total profit history, refreshed incrementally.
+
+    The line, the dashed "current profit" level and its label are created once;
+    each refresh only pushes the new points and blits. The refresh timer is
+    cancelled when the window is destroyed, so closing and reopening the popup
+    never leaves extra loops running.
+
+    Args:
+        root: Parent Tk widget.
+        history (HistoryBuffer): Total P&L history to plot (e.g. engine.profit_history).
+        interval_ms (int): Refresh period.
+        x_extent (int): Session length, used to fix the x-axis.
+        line_color / level_color: Optional colors for the profit line and the current-profit level.
+        pacer (pacing.FramePacer): If given, the chart follows its quality level while open.
+    """
+    def __init__(self, root, history, interval_ms, x_extent=None, line_color=None, level_color=None, pacer=None):
+        self.history = history
+        self.pacer = pacer
+        self.interval_ms = interval_ms
+        self._drawn = 0
+        self._after_id = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Profit History")
+        self.window.geometry("1200x800")
+
+        # A plain Figure (not pyplot) so closed popups are garbage collected
+        self.fig = Figure(figsize=(5, 3))
+        self.ax = self.fig.add_subplot()
+        self.ax.set_title("Profit History", fontsize=14)
+        self.ax.set_xlabel("Time", fontsize=12)
+        self.ax.set_ylabel("Profit", fontsize=12)
+        (self.line,) = self.ax.plot([], [], marker='o', color=line_color, label='Profit')
+        self.level = self.ax.axhline(y=0.0, color=level_color, linestyle="--", label="Current profit")
+        self.level_text = self.ax.text(0.99, 0.02, "", transform=self.ax.transAxes, ha="right", fontsize=12)
+        self.ax.legend(loc='upper left')
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.window)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart = BlitLineChart(self.canvas, self.ax, self.line, artists=(self.level, self.level_text))
+        if x_extent:
+            self.chart.set_x_extent(x_extent)
+        if pacer is not None:
+            pacer.add_chart(self.chart)
+
+        self.window.bind("<Destroy>", self._on_destroy)
+        self.canvas.draw()
+        self.refresh()
+
+    def is_open(self):
+        return self.window is not None
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def refresh(self):
+        """Push points added since the last refresh, then reschedule."""
+        if self.window is None:
+            return
+        n = len(self.history)
+        if n != self._drawn:
+            values = self.history.view()
+            current = float(values[-1])
+            self.level.set_ydata([current, current])
+            self.level_text.set_text(f"Profit: {current:.2f}")
+            self.chart.update(self.history.indices(), values)
+            self._drawn = n
+        self._after_id = self.window.after(self.interval_ms, self.refresh)
+
+    def _on_destroy(self, event):
+        if event.widget is not self.window:
+            return
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        if self.pacer is not None:
+            self.pacer.remove_chart(self.chart)
+        self.window = None
@@ -0,0 +1,277 @@
+"""The game clock: one Tk timer that advances the session.
+
+Chaining root.after(interval, tick) from every tick has two problems: each
+delay is measured from when the previous callback happened to run, so render
+time and timer lateness add up (the "10 minute" game runs long), and every
+extra after() call (pause, resume, speed change) starts another parallel
+chain of ticks.
+
+GameClock keeps a single pending after() handle and schedules each tick
+against a deadline on time.monotonic(), so lateness is absorbed by the next
+delay instead of accumulating. Pause keeps the time left until the next day,
+and changing speed rescales it, so neither skips nor repeats a day.
+
+Turbo (fast-forward) mode swaps the per-day timer for a frame timer capped at
+TURBO_FPS: each frame advances a batch of days and the views render only the
+resulting state, so the rest of the year plays out in seconds.
+
+    python clock.py test
+"""
+import sys
+import time
+
+SPEEDS = (1, 2, 4, 16, 64)
+TURBO_FPS = 30
+TURBO_DAYS_PER_FRAME = 8
+
+
+class GameClock:
+    """Drift-compensating, pausable, variable-speed timer on a Tk widget.
+
+    Args:
+        root (tk.Misc): Widget whose event loop runs the ticks.
+        interval_ms (float): Time per trading day at x1 speed.
+        on_tick (callable): Called as on_tick(days) to advance `days` trading days:
+            1 per tick, or a batch per frame in turbo mode.
+        time_fn (callable): Monotonic time in seconds (for tests).
+    """
+    def __init__(self, root, interval_ms, on_tick, time_fn=time.monotonic):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.on_tick = on_tick
+        self.time_fn = time_fn
+        self.speed = 1
+        self.turbo = False
+        self.turbo_fps = TURBO_FPS
+        self.days_per_frame = TURBO_DAYS_PER_FRAME
+        self.running = False
+        self.ticks = 0              # trading days advanced
+        self.resyncs = 0            # times the clock fell a whole day behind and restarted its schedule
+        self._after_id = None
+        self._deadline = None       # monotonic time of the next tick while running
+        self._remaining = None      # seconds to the next tick while paused
+
+    @property
+    def period(self):
+        """Seconds per timer callback: one trading day at the current speed, or one turbo frame."""
+        if self.turbo:
+            return 1.0 / self.turbo_fps
+        return self.interval_ms / 1000.0 / self.speed
+
+    @property
+    def paused(self):
+        return not self.running and self._remaining is not None
+
+    def progress(self):
+        """How far into the current period the clock is, 0..1 (held while paused)."""
+        if self.running:
+            remaining = max(0.0, self._deadline - self.time_fn())
+        elif self._remaining is not None:
+            remaining = self._remaining
+        else:
+            return 0.0
+        return min(1.0, max(0.0, 1.0 - remaining / self.period))
+
+    # ---------- Control ----------
+    def start(self):
+        """Start (or restart) the clock; the first day follows one period from now."""
+        self._deadline = self.time_fn() + self.period
+        self._remaining = None
+        self.running = True
+        self._schedule()
+
+    def pause(self):
+        if not self.running:
+            return
+        self._remaining = max(0.0, self._deadline - self.time_fn())
+        self.running = False
+        self._cancel()
+
+    def resume(self):
+        if self.running or self._remaining is None:
+            return
+        self._deadline = self.time_fn() + self._remaining
+        self._remaining = None
+        self.running = True
+        self._schedule()
+
+    def toggle(self):
+        """Pause if running, else resume. Returns True if the clock is now running."""
+        if self.running:
+            self.pause()
+        else:
+            self.resume()
+        return self.running
+
+    def set_speed(self, speed):
+        """Change the speed multiplier; the wait for the pending day is rescaled to match."""
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        old = self.period
+        self.speed = speed
+        self._retime(old)
+
+    def cycle_speed(self, speeds=SPEEDS):
+        """Switch to the next of `speeds` (wrapping around). Returns the new speed."""
+        later = [s for s in speeds if s > self.speed]
+        self.set_speed(later[0] if later else speeds[0])
+        return self.speed
+
+    def set_turbo(self, on, days_per_frame=None, fps=None):
+        """Turn fast-forward on or off: `days_per_frame` days per frame, at most `fps` frames a second."""
+        old = self.period
+        self.turbo = bool(on)
+        if days_per_frame is not None:
+            self.days_per_frame = days_per_frame
+        if fps is not None:
+            self.turbo_fps = fps
+        self._retime(old)
+
+    def toggle_turbo(self):
+        """Switch fast-forward on/off. Returns True if turbo is now on."""
+        self.set_turbo(not self.turbo)
+        return self.turbo
+
+    def _retime(self, old_period):
+        """Rescale the wait for the pending callback after the period changed."""
+        ratio = self.period / old_period
+        if self.running:
+            now = self.time_fn()
+            self._deadline = now + max(0.0, self._deadline - now) * ratio
+            self._schedule()
+        elif self._remaining is not None:
+            self._remaining *= ratio
+
+    def stop(self):
+        """Stop for good (e.g. at the end of the game)."""
+        self.running = False
+        self._remaining = None
+        self._cancel()
+
+    # ---------- Scheduling ----------
+    def _schedule(self):
+        self._cancel()
+        delay_ms = max(0, round((self._deadline - self.time_fn()) * 1000))
+        self._after_id = self.root.after(delay_ms, self._fire)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _fire(self):
+        self._after_id = None
+        if not self.running:
+            return
+        days = self.days_per_frame if self.turbo else 1
+        self.ticks += days
+        self.on_tick(days)
+        if not self.running:  # on_tick paused or stopped the clock
+            return
+        self._deadline += self.period
+        now = self.time_fn()
+        if now - self._deadline > self.period:
+            # A whole day behind (window dragged, machine asleep): resync rather than burst through days
+            self._deadline = now
+            self.resyncs += 1
+        self._schedule()
+
+
+if __name__ == "__main__":
+    if "test" in sys.argv:
+        class VirtualRoot:
+            """Tk after()/after_cancel() on a virtual clock: run() jumps straight to each due callback."""
+            def __init__(self, late_ms=0.0):
+                self.now = 0.0
+                self.late = late_ms / 1000.0      # every timer fires this much late
+                self.timers = {}
+                self._ids = 0
+
+            def after(self, ms, fn):
+                self._ids += 1
+                self.timers[self._ids] = (self.now + ms / 1000.0 + self.late, fn)
+                return self._ids
+
+            def after_cancel(self, timer_id):
+                self.timers.pop(timer_id, None)
+
+            def run_until(self, t):
+                while self.timers:
+                    timer_id, (due, fn) = min(self.timers.items(), key=lambda kv: kv[1][0])
+                    if due > t:
+                        break
+                    del self.timers[timer_id]
+                    self.now = due
+                    fn()
+                self.now = max(self.now, t)
+
+        print("Tests begin.")
+
+        # Drift: 253 days at 100 ms/day, every timer 7 ms late and every tick costing 20 ms
+        root = VirtualRoot(late_ms=7)
+        days = []
+
+        def slow_tick(n):
+            days.append(root.now)
+            root.now += 0.020
+
+        clock = GameClock(root, 100, slow_tick, time_fn=lambda: root.now)
+        clock.start()
+        root.run_until(1000)
+        print(f"Drift Test: day 253 at {days[252]:.3f} s (ideal 25.300 s, naive chain "
+              f"{253 * (0.100 + 0.007 + 0.020):.3f} s) -> {abs(days[252] - 25.3) < 0.01}")
+
+        # Pause/resume/speed toggling never creates a second tick chain
+        root = VirtualRoot()
+        ticks = []
+        clock = GameClock(root, 100, lambda n: ticks.append(root.now), time_fn=lambda: root.now)
+        clock.start()
+        root.run_until(0.25)
+        for _ in range(50):
+            clock.toggle()
+            clock.toggle()
+            clock.cycle_speed()
+        single = len(root.timers) == 1
+        clock.set_speed(1)
+        root.run_until(1.25)
+        print(f"Single Chain Test: {len(ticks)} ticks in 1.25 s at x1, one pending timer -> "
+              f"{single and len(ticks) == 12}")
+
+        clock.pause()
+        root.run_until(10)
+        paused_ticks = len(ticks)
+        clock.resume()
+        root.run_until(10.05)
+        print(f"Pause Test: no ticks while paused, resumes after the remaining 50 ms -> "
+              f"{paused_ticks == 12 and len(ticks) == 13}")
+
+        for speed in SPEEDS:
+            clock.set_speed(speed)
+            n, t0 = len(ticks), root.now
+            root.run_until(t0 + 1.0)
+            print(f"Speed x{speed} Test: {len(ticks) - n} days/s (expect ~{10 * speed})")
+
+        clock.stop()
+        root.run_until(100)
+        print(f"Stop Test: no timers left -> {not root.timers}")
+
+        # Turbo: a batch of days per frame, frames capped at TURBO_FPS, and back
+        root = VirtualRoot()
+        frames = []
+        clock = GameClock(root, 2000, frames.append, time_fn=lambda: root.now)
+        clock.start()
+        t0 = root.now
+        clock.set_turbo(True)
+        root.run_until(t0 + 1.0)
+        clock.toggle()
+        root.run_until(t0 + 5.0)
+        clock.toggle()
+        root.run_until(t0 + 6.0)
+        print(f"Turbo Test: {len(frames)} frames in 2 running s (cap {2 * TURBO_FPS}), "
+              f"{clock.ticks} days -> {len(frames) <= 2 * TURBO_FPS and clock.ticks == TURBO_DAYS_PER_FRAME * len(frames)}")
+        clock.set_turbo(False)
+        n = len(frames)
+        root.run_until(root.now + 3.9)  # the pending frame's wait is rescaled (<= 2 s), then one day per 2 s
+        print(f"Turbo Off Test: back to one day per 2 s -> {frames[n:] in ([1], [1, 1])}")
+        clock.stop()
+        print("Tests finish.")
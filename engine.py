@@ -0,0 +1,367 @@
+"""Headless simulation engine for Gold Magnate.
+
+The engine owns the price series, the trading account, the news logic and the
+profit history, and advances the session one trading day per ``step()``.
+Nothing here touches Tkinter or matplotlib, so a full 2008 session can be
+replayed from a script in milliseconds; the Tk windows in ``game.py`` and
+``game_v2.py`` are thin views that call ``step()`` from their timers.
+
+Random breaking news is drawn for the whole session up front from the seed
+(news.NewsSchedule), so a session is reproducible from its seed (see
+journal.py for recording and replaying) and a tick is only array lookups.
+
+Example:
+    engine = SimulationEngine.from_csv("gold_2008.csv", random_news=True, seed=2008)
+    final_balance, pl, rr = engine.run()
+"""
+import random
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from history import HistoryBuffer
+from news import CATALOG, RANDOM_NEWS_POOL, NewsSchedule
+from pricecache import load_price_df
+
+
+# =============== Account class ===============
+class Account:
+    """A simple margin account used in the game.
+
+    Notes:
+        - Uses 10% margin for opening positions.
+        - Tracks one net position at a time (>0 long; <0 short; =0 flat).
+    """
+    def __init__(self, initial_balance=100000.0, lot_size=1, name="Player"):
+        self.name = str(name)
+        self.initial_balance = float(initial_balance)
+        self.balance = float(initial_balance)
+        self.position = 0                 # >0 long; <0 short; =0 no position
+        self.entry_price = 0.0            # last entry price
+        self.lot_size = lot_size
+        self.name = name
+        self.realized_pnl = 0.0           # sum of P&L booked by closed positions
+
+    def buy(self, price, quantity):
+        """Open a long position if there is no existing position."""
+        if self.position != 0:
+            return "Existing a position, please close first.", False
+        margin = price * quantity * 0.1
+        if self.balance >= margin:
+            self.position = quantity
+            self.entry_price = price
+            self.balance -= margin
+            return f"Successfully long {quantity} lots @ {price:.2f}, margin used: {margin:.2f}.", True
+        return "Insufficient funds to open a position.", False
+
+    def sell(self, price, quantity):
+        """Open a short position if there is no existing position."""
+        if self.position != 0:
+            return "Existing a position, please close first.", False
+        margin = price * quantity * 0.1
+        if self.balance >= margin:
+            self.position = -quantity
+            self.entry_price = price
+            self.balance -= margin
+            return f"Successfully short {quantity} lots @ {price:.2f}, margin used: {margin:.2f}.", True
+        return "Insufficient funds to open a position.", False
+
+    def close_position(self, current_price):
+        """Close current position, realize P&L, and release margin."""
+        if self.position == 0:
+            return "No positions to close.", 0.0
+        pnl = (current_price - self.entry_price) * self.position * self.lot_size
+        self.balance += pnl
+        self.realized_pnl += pnl
+        margin_released = abs(self.entry_price * self.position * 0.1)
+        self.balance += margin_released
+        pos = self.position
+        self.position = 0
+        self.entry_price = 0.0
+        msg = (f"Position closed successfully ({'long' if pos>0 else 'short'} {abs(pos)} lots)! "
+               f"Profit and loss for this period: {pnl:.2f}, released margin: {margin_released:.2f}. "
+               f"Account balance: {self.balance:.2f}.")
+        return msg, pnl
+
+    def floating_pnl(self, current_price):
+        """Compute unrealized P&L given the current price (0 if no position)."""
+        if self.position == 0:
+            return 0.0
+        return (current_price - self.entry_price) * self.position * self.lot_size
+
+
+@dataclass
+class TickResult:
+    """Everything a view needs to render one simulated trading day."""
+    idx: int
+    day: pd.Timestamp
+    price: float
+    date: str = ""               # the day as "YYYY-MM-DD"
+    news_text: str = ""
+    news_color: str = "black"
+    news_log: str = ""           # log line when random news moved the price
+    news_id: int = -1            # news.CATALOG code; SCHEDULED_NEWS; -1 for none
+    floating_pnl: float = 0.0
+    total_pnl: float = 0.0
+
+
+SCHEDULED_NEWS = -2  # TickResult.news_id of a day showing news_map text
+
+
+def new_seed():
+    """A fresh 63-bit session seed."""
+    return random.SystemRandom().randrange(1 << 63)
+
+
+# =============== Simulation engine ===============
+class SimulationEngine:
+    """Step-by-step game simulation without any GUI.
+
+    Args:
+        price_df (pd.DataFrame): Daily prices with a 'Close' column and a DatetimeIndex.
+        account (Account): Account to trade with; a fresh one is created if omitted.
+        news_map (dict): "YYYY-MM-DD" -> news text shown on that day.
+        random_news (bool): Trigger weighted random breaking news (2008 original mode).
+        news_prob (float): Daily chance of random news on days without scheduled news.
+        seed (int): Seed of the engine's random news (a fresh one is drawn if omitted).
+        news_ids (array): Per-day CATALOG code for ticks that show pregenerated news (hard mode), -1 for none.
+        journal (journal.SessionJournal): Records ticks and orders for replay.
+        news_schedule (NewsSchedule): Random news to use instead of drawing it from the seed.
+    """
+    def __init__(self, price_df, account=None, news_map=None, random_news=False, news_prob=0.2,
+                 seed=None, news_ids=None, journal=None, news_schedule=None):
+        self.price_df = price_df
+        self.account = account if account is not None else Account()
+        self.news_map = dict(news_map) if news_map else {}
+        self.random_news = random_news
+        self.news_prob = news_prob
+        self.news_history = []
+        self._observers = []
+        self.seed = new_seed() if seed is None else int(seed)
+        self.news_ids = news_ids
+        self.journal = journal
+
+        # The session as contiguous columns, so ticks and orders are plain array indexing (no pandas rows)
+        self.total_days = len(price_df)
+        if self.total_days:
+            self.closes = np.ascontiguousarray(price_df['Close'].to_numpy(dtype=np.float64))
+            self.dates = price_df.index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        else:
+            self.closes, self.dates = np.empty(0), np.empty(0, dtype=np.int64)
+        self.day_strs = np.datetime_as_string(self.dates.view('datetime64[ns]'), unit='D').tolist()
+        self.days = list(price_df.index)
+        self.idx = 0
+
+        # The whole session's random news, drawn once; days with scheduled news are left out
+        if news_schedule is None and random_news:
+            blocked = [dstr in self.news_map for dstr in self.day_strs]
+            news_schedule = NewsSchedule.generate(self.total_days, self.seed, news_prob, blocked)
+        self.news_schedule = news_schedule
+        self._news_by_day = news_schedule.event_by_day if news_schedule is not None else None
+        # Day prices with the news impacts applied, in one vectorized multiply
+        self._tick_prices = CATALOG.apply(self.closes, self._news_by_day) if news_schedule is not None else None
+        # Intraday price between two ticks (intraday.py); orders fill at it while set
+        self.live_price = None
+        self.live_sub = -1
+
+        # Preallocated histories: the opening price plus one entry per trading day
+        first_price = float(self.closes[0]) if self.total_days else 0.0
+        self.price_history = HistoryBuffer(self.total_days + 1)
+        self.price_history.append(first_price)
+        self.profit_history = HistoryBuffer(self.total_days)
+
+    @classmethod
+    def from_csv(cls, csv_file, **kwargs):
+        """Build an engine from a cached price CSV such as gold_2008.csv."""
+        return cls(load_price_df(csv_file), **kwargs)
+
+    @property
+    def finished(self):
+        return self.idx >= self.total_days
+
+    @property
+    def day_prices(self):
+        """The price each tick will show (closes with random news applied)."""
+        return self._tick_prices if self._tick_prices is not None else self.closes
+
+    @property
+    def realized_pnl(self):
+        """Realized P&L so far, as tracked by the account."""
+        return self.account.realized_pnl
+
+    # ---------- Observers ----------
+    def subscribe(self, callback):
+        """Call callback(engine, price, day) after every step and trade, e.g. to refresh a view."""
+        self._observers.append(callback)
+
+    def _notify(self, price, day):
+        for callback in self._observers:
+            callback(self, price, day)
+
+    # ---------- Timeline ----------
+    def step(self):
+        """
+        Advance one day:
+        1) Read the base close price for the day.
+        2) Apply the day's random event from the precomputed news schedule, if any.
+        3) Record price and total P&L history.
+
+        Returns:
+            TickResult or None if the session is already over.
+        """
+        if self.finished:
+            return None
+
+        self.clear_live_price()
+        day = self.days[self.idx]
+        dstr = self.day_strs[self.idx]
+        price = float(self.closes[self.idx])
+        tick = TickResult(idx=self.idx, day=day, price=price, date=dstr, news_text=self.news_map.get(dstr, ""))
+        if self.news_ids is not None and self.news_ids[self.idx] >= 0:
+            tick.news_id = int(self.news_ids[self.idx])
+        elif tick.news_text:
+            tick.news_id = SCHEDULED_NEWS
+
+        event = self._news_by_day[self.idx] if self._news_by_day is not None else -1
+        if event >= 0:
+            news, _impact, impact_text, _weight = RANDOM_NEWS_POOL[event]  # random codes == pool indices
+            tick.news_id = int(event)
+            old_price = price
+            price = float(self._tick_prices[self.idx])
+
+            tick.price = price
+            tick.news_text = CATALOG.texts[event]
+            tick.news_color = CATALOG.colors[event]
+            self.news_map[dstr] = tick.news_text
+
+            change_pct = ((price - old_price) / old_price) * 100
+            tick.news_log = f"{dstr} News impact: {news} → Gold price changed {change_pct:+.2f}%"
+            self.news_history.append(f"{dstr}: {news} (Impact: {impact_text}, Price Change: {change_pct:+.2f}%)")
+
+        self.price_history.append(price)
+        tick.floating_pnl = self.account.floating_pnl(price)
+        tick.total_pnl = self.realized_pnl + tick.floating_pnl
+        self.profit_history.append(tick.total_pnl)
+
+        if self.journal is not None:
+            self.journal.record_tick(tick)
+        self.idx += 1
+        self._notify(price, day)
+        return tick
+
+    def run(self, strategy=None):
+        """Play the remaining days, calling strategy(engine, tick) after each, then settle."""
+        while not self.finished:
+            tick = self.step()
+            if strategy is not None:
+                strategy(self, tick)
+        self.settle()
+        return self.summary()
+
+    # ---------- Trading ----------
+    def current_trade_price(self):
+        """Return (price, day) used for trade execution: the live intraday price if set, else the latest close."""
+        use_idx = max(0, self.idx - 1)
+        if self.live_price is not None:
+            return self.live_price, self.days[use_idx]
+        return float(self.closes[use_idx]), self.days[use_idx]
+
+    def set_live_price(self, price, sub):
+        """Move the price within the day (sub-tick `sub` of the way to the next tick); cleared by step()."""
+        if self.finished or self.idx == 0:
+            return
+        self.live_price, self.live_sub = float(price), sub
+        self._notify(self.live_price, self.days[self.idx - 1])
+
+    def clear_live_price(self):
+        """Trade at the latest close again until the next set_live_price()."""
+        self.live_price, self.live_sub = None, -1
+
+    def buy(self, quantity):
+        return self._trade("buy", self.account.buy, quantity)
+
+    def sell(self, quantity):
+        return self._trade("sell", self.account.sell, quantity)
+
+    def _trade(self, kind, order, quantity):
+        price, day = self.current_trade_price()
+        msg, ok = order(price, quantity)
+        if ok:
+            self._record(kind, quantity, price, self.live_sub)
+            self._notify(price, day)
+        return msg, ok
+
+    def close(self, price=None, kind="close"):
+        """Close the open position (at the latest trade price by default); the account books the P&L."""
+        trade_price, day = self.current_trade_price()
+        price = trade_price if price is None else price
+        # A fill at the live intraday price is journaled with its sub-tick, so replay can regenerate it
+        sub = self.live_sub if self.live_price is not None and price == self.live_price else -1
+        position = self.account.position
+        msg, pnl = self.account.close_position(price)
+        if position != 0:
+            self._record(kind, abs(position), price, sub)
+            self._notify(price, day)
+        return msg, pnl
+
+    def _record(self, kind, quantity, price, sub=-1):
+        if self.journal is not None:
+            self.journal.record_order(kind, self.idx, quantity, price, sub)
+
+    # ---------- Settlement ----------
+    @property
+    def settle_price(self):
+        """Price open positions are closed at when the session ends: the last close."""
+        return float(self.closes[-1])
+
+    def settle(self):
+        """Auto-close any open position at the last price. Returns (msg, last_price) or None if flat."""
+        if self.account.position == 0:
+            return None
+        last_price = self.settle_price
+        msg, _pnl = self.close(last_price, kind="settle")
+        return msg, last_price
+
+    def summary(self):
+        """Return (final_balance, profit_loss, return_rate_pct)."""
+        final_balance = self.account.balance
+        pl = final_balance - self.account.initial_balance
+        rr = (pl / self.account.initial_balance) * 100.0
+        return final_balance, pl, rr
+
+
+# =============== Benchmark ===============
+def bench(csv_file="gold_2008.csv", sessions=200):
+    """Per-tick cost of the array lookups vs. the DataFrame row lookups they replace, and of a full step()."""
+    engine = SimulationEngine.from_csv(csv_file, random_news=True, seed=2008)
+    df, n = engine.price_df, engine.total_days
+
+    t = time.perf_counter()
+    for i in range(n):
+        float(df.iloc[i]['Close']), df.index[i].strftime("%Y-%m-%d")
+    iloc_us = (time.perf_counter() - t) / n * 1e6
+
+    t = time.perf_counter()
+    for _ in range(sessions):
+        for i in range(n):
+            float(engine.closes[i]), engine.day_strs[i]
+    array_us = (time.perf_counter() - t) / (sessions * n) * 1e6
+    print(f"price + date lookup: iloc/strftime {iloc_us:.2f} us, arrays {array_us:.3f} us "
+          f"({iloc_us / array_us:.0f}x)")
+
+    t = time.perf_counter()
+    for seed in range(sessions):
+        e = SimulationEngine(df, random_news=True, seed=seed)
+        while e.step() is not None:
+            e.current_trade_price()
+    elapsed = time.perf_counter() - t
+    print(f"step() + current_trade_price(): {elapsed / (sessions * n) * 1e6:.2f} us/tick, "
+          f"{elapsed / sessions * 1000:.2f} ms per {n}-day session (incl. setup)")
+
+
+if __name__ == "__main__":
+    if "bench" in sys.argv:
+        bench()
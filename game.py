@@ -1,146 +1,38 @@
 import os
 import sys
-import json
-import ssl
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
-import urllib.request
 import pandas as pd
 import matplotlib
 matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from datetime import datetime
-import random
+
+from charts import BlitLineChart, ProfitChartWindow
+from clock import GameClock
+from pacing import FramePacer
+from engine import Account, SimulationEngine
+from intraday import IntradayFeed, IntradayStream, session_intraday_ticks
+from journal import MODE_2008, SessionJournal, session_seed
+from news import BUILTIN_NEWS, CATALOG, read_user_news
+from pricecache import to_price_df
+from io_worker import IOExecutor
+from providers import default_provider
+from rankings import load_top_players, open_store
+from uibatch import FrameBatcher
 
 # Ensure Chinese characters/symbols display properly across platforms
 matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'Arial']
 matplotlib.rcParams['axes.unicode_minus'] = False
 
 
-# =============== Built-in historical major events (display only; do NOT change price) ===============
-BUILTIN_NEWS = {
-    "2008-09-07": "The US government takes over Fannie Mae and Freddie Mac, risk aversion rises. (Bullish for gold)",
-    "2008-09-15": "Lehman Brothers bankruptcy triggers global financial crisis. (Strongly bullish for gold)",
-    "2008-09-16": "The Federal Reserve injects huge liquidity into the market. (Bullish for gold)",
-    "2008-09-29": "The US House rejects $700 billion bailout bill. (Strongly bullish for gold)",
-}
-
-# =============== Random breaking news pool (text, direction, impact text, weight) ===============
-RANDOM_NEWS_POOL = [
-    ("Central bank unexpectedly cuts interest rates.",                 "bullish",        "+1%", 10),
-    ("Major bank reports massive losses, market panic rises.",         "strong_bullish", "+2%", 5),
-    ("Oil prices surge sharply, inflation fears increase.",            "bullish",        "+1%", 10),
-    ("Global stock markets rebound strongly.",                         "bearish",        "-1%", 10),
-    ("Dollar strengthens significantly against major currencies.",     "bearish",        "-1%", 10),
-    ("Geopolitical tensions escalate in the Middle East.",             "strong_bullish", "+2%", 5),
-    ("International Monetary Fund warns of global recession.",         "bullish",        "+1%", 10),
-    ("US unemployment rate falls unexpectedly.",                       "bearish",        "-1%", 10),
-    ("Large fund forced liquidation sparks market turbulence.",        "strong_bearish", "-2%", 4),
-]
-
-def apply_news_impact(price: float, impact: str) -> float:
-    """
-    Adjust price based on qualitative news impact.
-
-    Impact mapping:
-        bullish        -> +1%
-        strong_bullish -> +2%
-        bearish        -> -1%
-        strong_bearish -> -2%
-
-    Args:
-        price (float): Current price.
-        impact (str): One of {"bullish", "strong_bullish", "bearish", "strong_bearish"}.
-
-    Returns:
-        float: Adjusted price after impact multiplier.
-    """
-    if impact == "bullish":
-        return price * 1.01
-    if impact == "strong_bullish":
-        return price * 1.02
-    if impact == "bearish":
-        return price * 0.99
-    if impact == "strong_bearish":
-        return price * 0.98
-    return price
-
-
-# =============== Account class ===============
-class Account:
-    """A simple margin account used in the game.
-
-    Notes:
-        - Uses 10% margin for opening positions.
-        - Tracks one net position at a time (>0 long; <0 short; =0 flat).
-        - Realized P&L is recorded into tkinter DoubleVar `gloProfit` for plotting.
-    """
-    def __init__(self, initial_balance=100000.0, lot_size=1, name="Player"):
-        self.name = str(name)
-        self.initial_balance = float(initial_balance)
-        self.balance = float(initial_balance)
-        self.position = 0                 # >0 long; <0 short; =0 no position
-        self.entry_price = 0.0            # last entry price
-        self.lot_size = lot_size
-        self.name = name
-
-    def buy(self, price, quantity):
-        """Open a long position if there is no existing position."""
-        if self.position != 0:
-            return "Existing a position, please close first.", False
-        margin = price * quantity * 0.1
-        if self.balance >= margin:
-            self.position = quantity
-            self.entry_price = price
-            self.balance -= margin
-            return f"Successfully long {quantity} lots @ {price:.2f}, margin used: {margin:.2f}.", True
-        return "Insufficient funds to open a position.", False
-
-    def sell(self, price, quantity):
-        """Open a short position if there is no existing position."""
-        if self.position != 0:
-            return "Existing a position, please close first.", False
-        margin = price * quantity * 0.1
-        if self.balance >= margin:
-            self.position = -quantity
-            self.entry_price = price
-            self.balance -= margin
-            return f"Successfully short {quantity} lots @ {price:.2f}, margin used: {margin:.2f}.", True
-        return "Insufficient funds to open a position.", False
-
-    def close_position(self, current_price):
-        """Close current position, realize P&L, and release margin."""
-        if self.position == 0:
-            return "No positions to close.", 0.0
-        pnl = (current_price - self.entry_price) * self.position * self.lot_size
-        self.balance += pnl
-        gloProfit.set(gloProfit.get() + pnl)  # add to realized P&L (for history curve)
-        margin_released = abs(self.entry_price * self.position * 0.1)
-        self.balance += margin_released
-        pos = self.position
-        self.position = 0
-        self.entry_price = 0.0
-        msg = (f"Position closed successfully ({'long' if pos>0 else 'short'} {abs(pos)} lots)! "
-               f"Profit and loss for this period: {pnl:.2f}, released margin: {margin_released:.2f}. "
-               f"Account balance: {self.balance:.2f}.")
-        return msg, pnl
-
-    def floating_pnl(self, current_price):
-        """Compute unrealized P&L given the current price (0 if no position)."""
-        if self.position == 0:
-            return 0.0
-        return (current_price - self.entry_price) * self.position * self.lot_size
-
-
 # =============== Main UI & Game Logic ===============
 class TradingGameUI:
     """Main UI and control flow for the trading game.
 
     Responsibilities:
         - Load historical prices for 2008 (GC=F) from cache or Yahoo Finance.
-        - Advance the timeline, optionally trigger random news and adjust price.
+        - Drive the headless SimulationEngine (timeline, random news, P&L) from a Tk timer.
         - Handle trading actions (buy/sell/close) with 10% margin rule.
         - Maintain and display logs, news, real-time labels and charts.
         - Save results and display rankings (as defined by the existing code).
@@ -157,23 +49,23 @@ class TradingGameUI:
         self.player_name = str(name)
         self.account = Account(initial_balance=100000.0, lot_size=1, name=self.player_name)
 
-        # Data & state
+        # Data & state (the engine is created once prices are loaded)
         self.price_df = pd.DataFrame()
+        self.engine = None
         self.days = []
         self.total_days = 0
-        self.idx = 0
-        self.price_history = []
-        self.ProfitHist = np.array([])
-
-        # Tkinter variables
-        global gloProfit
-        gloProfit = tk.DoubleVar(value=0.0)
-        self.UnrealizedProfit = tk.DoubleVar(value=0.0)
+        self.profit_window = None   # ProfitChartWindow while the popup is open
 
         # Game duration settings
         self.total_game_ms = 10 * 60 * 1000
         self.update_interval_ms = 1000
-        self.timer_running = False
+        self.clock = None           # GameClock once the game starts
+        self.intraday_stream = None # IntradayStream when GOLD_MAGNATE_INTRADAY is set
+        self.intraday = None        # its IntradayFeed once the game starts
+        self._ending = False        # set by end_game: no more orders, no second save
+
+        # Disk/network I/O runs here, off the Tk thread (jobs run in order: custom news, then prices)
+        self.io = IOExecutor(self.root)
 
         # —— News system —— (built-in + optional custom + random breaking)
         self.news_map = dict(BUILTIN_NEWS)
@@ -184,49 +76,30 @@ class TradingGameUI:
         self.font_big = ("Microsoft YaHei", 18)
         self.font_title = ("Microsoft YaHei", 20, "bold")
         self.build_ui()
+        self.view_updates = FrameBatcher(self.root, self.render_frame)  # at most one redraw per frame
+        # Simplifies or skips chart frames when rendering cannot keep up with the clock
+        self.pacer = FramePacer(lambda: self.clock.period if self.clock else self.update_interval_ms / 1000.0)
+        self.pacer.add_chart(self.chart)
 
-        # Data
+        # Data (loaded in the background; the game starts when it arrives)
         self.fetch_data()
 
-        # Start
-        self.start_game()
-
     # ---------- Data ----------
     def fetch_data(self):
         """
-        Read or download daily close prices for 2008 COMEX gold futures (GC=F).
-        Prefer local cache gold_2008.csv; otherwise fetch from Yahoo Finance.
+        Load daily close prices for 2008 COMEX gold futures (GC=F) without freezing the window.
+        Offline first: local gold_2008.csv (memory-mapped via its binary cache); otherwise Yahoo Finance,
+        fetched on a worker thread (see providers.py). The game starts once the prices arrive.
         """
-        cache_file = "gold_2008.csv"
-        if os.path.exists(cache_file):
-            try:
-                self.price_df = pd.read_csv(cache_file, index_col=0, parse_dates=True)
-                self.price_df = self.price_df[['Close']].dropna()
-            except Exception:
-                self.price_df = pd.DataFrame()
-
-        if self.price_df.empty:
-            try:
-                # Approx 2008-01-01 ~ 2008-12-31
-                period1 = 1199120400  # 2008-01-01 00:00 UTC
-                period2 = 1230656400  # 2008-12-31 23:59 UTC
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/GC=F?symbol=GC=F&period1={period1}&period2={period2}&interval=1d"
-                req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-                ctx = ssl.create_default_context()
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-                with urllib.request.urlopen(req, context=ctx) as resp:
-                    data = json.loads(resp.read().decode('utf-8'))
-                closes = data['chart']['result'][0]['indicators']['quote'][0]['close']
-                ts = data['chart']['result'][0]['timestamp']
-                dates = pd.to_datetime(ts, unit='s')
-                self.price_df = pd.DataFrame({'Close': closes}, index=dates).dropna()
-                self.price_df.to_csv(cache_file)
-            except Exception as e:
-                messagebox.showerror("Data loading failed", f"Unable to load data from the network: {e}")
-                self.root.quit()
-                return
+        self.io.submit(default_provider("gold_2008.csv").fetch,
+                       on_done=self._on_prices_loaded, on_error=self._on_prices_failed)
 
+    def _on_prices_failed(self, e):
+        messagebox.showerror("Data loading failed", f"Unable to load data from the network: {e}")
+        self.root.quit()
+
+    def _on_prices_loaded(self, prices):
+        self.price_df = to_price_df(*prices)
         self.days = list(self.price_df.index)
         self.total_days = len(self.days)
         if self.total_days == 0:
@@ -234,27 +107,44 @@ class TradingGameUI:
             self.root.quit()
             return
 
+        # Seeded and journaled, so the session can be replayed and verified (python journal.py replay ...)
+        seed = session_seed()
+        sub_ticks = session_intraday_ticks()
+        journal = SessionJournal.for_game(self.player_name, MODE_2008, seed,
+                                          self.account.initial_balance, self.total_days, intraday=sub_ticks)
+        self.engine = SimulationEngine(self.price_df, account=self.account, news_map=self.news_map,
+                                       random_news=True, seed=seed, journal=journal)
+        self.news_history = self.engine.news_history
+        self.engine.subscribe(lambda _engine, price, day: self.view_updates.notify(price, day))
+
         # Advance evenly based on total duration
         self.update_interval_ms = max(200, int(self.total_game_ms / self.total_days))
+        self.chart.set_x_extent(self.total_days + 1)
 
-        first_price = float(self.price_df.iloc[0]['Close'])
-        self.price_history = [first_price]
+        first_price = self.engine.price_history[0]
         self.log(f"Data loading completed: {self.total_days} trading days. "
                  f"Advance one day every {self.update_interval_ms} ms (total ~10 minutes).")
+        self.log(f"Session seed {seed}, journal: {journal.path}")
+        if sub_ticks:
+            self.intraday_stream = IntradayStream(self.engine.day_prices, sub_ticks, seed)
+            self.log(f"Intraday mode: {sub_ticks} price moves per trading day; orders fill at the live price.")
         self.refresh_top_panel(first_price, self.days[0])
 
+        # Start
+        self.start_game()
+
     def load_custom_news(self):
-        """Read user-defined news from my_news.json (if exists). Display only, no price change."""
+        """Read user-defined news from my_news.json (if exists) in the background. Display only, no price change."""
         file = "my_news.json"
-        if not os.path.exists(file):
-            return
-        try:
-            with open(file, "r", encoding="utf-8") as f:
-                user_news = json.load(f)
-            for k, v in user_news.items():
-                self.news_map[k] = v if isinstance(v, str) else "；".join(map(str, v))
-        except Exception as e:
-            messagebox.showwarning("News loading warning", f"Failed to read my_news.json: {e}")
+        self.io.submit(lambda: read_user_news(file, sep="；") if os.path.exists(file) else {},
+                       on_done=self._on_custom_news_loaded,
+                       on_error=lambda e: messagebox.showwarning("News loading warning",
+                                                                 f"Failed to read my_news.json: {e}"))
+
+    def _on_custom_news_loaded(self, news):
+        # Registered here, on the Tk thread, so the catalog never changes under the engine or the views
+        for k, code in CATALOG.add_user_news(news).items():
+            self.news_map[k] = CATALOG.texts[code]
 
     def show_help_window(self):
         """Create a new window to display the game tutorial."""
@@ -286,6 +176,9 @@ The main screen is divided into four key areas:
     * `Buy (long)`: Click this to open a long position. You profit if the price goes up.
     * `Sell (short)`: Click this to open a short position. You profit if the price goes down.
     * `Close a position`: Click this to close your current open position and realize any profit or loss.
+    * `Pause / Resume`: Pauses or resumes the automatic progression of the game timeline.
+    * `Speed`: Cycles the game speed through x1, x2, x4, x16 and x64.
+    * `Fast Forward / Normal Play`: Plays many days per frame, so the rest of the year passes in seconds. Click again to return to normal play.
     * `Profit / History`: Click to view a chart of your total profit over time.
     * *Note*: You must close any existing position before you can open a new one.
 
@@ -372,6 +265,12 @@ Good luck, and may you become a Gold Magnate!
         tk.Button(btns, text="Buy (long)",  font=self.font_big, command=self.buy_action,  width=20).grid(row=0, column=0, padx=4, pady=4)
         tk.Button(btns, text="Sell (short)", font=self.font_big, command=self.sell_action, width=20).grid(row=0, column=1, padx=4, pady=4)
         tk.Button(btns, text="Close a position", font=self.font_big, command=self.close_action, width=22).grid(row=1, column=0, columnspan=2, padx=4, pady=4)
+        self.pause_btn = tk.Button(btns, text="Pause", font=self.font_big, command=self.game_control, width=20)
+        self.pause_btn.grid(row=2, column=0, padx=4, pady=4)
+        self.speed_btn = tk.Button(btns, text="Speed x1", font=self.font_big, command=self.speed_up, width=20)
+        self.speed_btn.grid(row=2, column=1, padx=4, pady=4)
+        self.ff_btn = tk.Button(btns, text="Fast Forward", font=self.font_big, command=self.fast_forward, width=22)
+        self.ff_btn.grid(row=3, column=0, columnspan=2, padx=4, pady=4)
 
         tk.Label(trade, text="Note: 10% margin; close an existing position before opening a new one.",
                  font=("Microsoft YaHei", 12)).pack(anchor="w", pady=(6, 0))
@@ -394,6 +293,7 @@ Good luck, and may you become a Gold Magnate!
         self.canvas = FigureCanvasTkAgg(self.fig, master=chart_frame)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart = BlitLineChart(self.canvas, self.ax, self.line)
 
         # Bottom: log + news
         bottom = tk.Frame(self.root)
@@ -432,65 +332,70 @@ Good luck, and may you become a Gold Magnate!
                               font=("Microsoft YaHei", 18, "bold"), bg='white', fg='#2c3e50')
         title_label.pack(pady=(0, 15))
         
-        # If there is data
-        if os.path.exists(csv_file):
-            try:
-                df = pd.read_csv(csv_file)
-                if not df.empty:
-                    # Sort by return and keep only best attempt per player
-                    df_best = df.loc[df.groupby('player_name')['return_rate'].idxmax()]
-                    df_sorted = df_best.sort_values('return_rate', ascending=False).head(5)
-                    
-                    # Content frame
-                    content_frame = tk.Frame(main_frame, bg='white')
-                    content_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-                    
-                    # Header
-                    header_frame = tk.Frame(content_frame, bg='#34495e', height=40)
-                    header_frame.pack(fill=tk.X, pady=(0, 2))
-                    header_frame.pack_propagate(False)
-                    
-                    header_text = "Rank   Player Name          Return Rate      Final Balance"
-                    header_label = tk.Label(header_frame, text=header_text, 
-                                          font=("Courier New", 12, "bold"),
-                                          bg='#34495e', fg='white', anchor='w')
-                    header_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-                    
-                    # Ranking items
-                    bg_colors = ['#fff9c4', '#f0f0f0', '#ffeaa7', '#ddd', '#ddd']
-                    
-                    for idx, (_, row) in enumerate(df_sorted.iterrows()):
-                        rank_frame = tk.Frame(content_frame, bg=bg_colors[idx], height=35)
-                        rank_frame.pack(fill=tk.X, pady=1)
-                        rank_frame.pack_propagate(False)
-                        
-                        # Formatted display text
-                        rank_num = f"#{idx + 1}"
-                        player_name = str(row['player_name'])[:16]  # length limit
-                        player_name = str(row['player_name'])[:16]
-                        return_rate = f"{row['return_rate']:+6.2f}%"
-                        balance = f"${row['final_balance']:>13,.0f}"
-                        
-                        rank_text = f"{rank_num:<6} {player_name:<16} {return_rate:>12} {balance:>16}"
-                        
-                        rank_label = tk.Label(rank_frame, text=rank_text, 
-                                            font=("Courier New", 11, "bold" if idx < 3 else "normal"),
-                                            bg=bg_colors[idx], fg='#2c3e50', anchor='w')
-                        rank_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=2)
-                    
-                else:
-                    no_data_label = tk.Label(main_frame, text="No ranking data available yet.\nComplete a game to see rankings!", 
-                                           font=self.font_big, bg='white', fg='#7f8c8d')
-                    no_data_label.pack(expand=True)
-                    
-            except Exception as e:
-                error_label = tk.Label(main_frame, text=f"Error loading ranking data:\n{str(e)}", 
+        # Rankings are read in the background; the window shows "Loading..." until they arrive
+        body_frame = tk.Frame(main_frame, bg='white')
+        body_frame.pack(fill=tk.BOTH, expand=True)
+        loading_label = tk.Label(body_frame, text="Loading rankings...", font=self.font_big, bg='white', fg='#7f8c8d')
+        loading_label.pack(expand=True)
+
+        def show(top_players):
+            if not ranking_window.winfo_exists():
+                return  # closed while loading
+            loading_label.destroy()
+            if top_players is None:
+                no_file_label = tk.Label(body_frame, text="No ranking file found.\nComplete a game to create the leaderboard!", 
+                                       font=self.font_big, bg='white', fg='#7f8c8d')
+                no_file_label.pack(expand=True)
+            elif not top_players:
+                no_data_label = tk.Label(body_frame, text="No ranking data available yet.\nComplete a game to see rankings!", 
+                                       font=self.font_big, bg='white', fg='#7f8c8d')
+                no_data_label.pack(expand=True)
+            else:
+                # Content frame
+                content_frame = tk.Frame(body_frame, bg='white')
+                content_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+                # Header
+                header_frame = tk.Frame(content_frame, bg='#34495e', height=40)
+                header_frame.pack(fill=tk.X, pady=(0, 2))
+                header_frame.pack_propagate(False)
+
+                header_text = "Rank   Player Name          Return Rate      Final Balance"
+                header_label = tk.Label(header_frame, text=header_text, 
+                                      font=("Courier New", 12, "bold"),
+                                      bg='#34495e', fg='white', anchor='w')
+                header_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+                # Ranking items
+                bg_colors = ['#fff9c4', '#f0f0f0', '#ffeaa7', '#ddd', '#ddd']
+
+                for idx, row in enumerate(top_players):
+                    rank_frame = tk.Frame(content_frame, bg=bg_colors[idx], height=35)
+                    rank_frame.pack(fill=tk.X, pady=1)
+                    rank_frame.pack_propagate(False)
+
+                    # Formatted display text
+                    rank_num = f"#{idx + 1}"
+                    player_name = str(row['player_name'])[:16]  # length limit
+                    player_name = str(row['player_name'])[:16]
+                    return_rate = f"{row['return_rate']:+6.2f}%"
+                    balance = f"${row['final_balance']:>13,.0f}"
+
+                    rank_text = f"{rank_num:<6} {player_name:<16} {return_rate:>12} {balance:>16}"
+
+                    rank_label = tk.Label(rank_frame, text=rank_text, 
+                                        font=("Courier New", 11, "bold" if idx < 3 else "normal"),
+                                        bg=bg_colors[idx], fg='#2c3e50', anchor='w')
+                    rank_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=2)
+
+        def failed(e):
+            if ranking_window.winfo_exists():
+                loading_label.destroy()
+                error_label = tk.Label(body_frame, text=f"Error loading ranking data:\n{str(e)}", 
                                      font=self.font_big, bg='white', fg='#e74c3c')
                 error_label.pack(expand=True)
-        else:
-            no_file_label = tk.Label(main_frame, text="No ranking file found.\nComplete a game to create the leaderboard!", 
-                                   font=self.font_big, bg='white', fg='#7f8c8d')
-            no_file_label.pack(expand=True)
+
+        self.io.submit(load_top_players, csv_file, 5, on_done=show, on_error=failed)
         
         # Buttons frame
         btn_frame = tk.Frame(main_frame, bg='white')
@@ -542,82 +447,69 @@ Good luck, and may you become a Gold Magnate!
         self.lbl_pnl.config(text=f"Floating profit and loss: {pnl_text}", fg=pnl_color)
         self.lbl_date_price.config(text=f"Date: {day.strftime('%Y-%m-%d')}   Current Price: {price:.2f}")
 
+    def render_frame(self, price, day):
+        """Redraw the price curve and top panel; batched by self.view_updates to once per frame."""
+        price_history = self.engine.price_history
+        # Only a new day changes the chart; trades and intraday moves just update the labels
+        if self.pacer.should_draw(self.engine.idx, force=self.engine.finished):
+            with self.pacer.measure():
+                self.chart.update(price_history.indices(), price_history.view())
+        self.refresh_top_panel(price, day)
+
     # ---------- Main loop ----------
     def start_game(self):
-        """Start the timer to advance the game timeline."""
-        self.timer_running = True
-        self.root.after(self.update_interval_ms, self.tick)
-
-    def tick(self):
+        """Start the clock that advances the game timeline."""
+        self.clock = GameClock(self.root, self.update_interval_ms, self.tick)
+        self.clock.start()
+        if self.intraday_stream is not None:
+            self.intraday = IntradayFeed(self.root, self.engine, self.intraday_stream, self.clock)
+            self.intraday.start()
+
+    def game_control(self):
+        """Pause or resume the timeline."""
+        if self.clock is None:
+            return  # prices still loading
+        self.pause_btn['text'] = "Pause" if self.clock.toggle() else "Resume"
+
+    def speed_up(self):
+        """Cycle the timeline speed through x1/x2/x4/x16/x64."""
+        if self.clock is None:
+            return  # prices still loading
+        self.speed_btn['text'] = f"Speed x{self.clock.cycle_speed()}"
+
+    def fast_forward(self):
+        """Toggle fast-forward: a batch of days per frame, rendered at most 30 times a second."""
+        if self.clock is None:
+            return  # prices still loading
+        self.ff_btn['text'] = "Normal Play" if self.clock.toggle_turbo() else "Fast Forward"
+
+    def tick(self, days=1):
         """
-        Advance one day:
-        1) Read the base close price for the day.
-        2) If there is no built-in news for the day, trigger a random event with a probability and adjust price.
-        3) Update chart/P&L/news/logs.
+        Advance `days` trading days via the engine (which applies random news to the price),
+        then update chart/P&L/news/logs. Called by the clock: one day per tick, or a batch
+        per frame when fast-forwarding, in which case the views show only the batch's last day.
         """
-        if not self.timer_running:
-            return
-
-        if self.idx >= self.total_days:
+        if self.engine.finished:
             self.end_game()
             return
 
-        day = self.days[self.idx]
-        dstr = day.strftime("%Y-%m-%d")
-        base_price = float(self.price_df.iloc[self.idx]['Close'])
-        price = base_price
-
-        # Default news text
-        news_text = self.news_map.get(dstr, "")
-        news_color = "black"
-
-        # If no built-in news -> 20% chance to trigger a random breaking news (weighted sampling)
-        if not news_text and random.random() < 0.2:
-            news, impact, impact_text, _weight = random.choices(
-                RANDOM_NEWS_POOL,
-                weights=[item[3] for item in RANDOM_NEWS_POOL],
-                k=1
-            )[0]
-            old_price = price
-            price = apply_news_impact(price, impact)  # adjust price based on news impact
-
-            news_text = f"{news} (Impact on gold: {impact_text})"
-            self.news_map[dstr] = news_text
-
-            # Color by direction
-            if "bullish" in impact:
-                news_color = "green"
-            elif "bearish" in impact:
-                news_color = "red"
-
-            # Log and history
-            change_pct = ((price - old_price) / old_price) * 100
-            self.log(f"{dstr} News impact: {news} → Gold price changed {change_pct:+.2f}%")
-            self.news_history.append(f"{dstr}: {news} (Impact: {impact_text}, Price Change: {change_pct:+.2f}%)")
-
-        # Update price curve
-        self.price_history.append(price)
-        self.line.set_data(range(len(self.price_history)), self.price_history)
-        self.ax.relim()
-        self.ax.autoscale_view()
-        self.canvas.draw()
-
-        # Update P&L
-        self.UnrealizedProfit.set(self.account.floating_pnl(price))
-        self.ProfitHist = np.append(self.ProfitHist, gloProfit.get() + self.UnrealizedProfit.get())
-
-        # News & top info
-        self.set_news(news_text, news_color)
-        self.refresh_top_panel(price, day)
-
-        self.idx += 1
-        self.root.after(self.update_interval_ms, self.tick)
+        # Chart and top panel follow via the engine observer (render_frame, once per frame)
+        news_logs = []
+        for _ in range(days):
+            tick = self.engine.step()
+            if tick is None:
+                break
+            last = tick
+            if tick.news_log:
+                news_logs.append(tick.news_log)
+        if news_logs:
+            self.log("\n".join(news_logs))
+        self.set_news(last.news_text, last.news_color)
 
     # ---------- Trading ----------
     def _current_trade_price(self):
         """Return (price, day) used for trade execution at the most recent tick."""
-        use_idx = max(0, self.idx - 1)
-        return float(self.price_df.iloc[use_idx]['Close']), self.days[use_idx]
+        return self.engine.current_trade_price()
 
     def _get_qty(self):
         """Read quantity from entry widget; validate and return int or None on error."""
@@ -632,6 +524,8 @@ Good luck, and may you become a Gold Magnate!
 
     def buy_action(self):
         """Handle Buy: open a long position if valid quantity and no existing position."""
+        if self.engine is None or self._ending:
+            return  # prices still loading, or the game is over
         qty = self._get_qty()
         if qty is None:
            return
@@ -641,16 +535,17 @@ Good luck, and may you become a Gold Magnate!
            return
 
         price, day = self._current_trade_price()
-        msg, ok = self.account.buy(price, qty)
+        msg, ok = self.engine.buy(qty)
         if ok:
           self.log(f"{day.strftime('%Y-%m-%d')} long {qty} lots @ {price:.2f} → {msg}")
-          self.refresh_top_panel(price, day)
         else:
            messagebox.showerror("Transaction Failure", msg)
 
 
     def sell_action(self):
         """Handle Sell: open a short position if valid quantity and no existing position."""
+        if self.engine is None or self._ending:
+            return  # prices still loading, or the game is over
         qty = self._get_qty()
         if qty is None:
             return
@@ -659,17 +554,18 @@ Good luck, and may you become a Gold Magnate!
             messagebox.showwarning("Invalid enter, please enter a positive integer.")
             return
         price, day = self._current_trade_price()
-        msg, ok = self.account.sell(price, qty)
+        msg, ok = self.engine.sell(qty)
         if ok:
             self.log(f"{day.strftime('%Y-%m-%d')} short {qty} lots @ {price:.2f} → {msg}")
-            self.refresh_top_panel(price, day)
         else:
             messagebox.showerror("Transaction Failure", msg)
 
     def close_action(self):
         """Handle Close: close current position (if any) at the latest price."""
+        if self.engine is None or self._ending:
+            return  # prices still loading, or the game is over
         price, day = self._current_trade_price()
-        msg, pnl = self.account.close_position(price)
+        msg, pnl = self.engine.close()
 
         if "No positions" in msg:
            messagebox.showerror(
@@ -678,54 +574,57 @@ Good luck, and may you become a Gold Magnate!
         )
         else:
              self.log(f"{day.strftime('%Y-%m-%d')} close a position @ {price:.2f} → {msg}")
-             self.refresh_top_panel(price, day)
 
 
     # ---------- Profit history popup ----------
-    def drawChart(self):
-        """Draw the profit history in the popup window and reschedule itself."""
-        self.ax2.clear()
-        self.ax2.plot(self.ProfitHist, marker='o', label='Profit')
-        self.ax2.set_title("Profit History", fontsize=14)
-        self.ax2.set_xlabel("Time", fontsize=12)
-        self.ax2.set_ylabel("Profit", fontsize=12)
-        if len(self.ProfitHist) > 0:
-            self.ax2.axhline(y=self.ProfitHist[-1], linestyle="--", label=f"Profit: {self.ProfitHist[-1]:.2f}")
-        self.ax2.legend(loc='upper left')
-        self.ax2.relim()
-        self.ax2.autoscale_view()
-        self.canvas2.draw()
-        self.profitRoot.after(self.update_interval_ms, self.drawChart)
-
     def getProfitChart(self):
-        """Open a popup window and start drawing the rolling profit history."""
-        self.profitRoot = tk.Toplevel(self.root)
-        self.profitRoot.title("Profit History")
-        self.profitRoot.geometry("1200x800")
-        self.fig2, self.ax2 = plt.subplots(figsize=(5, 3))
-        self.canvas2 = FigureCanvasTkAgg(self.fig2, master=self.profitRoot)
-        self.canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.drawChart()
+        """Open (or raise) the popup that follows the rolling profit history."""
+        if self.engine is None:
+            return  # prices still loading
+        if self.profit_window is not None and self.profit_window.is_open():
+            self.profit_window.lift()
+            return
+        self.profit_window = ProfitChartWindow(self.root, self.engine.profit_history, self.update_interval_ms,
+                                               x_extent=self.total_days, pacer=self.pacer)
 
     # ---------- End-of-game settlement ----------
     def end_game(self):
-        """Stop timer, auto-close any position at last price, save results, show summary, and exit."""
-        self.timer_running = False
-        last_price = float(self.price_df.iloc[-1]['Close'])
-        if self.account.position != 0:
-           msg, pnl = self.account.close_position(last_price)
+        """Stop the clock, auto-close any position at last price, save results, show summary, and exit."""
+        if self._ending:
+            return  # already settled; the result is being saved
+        self._ending = True
+        self.clock.stop()
+        if self.intraday is not None:
+            self.intraday.stop()
+            self.log(f"Intraday: {self.intraday.summary()}")
+        settled = self.engine.settle()
+        if settled is not None:
+           msg, last_price = settled
            self.log(f"Automatically close a position (last day @ {last_price:.2f}): {msg}")
-
-        final_balance = self.account.balance
-        pl = final_balance - self.account.initial_balance
-        rr = (pl / self.account.initial_balance) * 100.0
-
-        # Save game result
-        df = self.save_game_result(final_balance, pl, rr)
-
-        # Get ranking info
-        current_ranking, total_players = self.get_player_ranking(df)
-
+        self.view_updates.flush()
+        self.log(f"Frame pacing: {self.pacer.summary()}")
+
+        final_balance, pl, rr = self.engine.summary()
+        self.engine.journal.close(final_balance)
+
+        # Save the result and read the ranking on the I/O worker; the summary is shown when done
+        self.log("Saving your result...")
+        self.io.submit(self._save_and_rank, final_balance, pl, rr,
+                       on_done=lambda ranking: self._show_result(final_balance, pl, rr, *ranking),
+                       on_error=lambda e: self._on_save_failed(e, final_balance, pl, rr))
+
+    def _save_and_rank(self, final_balance, pl, rr):
+        """(I/O worker) Save the result; return (ranking, total players, top 5)."""
+        store = self.save_game_result(final_balance, pl, rr)
+        current_ranking, total_players = self.get_player_ranking(store, rr)
+        return current_ranking, total_players, store.top_players(5)
+
+    def _on_save_failed(self, e, final_balance, pl, rr):
+        messagebox.showwarning("Save failed", f"Could not save your result to the leaderboard: {e}")
+        self._show_result(final_balance, pl, rr, None, 0, [])
+
+    def _show_result(self, final_balance, pl, rr, current_ranking, total_players, top_players):
+        """Summary popup and leaderboard, then exit."""
         # Build message
         result_msg = (
                    f"Final account balance: {final_balance:.2f}\n"
@@ -739,61 +638,25 @@ Good luck, and may you become a Gold Magnate!
         messagebox.showinfo("Game over", result_msg)
 
         # Show leaderboard
-        self.show_rankings(df, current_ranking, total_players, rr)
+        self.show_rankings(top_players, current_ranking, total_players, rr)
 
 # =============== Main (with your testing section) ===============
         # Close window
         self.root.quit()
 
     def save_game_result(self, final_balance, pl, rr):
-        """Save game result to CSV file (game_rankings_2008.csv)."""
-        csv_file = "game_rankings_2008.csv"
-        
-        # Create new record
-        new_record = {
-            'player_name': self.player_name,
-            'final_balance': final_balance,
-            'profit_loss': pl,
-            'return_rate': rr,
-            'play_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        # Read existing or create new DataFrame
-        if os.path.exists(csv_file):
-            try:
-                df = pd.read_csv(csv_file)
-            except:
-                df = pd.DataFrame()
-        else:
-            df = pd.DataFrame()
-        
-        # Append new record
-        new_df = pd.DataFrame([new_record])
-        df = pd.concat([df, new_df], ignore_index=True)
-        
-        # Save
-        df.to_csv(csv_file, index=False)
-        
-        return df
+        """Append game result to the ranking file (game_rankings_2008.csv) and return the ranking store."""
+        store = open_store("game_rankings_2008.csv")
+        store.append(self.player_name, final_balance, pl, rr)
+        return store
     
-    def get_player_ranking(self, df):
+    def get_player_ranking(self, store, rr):
         """Get current player's ranking among all records (by return_rate)."""
-        if df.empty:
+        if len(store) == 0:
             return None, 0
-        
-        # Sort by return rate
-        df_sorted = df.sort_values('return_rate', ascending=False).reset_index(drop=True)
-        
-        # Find current player's latest record's ranking
-        current_record = df_sorted[df_sorted['player_name'] == self.player_name].iloc[-1:]
-        if not current_record.empty:
-            ranking = df_sorted.index[df_sorted['return_rate'] == current_record['return_rate'].iloc[0]][0] + 1
-            total_players = len(df_sorted)
-            return ranking, total_players
-        
-        return None, len(df_sorted)
+        return store.rank_of(rr), len(store)
     
-    def show_rankings(self, df, current_ranking, total_players, current_rr):
+    def show_rankings(self, top_players, current_ranking, total_players, current_rr):
         """Show leaderboard window (Top 5 and current player's position)."""
         ranking_window = tk.Toplevel(self.root)
         ranking_window.title("Game Rankings - 2008 Original")
@@ -833,11 +696,7 @@ Good luck, and may you become a Gold Magnate!
         top5_label.pack(pady=(0, 15))
         
         # Content
-        if not df.empty:
-            # Sort by return and keep each player's best
-            df_best = df.loc[df.groupby('player_name')['return_rate'].idxmax()]
-            df_sorted = df_best.sort_values('return_rate', ascending=False).head(5)
-            
+        if top_players:
             # Container
             ranking_frame = tk.Frame(main_frame, bg='white')
             ranking_frame.pack(fill=tk.BOTH, expand=True)
@@ -845,7 +704,7 @@ Good luck, and may you become a Gold Magnate!
             medals = ['🥇', '🥈', '🥉', '🏅', '🏅']
             colors = ['#ffd700', '#c0c0c0', '#cd7f32', '#4a90e2', '#4a90e2']
             
-            for idx, (_, row) in enumerate(df_sorted.iterrows()):
+            for idx, row in enumerate(top_players):
                 medal = medals[idx] if idx < len(medals) else f"#{idx+1}"
                 color = colors[idx] if idx < len(colors) else '#7f8c8d'
                 
@@ -1,35 +1,30 @@
 import os
-import json
-import ssl
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
-import urllib.request
 import pandas as pd
 import matplotlib
 matplotlib.use("TkAgg")
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-import random
-from datetime import datetime
+
+from charts import BlitLineChart, ProfitChartWindow
+from clock import GameClock
+from pacing import FramePacer
+from engine import SimulationEngine
+from intraday import IntradayFeed, IntradayStream, session_intraday_ticks
+from journal import MODE_HARD, SessionJournal, session_seed
+from pricecache import to_price_df, write_price_csv
+from news import CATALOG, read_user_news
+from pricegen import hard_mode_prices
+from io_worker import IOExecutor
+from providers import default_provider
+from rankings import load_top_players, open_store
+from uibatch import FrameBatcher
 
 matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'Arial']
 matplotlib.rcParams['axes.unicode_minus'] = False
 
-#virtual news
-NEWS = {
-    "Fed Raises Interest Rates by 0.25%\n": 0.95,
-    "Fed Raises Interest Rates by 0.5%\n": 0.92,
-    "Fed Raises Interest Rates by 0.75%\n": 0.88,
-    "Fed Cut Interest Rates by 0.25%\n": 1.05,
-    "Fed Cut Interest Rates by 0.5%\n": 1.1,
-    "Fed Cut Interest Rates by 0.75%\n": 1.15,
-    "War Breaks Out\n": 1.1,
-    "Exacerbate Geopolitical Tensions\n": 1.1,
-    "New Rescue Act Onboard\n": 0.9
-}
-
-
 
 # Account
 class Account:
@@ -40,6 +35,7 @@ class Account:
         self.entry_price = 0.0
         self.lot_size = lot_size 
         self.name = name
+        self.realized_pnl = 0.0  # P&L booked by closed positions
 
     def buy(self, price, quantity):
         if self.position != 0:
@@ -68,7 +64,7 @@ class Account:
             return "No Position Can be Sell", 0.0
         pnl = (current_price - self.entry_price) * self.position * self.lot_size
         self.balance += pnl
-        gloProfit.set(gloProfit.get() + pnl)
+        self.realized_pnl += pnl
         margin_released = abs(self.entry_price * self.position * 0.1)
         self.balance += margin_released
         pos = self.position
@@ -97,79 +93,51 @@ class TradingGameUI:
 
         self.account = Account(initial_balance=100000.0, lot_size=1)
         self.price_df = pd.DataFrame()
+        self.engine = None
         self.days = []
         self.total_days = 0
-        self.idx = 0
-        self.price_history = []
-
-        self.ProfitHist = np.array([])
-
-        global gloProfit
-        gloProfit = tk.DoubleVar(value=0.0)
-        self.UnrealizedProfit = tk.DoubleVar(value = 0.0)
+        self.profit_window = None   # ProfitChartWindow while the popup is open
 
         self.total_game_ms = 10 * 60 * 1000  
         self.update_interval_ms = 1000 
-        self.origin_interval_ms = 1000
-        self.timer_running = False
+        self.clock = None           # GameClock once the game starts
+        self.intraday_stream = None # IntradayStream when GOLD_MAGNATE_INTRADAY is set
+        self.intraday = None        # its IntradayFeed once the game starts
+        self._ending = False        # set by end_game: no more orders, no second save
+
+        # Disk/network I/O runs here, off the Tk thread (jobs run in order: custom news, then prices)
+        self.io = IOExecutor(self.root)
 
         self.news_map = {}
         self.load_my_news()
 
         self.build_ui()
-        self.fetch_data()
-        self.start_game()
+        self.view_updates = FrameBatcher(self.root, self.render_frame)  # at most one redraw per frame
+        # Simplifies or skips chart frames when rendering cannot keep up with the clock
+        self.pacer = FramePacer(lambda: self.clock.period if self.clock else self.update_interval_ms / 1000.0)
+        self.pacer.add_chart(self.chart)
+        self.fetch_data()  # starts the game once prices are loaded
 
     def fetch_data(self):
+        # The random path starts from real 2008 data: offline first (binary-cached gold_2008.csv),
+        # otherwise Yahoo Finance, on the I/O worker so the window stays responsive (see providers.py)
+        self.io.submit(default_provider("gold_2008.csv").fetch,
+                       on_done=self._on_prices_loaded, on_error=self._on_prices_failed)
+
+    def _on_prices_failed(self, e):
+        messagebox.showerror("Data Load Failed", f"Cannot Load Data: {e}")
+        self.root.quit()
+
+    def _on_prices_loaded(self, prices):
         cache_file = "gold_magnate_harder.csv"
-        # if os.path.exists(cache_file):
-        #     try:
-        #         self.price_df = pd.read_csv(cache_file, index_col=0, parse_dates=True)
-        #         self.price_df = self.price_df[['Close']].dropna()
-        #     except Exception:
-        #         self.price_df = pd.DataFrame()
-
-        if self.price_df.empty:
-            try:
-                period1 = 1199120400 
-                period2 = 1230656400 
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/GC=F?symbol=GC=F&period1={period1}&period2={period2}&interval=1d"
-                req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-                ctx = ssl.create_default_context()
-                ctx.check_hostname = False
-                ctx.verify_mode = ssl.CERT_NONE
-                with urllib.request.urlopen(req, context=ctx) as resp:
-                    data = json.loads(resp.read().decode('utf-8'))
-                closes = data['chart']['result'][0]['indicators']['quote'][0]['close']
-                ts = data['chart']['result'][0]['timestamp']
-                dates = pd.to_datetime(ts, unit='s')
-                self.price_df = pd.DataFrame({'Close': closes}, index=dates).dropna()
-
-                rand_array = np.random.randn(253)
-                indexs = self.price_df.index.tolist()
-                values = self.price_df.values
-
-
-                index = 2
-                while index < len(rand_array):
-                    values[index] = str(float(values[index-1][0])*abs(1-float(rand_array[index]/100)))
-                    r = random.randint(1, 98)
-                    if r>=90:
-                        values[index] = values[index] * list(NEWS.items())[r%10][1]
-                        self.news_map[indexs[index]]=list(NEWS.items())[r%10][0]
-                    index+=1
-                index = 2
-                while index < len(indexs):
-                    self.price_df.loc[indexs[index],'Close'] = values[index]
-                    index+=1
-
-                self.price_df.to_csv(cache_file)
-                # print(self.news_map)
-                # exit(0)
-            except Exception as e:
-                messagebox.showerror("Data Load Failed", f"Cannot Load Data: {e}")
-                self.root.quit()
-                return
+        # Keep the first two real closes, randomize the rest in one vectorized pass (seeded, so replayable)
+        seed = session_seed()
+        self.price_df, news_ids = hard_mode_prices(to_price_df(*prices), seed)
+        if len(self.price_df) >= 2:
+            for i in np.flatnonzero(news_ids >= 0):
+                self.news_map[self.price_df.index[i].strftime("%Y-%m-%d")] = CATALOG.texts[news_ids[i]]
+            self.io.submit(write_price_csv, cache_file, self.price_df.index.asi8.copy(),
+                           self.price_df['Close'].to_numpy(copy=True))
 
         self.days = list(self.price_df.index)
         self.total_days = len(self.days)
@@ -178,27 +146,35 @@ class TradingGameUI:
             self.root.quit()
             return
 
+        sub_ticks = session_intraday_ticks()
+        journal = SessionJournal.for_game(self.player_name, MODE_HARD, seed,
+                                          self.account.initial_balance, self.total_days, intraday=sub_ticks)
+        self.engine = SimulationEngine(self.price_df, account=self.account, news_map=self.news_map,
+                                       seed=seed, news_ids=news_ids, journal=journal)
+        self.engine.subscribe(lambda _engine, price, day: self.view_updates.notify(price, day))
+
         self.update_interval_ms = max(200, int(self.total_game_ms / self.total_days))
+        self.chart.set_x_extent(self.total_days + 1)
 
-        first_price = float(self.price_df.iloc[0]['Close'])
-        self.price_history = [first_price]
+        first_price = self.engine.price_history[0]
         self.log(f"Data Loaded :{self.total_days} Trading Days. Will rocess {self.update_interval_ms} ms As 1 Day(tTotal Time is 10 Mins)")
+        self.log(f"Session Seed {seed}, Journal: {journal.path}")
+        if sub_ticks:
+            self.intraday_stream = IntradayStream(self.engine.day_prices, sub_ticks, seed)
+            self.log(f"Intraday Mode: {sub_ticks} Price Moves Per Day, Orders Fill At The Live Price")
         self.refresh_top_panel(first_price, self.days[0])
+        self.start_game()
 
     def load_my_news(self):
         file = "my_news.json"
-        if not os.path.exists(file):
-            return
-        try:
-            with open(file, "r", encoding="utf-8") as f:
-                user_news = json.load(f)
-            for k, v in user_news.items():
-                if isinstance(v, list):
-                    self.news_map[k] = ";".join(str(x) for x in v)
-                else:
-                    self.news_map[k] = str(v)
-        except Exception as e:
-            messagebox.showwarning("New Load Warning", f"read my_news.json failed: {e}")
+        self.io.submit(lambda: read_user_news(file, sep=";") if os.path.exists(file) else {},
+                       on_done=self._on_my_news_loaded,
+                       on_error=lambda e: messagebox.showwarning("New Load Warning", f"read my_news.json failed: {e}"))
+
+    def _on_my_news_loaded(self, news):
+        # Registered on the Tk thread, so the catalog never changes under the engine or the views
+        for k, code in CATALOG.add_user_news(news).items():
+            self.news_map[k] = CATALOG.texts[code]
 
     def show_help_window(self):
         """Creates a new window to display the game tutorial."""
@@ -230,7 +206,8 @@ The main screen is divided into four key areas:
     * `Buy`: Click this to open a long position. You profit if the price goes up.
     * `Sell`: Click this to open a short position. You profit if the price goes down.
     * `Sell All`: Click this to close your current open position and realize any profit or loss.
-    * `Speed Up(x2) / Normal Speed`: Toggles the game speed between normal and 2x.
+    * `Speed`: Cycles the game speed through x1, x2, x4, x16 and x64.
+    * `Fast Forward / Normal Play`: Plays many days per frame, so the rest of the year passes in seconds.
     * `Pause / Resume`: Pauses or resumes the automatic progression of the game timeline.
     * `End Game`: Allows you to end the game session prematurely.
     * `Profit / History`: Click to view a chart of your total profit over time.
@@ -255,7 +232,7 @@ The main screen is divided into four key areas:
     * If you believe the price will rise, click `Buy`.
     * If you believe the price will fall, click `Sell`.
 
-5.  **Manage Your Position:** As the game progresses, your `Floating Profit And Loss` will update. You can use the `Pause` and `Speed Up` buttons to control the pace of the game.
+5.  **Manage Your Position:** As the game progresses, your `Floating Profit And Loss` will update. You can use the `Pause` and `Speed` buttons to control the pace of the game.
 
 6.  **Close Your Position:** When you are ready to exit your trade, click `Sell All`. Your profit or loss will be added to your account balance, and the margin used for the trade will be returned.
 
@@ -316,13 +293,15 @@ Good luck, and may you become a Gold Magnate!
         tk.Button(btns, text="Buy (Long)", font=self.font_big, command=self.buy_action, width=10).grid(row=0, column=0, padx=4, pady=4)
         tk.Button(btns, text="Sell (Short)", font=self.font_big, command=self.sell_action, width=10).grid(row=0, column=1, padx=4, pady=4)
         tk.Button(btns, text="Close Position", font=self.font_big, command=self.close_action, width=10).grid(row=1, column=0, padx=4, pady=4)
-        self.speed_btn=tk.Button(btns, text="Speed Up(x2)", font=self.font_big, command=self.speed_up, width=10)
+        self.speed_btn=tk.Button(btns, text="Speed x1", font=self.font_big, command=self.speed_up, width=10)
         self.speed_btn.grid(row=1, column=1, padx=4, pady=4)
 
         
         self.pause_btn=tk.Button(btns, text="Pause", font=self.font_big, command=self.game_control, width=10)
         self.pause_btn.grid(row=2, column=0, padx=4, pady=4)
         tk.Button(btns, text="End Game", font=self.font_big, command=self.end_game, width=10).grid(row=2, column=1, padx=4, pady=4)
+        self.ff_btn=tk.Button(btns, text="Fast Forward", font=self.font_big, command=self.fast_forward, width=10)
+        self.ff_btn.grid(row=3, column=0, padx=4, pady=4)
 
         tk.Label(trade, text="Note: 10% insurence, close out first, then reverse Liquidation", font=("Microsoft YaHei", 12)).pack(anchor="w", pady=(6, 0))
 
@@ -343,6 +322,7 @@ Good luck, and may you become a Gold Magnate!
         self.canvas = FigureCanvasTkAgg(self.fig, master=chart_frame)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart = BlitLineChart(self.canvas, self.ax, self.line)
 
         bottom = tk.Frame(self.root)
         bottom.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=False, padx=8, pady=(4, 8))
@@ -387,89 +367,85 @@ Good luck, and may you become a Gold Magnate!
 
     # Start Game
     def start_game(self):
-        self.timer_running = True
-        self.root.after(self.update_interval_ms, self.tick)
-
-    def tick(self):
-        if not self.timer_running:
-            return
-
-        if self.idx >= self.total_days:
+        self.clock = GameClock(self.root, self.update_interval_ms, self.tick)
+        self.clock.start()
+        if self.intraday_stream is not None:
+            self.intraday = IntradayFeed(self.root, self.engine, self.intraday_stream, self.clock)
+            self.intraday.start()
+
+    def tick(self, days=1):
+        # Called by the clock: one day per tick, or a batch of days per frame when fast-forwarding
+        if self.engine.finished:
             self.end_game()
             return
 
-        day = self.days[self.idx]
-        price = float(self.price_df.iloc[self.idx]['Close'])
-        self.price_history.append(price)
-
-        self.line.set_data(range(len(self.price_history)), self.price_history)
-        self.ax.relim()
-        self.ax.autoscale_view()
-        self.canvas.draw()
-
-        self.UnrealizedProfit.set(self.account.floating_pnl(price))
-        
-        self.ProfitHist = np.append(self.ProfitHist, gloProfit.get()+self.UnrealizedProfit.get())
-
-        
-        # dstr = day.strftime("%Y-%m-%d")
-        if self.news_map.get(day, "") != "":
-            news_text = day.strftime("%Y-%m-%d") + " : " + self.news_map.get(day, "")
-            self.set_news(news_text)
-
+        # Chart and top panel follow via the engine observer (render_frame, once per frame)
+        news = []
+        for _ in range(days):
+            tick = self.engine.step()
+            if tick is None:
+                break
+            if tick.news_text != "":
+                news.append(tick.date + " : " + tick.news_text)
+        if news:
+            self.set_news("".join(news))
+
+    def render_frame(self, price, day):
+        """Redraw the price curve and top panel; batched by self.view_updates to once per frame."""
+        price_history = self.engine.price_history
+        # Only a new day changes the chart; trades and intraday moves just update the labels
+        if self.pacer.should_draw(self.engine.idx, force=self.engine.finished):
+            with self.pacer.measure():
+                self.chart.update(price_history.indices(), price_history.view())
         self.refresh_top_panel(price, day)
 
-        self.idx += 1
-
-        self.root.after(self.update_interval_ms, self.tick)
-
     def game_control(self):
-        if self.timer_running:
-            self.timer_running = False
-            self.pause_btn['text']="Resume"
-        else:
-            self.timer_running = True
-            self.pause_btn['text']="Pause"
-        self.root.after(self.update_interval_ms, self.tick)
+        if self.clock is None:
+            return  # prices still loading
+        self.pause_btn['text'] = "Pause" if self.clock.toggle() else "Resume"
 
     def speed_up(self):
-        if self.speed_btn['text']=="Speed Up(x2)":
-            self.origin_interval_ms = self.update_interval_ms
-            self.update_interval_ms = self.origin_interval_ms//2
-            self.speed_btn['text']="Normal Speed"
-        elif self.speed_btn['text']=="Normal Speed":
-            self.update_interval_ms = self.origin_interval_ms
-            self.speed_btn['text']="Speed Up(x2)"
-        self.root.after(self.update_interval_ms, self.tick)
+        # x1 -> x2 -> x4 -> x16 -> x64 -> x1; the clock keeps a single timer across changes
+        if self.clock is None:
+            return  # prices still loading
+        self.speed_btn['text'] = f"Speed x{self.clock.cycle_speed()}"
+
+    def fast_forward(self):
+        # Many days per frame, rendered at most 30 times a second; same engine, so same P&L and news
+        if self.clock is None:
+            return  # prices still loading
+        self.ff_btn['text'] = "Normal Play" if self.clock.toggle_turbo() else "Fast Forward"
 
     # Trading Actions
     def _current_trade_price(self):
-        use_idx = max(0, self.idx - 1)
-        return float(self.price_df.iloc[use_idx]['Close']), self.days[use_idx]
+        return self.engine.current_trade_price()
 
     def buy_action(self):
+        if self.engine is None or self._ending:
+            return  # prices still loading, or the game is over
         qty = self._get_qty()
         if qty is None:
             return
         price, day = self._current_trade_price()
-        msg, ok = self.account.buy(price, qty)
+        msg, ok = self.engine.buy(qty)
         self.log(f"{day.strftime('%Y-%m-%d')}  Buy {qty} Qutity @ {price:.2f} → {msg}")
-        self.refresh_top_panel(price, day)
 
     def sell_action(self):
+        if self.engine is None or self._ending:
+            return  # prices still loading, or the game is over
         qty = self._get_qty()
         if qty is None:
             return
         price, day = self._current_trade_price()
-        msg, ok = self.account.sell(price, qty)
+        msg, ok = self.engine.sell(qty)
         self.log(f"{day.strftime('%Y-%m-%d')}  Short Sell {qty} Qutity @ {price:.2f} → {msg}")
-        self.refresh_top_panel(price, day)
 
     def close_action(self):
+        if self.engine is None or self._ending:
+            return  # prices still loading, or the game is over
         price, day = self._current_trade_price()
-        msg, pnl = self.account.close_position(price)
+        msg, pnl = self.engine.close()
         self.log(f"{day.strftime('%Y-%m-%d')}  Sell All @ {price:.2f} → {msg}")
-        self.refresh_top_panel(price, day)
 
     def _get_qty(self):
         try:
@@ -481,57 +457,57 @@ Good luck, and may you become a Gold Magnate!
             messagebox.showerror("Input Error", "Please Input Vaild Number(postive integer)")
             return None
 
-    def drawChart(self):
-            
-        self.ax2.clear()
-        self.ax2.plot(self.ProfitHist, marker='o', color='blue', label='Profit')
-    
-        self.ax2.set_title("Profit History", fontsize=14)
-        self.ax2.set_xlabel("Time", fontsize=12)
-        self.ax2.set_ylabel("Profit", fontsize=12)
-        self.ax2.axhline(y=self.ProfitHist[-1], color="red", linestyle="--", label=f"Profit: {self.ProfitHist[-1]}")
-        
-        self.ax2.legend(loc='upper left')
-        self.ax2.relim()
-        self.ax2.autoscale_view()
-        
-        
-        self.canvas2.draw()
-        self.profitRoot.after(self.update_interval_ms, self.drawChart)
-            
-
-            
+    # ---------- Profit history popup ----------
     def getProfitChart(self):
-        """Open a popup window and start drawing the rolling profit history."""
-        self.profitRoot = tk.Toplevel(self.root)
-        self.profitRoot.title("Profit History")
-        self.profitRoot.geometry("1200x800")
-        self.fig2, self.ax2 = plt.subplots(figsize=(5, 3))
-        self.canvas2 = FigureCanvasTkAgg(self.fig2, master=self.profitRoot)
-        self.canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.drawChart()
-
+        """Open (or raise) the popup that follows the rolling profit history."""
+        if self.engine is None:
+            return  # prices still loading
+        if self.profit_window is not None and self.profit_window.is_open():
+            self.profit_window.lift()
+            return
+        self.profit_window = ProfitChartWindow(self.root, self.engine.profit_history, self.update_interval_ms,
+                                               x_extent=self.total_days, line_color='blue', level_color='red',
+                                               pacer=self.pacer)
 
 
     # ---------- End-of-game settlement ----------
     def end_game(self):
         """Stop timer, auto-close any position at last price, save results, show summary, and exit."""
-        self.timer_running = False
-        last_price = float(self.price_df.iloc[-1]['Close'])
-        if self.account.position != 0:
-           msg, pnl = self.account.close_position(last_price)
+        if self.engine is None or self._ending:
+            return  # prices still loading, or already settled and saving the result
+        self._ending = True
+        self.clock.stop()
+        if self.intraday is not None:
+            self.intraday.stop()
+            self.log(f"Intraday: {self.intraday.summary()}")
+        settled = self.engine.settle()
+        if settled is not None:
+           msg, last_price = settled
            self.log(f"Automatically close a position (last day @ {last_price:.2f}): {msg}")
-
-        final_balance = self.account.balance
-        pl = final_balance - self.account.initial_balance
-        rr = (pl / self.account.initial_balance) * 100.0
-
-        # Save game result
-        df = self.save_game_result(final_balance, pl, rr)
-
-        # Get ranking info
-        current_ranking, total_players = self.get_player_ranking(df)
-
+        self.view_updates.flush()
+        self.log(f"Frame pacing: {self.pacer.summary()}")
+
+        final_balance, pl, rr = self.engine.summary()
+        self.engine.journal.close(final_balance)
+
+        # Save the result and read the ranking on the I/O worker; the summary is shown when done
+        self.log("Saving your result...")
+        self.io.submit(self._save_and_rank, final_balance, pl, rr,
+                       on_done=lambda ranking: self._show_result(final_balance, pl, rr, *ranking),
+                       on_error=lambda e: self._on_save_failed(e, final_balance, pl, rr))
+
+    def _save_and_rank(self, final_balance, pl, rr):
+        """(I/O worker) Save the result; return (ranking, total players, top 5)."""
+        store = self.save_game_result(final_balance, pl, rr)
+        current_ranking, total_players = self.get_player_ranking(store, rr)
+        return current_ranking, total_players, store.top_players(5)
+
+    def _on_save_failed(self, e, final_balance, pl, rr):
+        messagebox.showwarning("Save failed", f"Could not save your result to the leaderboard: {e}")
+        self._show_result(final_balance, pl, rr, None, 0, [])
+
+    def _show_result(self, final_balance, pl, rr, current_ranking, total_players, top_players):
+        """Summary popup and leaderboard, then exit."""
         # Build message
         result_msg = (
                    f"Final account balance: {final_balance:.2f}\n"
@@ -545,61 +521,25 @@ Good luck, and may you become a Gold Magnate!
         messagebox.showinfo("Game over", result_msg)
 
         # Show leaderboard
-        self.show_rankings(df, current_ranking, total_players, rr)
+        self.show_rankings(top_players, current_ranking, total_players, rr)
 
 # =============== Main (with your testing section) ===============
         # Close window
         self.root.quit()
 
     def save_game_result(self, final_balance, pl, rr):
-        """Save game result to CSV file (game_rankings_hard_mode.csv)."""
-        csv_file = "game_rankings_hard_mode.csv"
-        
-        # Create new record
-        new_record = {
-            'player_name': self.player_name,
-            'final_balance': final_balance,
-            'profit_loss': pl,
-            'return_rate': rr,
-            'play_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        
-        # Read existing or create new DataFrame
-        if os.path.exists(csv_file):
-            try:
-                df = pd.read_csv(csv_file)
-            except:
-                df = pd.DataFrame()
-        else:
-            df = pd.DataFrame()
-        
-        # Append new record
-        new_df = pd.DataFrame([new_record])
-        df = pd.concat([df, new_df], ignore_index=True)
-        
-        # Save
-        df.to_csv(csv_file, index=False)
-        
-        return df
+        """Append game result to the ranking file (game_rankings_hard_mode.csv) and return the ranking store."""
+        store = open_store("game_rankings_hard_mode.csv")
+        store.append(self.player_name, final_balance, pl, rr)
+        return store
     
-    def get_player_ranking(self, df):
+    def get_player_ranking(self, store, rr):
         """Get current player's ranking among all records (by return_rate)."""
-        if df.empty:
+        if len(store) == 0:
             return None, 0
-        
-        # Sort by return rate
-        df_sorted = df.sort_values('return_rate', ascending=False).reset_index(drop=True)
-        
-        # Find current player's latest record's ranking
-        current_record = df_sorted[df_sorted['player_name'] == self.player_name].iloc[-1:]
-        if not current_record.empty:
-            ranking = df_sorted.index[df_sorted['return_rate'] == current_record['return_rate'].iloc[0]][0] + 1
-            total_players = len(df_sorted)
-            return ranking, total_players
-        
-        return None, len(df_sorted)
+        return store.rank_of(rr), len(store)
     
-    def show_rankings(self, df, current_ranking, total_players, current_rr):
+    def show_rankings(self, top_players, current_ranking, total_players, current_rr):
         """Show leaderboard window (Top 5 and current player's position)."""
         ranking_window = tk.Toplevel(self.root)
         ranking_window.title("Game Rankings - 2008 Original")
@@ -639,11 +579,7 @@ Good luck, and may you become a Gold Magnate!
         top5_label.pack(pady=(0, 15))
         
         # Content
-        if not df.empty:
-            # Sort by return and keep each player's best
-            df_best = df.loc[df.groupby('player_name')['return_rate'].idxmax()]
-            df_sorted = df_best.sort_values('return_rate', ascending=False).head(5)
-            
+        if top_players:
             # Container
             ranking_frame = tk.Frame(main_frame, bg='white')
             ranking_frame.pack(fill=tk.BOTH, expand=True)
@@ -651,7 +587,7 @@ Good luck, and may you become a Gold Magnate!
             medals = ['🥇', '🥈', '🥉', '🏅', '🏅']
             colors = ['#ffd700', '#c0c0c0', '#cd7f32', '#4a90e2', '#4a90e2']
             
-            for idx, (_, row) in enumerate(df_sorted.iterrows()):
+            for idx, row in enumerate(top_players):
                 medal = medals[idx] if idx < len(medals) else f"#{idx+1}"
                 color = colors[idx] if idx < len(colors) else '#7f8c8d'
                 
@@ -699,65 +635,70 @@ Good luck, and may you become a Gold Magnate!
                               font=("Microsoft YaHei", 18, "bold"), bg='white', fg='#2c3e50')
         title_label.pack(pady=(0, 15))
         
-        # If there is data
-        if os.path.exists(csv_file):
-            try:
-                df = pd.read_csv(csv_file)
-                if not df.empty:
-                    # Sort by return and keep only best attempt per player
-                    df_best = df.loc[df.groupby('player_name')['return_rate'].idxmax()]
-                    df_sorted = df_best.sort_values('return_rate', ascending=False).head(5)
-                    
-                    # Content frame
-                    content_frame = tk.Frame(main_frame, bg='white')
-                    content_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
-                    
-                    # Header
-                    header_frame = tk.Frame(content_frame, bg='#34495e', height=40)
-                    header_frame.pack(fill=tk.X, pady=(0, 2))
-                    header_frame.pack_propagate(False)
-                    
-                    header_text = "Rank   Player Name          Return Rate      Final Balance"
-                    header_label = tk.Label(header_frame, text=header_text, 
-                                          font=("Courier New", 12, "bold"),
-                                          bg='#34495e', fg='white', anchor='w')
-                    header_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-                    
-                    # Ranking items
-                    bg_colors = ['#fff9c4', '#f0f0f0', '#ffeaa7', '#ddd', '#ddd']
-                    
-                    for idx, (_, row) in enumerate(df_sorted.iterrows()):
-                        rank_frame = tk.Frame(content_frame, bg=bg_colors[idx], height=35)
-                        rank_frame.pack(fill=tk.X, pady=1)
-                        rank_frame.pack_propagate(False)
-                        
-                        # Formatted display text
-                        rank_num = f"#{idx + 1}"
-                        player_name = str(row['player_name'])[:16]  # length limit
-                        player_name = str(row['player_name'])[:16]
-                        return_rate = f"{row['return_rate']:+6.2f}%"
-                        balance = f"${row['final_balance']:>13,.0f}"
-                        
-                        rank_text = f"{rank_num:<6} {player_name:<16} {return_rate:>12} {balance:>16}"
-                        
-                        rank_label = tk.Label(rank_frame, text=rank_text, 
-                                            font=("Courier New", 11, "bold" if idx < 3 else "normal"),
-                                            bg=bg_colors[idx], fg='#2c3e50', anchor='w')
-                        rank_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=2)
-                    
-                else:
-                    no_data_label = tk.Label(main_frame, text="No ranking data available yet.\nComplete a game to see rankings!", 
-                                           font=self.font_big, bg='white', fg='#7f8c8d')
-                    no_data_label.pack(expand=True)
-                    
-            except Exception as e:
-                error_label = tk.Label(main_frame, text=f"Error loading ranking data:\n{str(e)}", 
+        # Rankings are read in the background; the window shows "Loading..." until they arrive
+        body_frame = tk.Frame(main_frame, bg='white')
+        body_frame.pack(fill=tk.BOTH, expand=True)
+        loading_label = tk.Label(body_frame, text="Loading rankings...", font=self.font_big, bg='white', fg='#7f8c8d')
+        loading_label.pack(expand=True)
+
+        def show(top_players):
+            if not ranking_window.winfo_exists():
+                return  # closed while loading
+            loading_label.destroy()
+            if top_players is None:
+                no_file_label = tk.Label(body_frame, text="No ranking file found.\nComplete a game to create the leaderboard!", 
+                                       font=self.font_big, bg='white', fg='#7f8c8d')
+                no_file_label.pack(expand=True)
+            elif not top_players:
+                no_data_label = tk.Label(body_frame, text="No ranking data available yet.\nComplete a game to see rankings!", 
+                                       font=self.font_big, bg='white', fg='#7f8c8d')
+                no_data_label.pack(expand=True)
+            else:
+                # Content frame
+                content_frame = tk.Frame(body_frame, bg='white')
+                content_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+
+                # Header
+                header_frame = tk.Frame(content_frame, bg='#34495e', height=40)
+                header_frame.pack(fill=tk.X, pady=(0, 2))
+                header_frame.pack_propagate(False)
+
+                header_text = "Rank   Player Name          Return Rate      Final Balance"
+                header_label = tk.Label(header_frame, text=header_text, 
+                                      font=("Courier New", 12, "bold"),
+                                      bg='#34495e', fg='white', anchor='w')
+                header_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+                # Ranking items
+                bg_colors = ['#fff9c4', '#f0f0f0', '#ffeaa7', '#ddd', '#ddd']
+
+                for idx, row in enumerate(top_players):
+                    rank_frame = tk.Frame(content_frame, bg=bg_colors[idx], height=35)
+                    rank_frame.pack(fill=tk.X, pady=1)
+                    rank_frame.pack_propagate(False)
+
+                    # Formatted display text
+                    rank_num = f"#{idx + 1}"
+                    player_name = str(row['player_name'])[:16]  # length limit
+                    player_name = str(row['player_name'])[:16]
+                    return_rate = f"{row['return_rate']:+6.2f}%"
+                    balance = f"${row['final_balance']:>13,.0f}"
+
+                    rank_text = f"{rank_num:<6} {player_name:<16} {return_rate:>12} {balance:>16}"
+
+                    rank_label = tk.Label(rank_frame, text=rank_text, 
+                                        font=("Courier New", 11, "bold" if idx < 3 else "normal"),
+                                        bg=bg_colors[idx], fg='#2c3e50', anchor='w')
+                    rank_label.pack(fill=tk.BOTH, expand=True, padx=10, pady=2)
+
+        def failed(e):
+            if ranking_window.winfo_exists():
+                loading_label.destroy()
+                error_label = tk.Label(body_frame, text=f"Error loading ranking data:\n{str(e)}", 
                                      font=self.font_big, bg='white', fg='#e74c3c')
                 error_label.pack(expand=True)
-        else:
-            no_file_label = tk.Label(main_frame, text="No ranking file found.\nComplete a game to create the leaderboard!", 
-                                   font=self.font_big, bg='white', fg='#7f8c8d')
-            no_file_label.pack(expand=True)
+
+        self.io.submit(load_top_players, csv_file, 5, on_done=show, on_error=failed)
         
         # Buttons frame
         btn_frame = tk.Frame(main_frame, bg='white')
@@ -0,0 +1,69 @@
+"""Preallocated, array-backed history storage.
+
+``np.append`` copies the whole array on every call, which turns a session's
+price/P&L history into O(n^2) work. ``HistoryBuffer`` allocates once (sized
+from the session length), appends in O(1) and hands out zero-copy NumPy views
+for plotting and statistics.
+
+The buffer is a ring: once ``capacity`` values have been stored, the oldest
+value is dropped. Every value is written twice (at ``i`` and ``i + capacity``)
+so the most recent ``capacity`` values are always one contiguous slice and
+``view()`` never has to copy, even after wrapping.
+"""
+import numpy as np
+
+
+class HistoryBuffer:
+    """Fixed-capacity ring buffer with contiguous zero-copy views.
+
+    Args:
+        capacity (int): Maximum number of values kept (e.g. total_days + 1).
+        dtype: NumPy dtype of the stored values.
+    """
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = max(1, int(capacity))
+        self._data = np.zeros(2 * self.capacity, dtype=dtype)
+        self._x = np.arange(self.capacity, dtype=np.float64)
+        self._count = 0
+
+    def append(self, value):
+        """Store one value in O(1), overwriting the oldest once full."""
+        i = self._count % self.capacity
+        self._data[i] = value
+        self._data[i + self.capacity] = value
+        self._count += 1
+
+    def view(self):
+        """Read-only view of the stored values, oldest first (no copy)."""
+        n = len(self)
+        start = (self._count - n) % self.capacity
+        v = self._data[start:start + n]
+        v.flags.writeable = False
+        return v
+
+    def indices(self):
+        """Read-only 0..n-1 x-values matching view(), for plotting (no copy)."""
+        v = self._x[:len(self)]
+        v.flags.writeable = False
+        return v
+
+    def clear(self):
+        self._count = 0
+
+    @property
+    def total_appended(self):
+        """Number of values ever appended, including ones dropped by wrapping."""
+        return self._count
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def __getitem__(self, key):
+        return self.view()[key]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __array__(self, dtype=None, copy=None):
+        v = self.view()
+        return v if dtype is None else v.astype(dtype)
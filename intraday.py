@@ -0,0 +1,318 @@
+"""Synthetic intraday prices between the daily ticks.
+
+Both games move the price once per trading day. In intraday mode the price
+also moves between two ticks: each day's gap from the previous tick price to
+the next one is filled with N sub-ticks of a Brownian bridge in log price
+(volatility taken from the session's own daily moves), which starts at the
+previous tick and ends exactly on the next, so the daily closes, the news and
+the chart are unchanged. Orders fill at the live sub-tick price.
+
+A day's bridge is generated on demand from (session seed, day), so paths are
+produced lazily one day at a time (memory does not grow with the session) and
+journal replay can regenerate the exact price of any recorded fill.
+
+IntradayFeed streams the sub-ticks into the engine from a frame timer: each
+frame it skips the generator ahead to where the clock is within the day and
+publishes only that price, so thousands of sub-ticks a second cost one
+engine notification (and at most one redraw) per frame.
+
+Enable it with GOLD_MAGNATE_INTRADAY=<sub-ticks per day>:
+
+    GOLD_MAGNATE_INTRADAY=1000 python start.py
+    python intraday.py test
+    python intraday.py bench
+"""
+import os
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
+MAX_SUB_TICKS = 32767   # the sub-tick of a fill is journaled as an i2
+FEED_FPS = 60
+
+
+def session_intraday_ticks():
+    """Sub-ticks per day for a new game: GOLD_MAGNATE_INTRADAY if set, else 0 (daily prices only)."""
+    n = int(os.environ.get("GOLD_MAGNATE_INTRADAY") or 0)
+    return min(n, MAX_SUB_TICKS) if n > 1 else 0
+
+
+class IntradayStream:
+    """Seeded Brownian-bridge sub-ticks between consecutive day prices.
+
+    Day d's path runs from day_prices[d - 1] (sub-tick 0) to day_prices[d]
+    (sub-tick n_sub); the sub-ticks in between are 1..n_sub - 1.
+
+    Args:
+        day_prices (np.ndarray): The price shown at each tick (engine.day_prices).
+        n_sub (int): Sub-ticks per day.
+        seed (int): Session seed.
+        vol (float): Daily log-price volatility (default: measured from day_prices).
+    """
+    def __init__(self, day_prices, n_sub, seed, vol=None):
+        if not 1 < n_sub <= MAX_SUB_TICKS:
+            raise ValueError(f"n_sub must be in 2..{MAX_SUB_TICKS}")
+        self.log_prices = np.log(np.asarray(day_prices, dtype=np.float64))
+        self.day_prices = np.asarray(day_prices, dtype=np.float64)
+        self.n_sub = n_sub
+        self.seed = seed
+        if vol is None:
+            moves = np.diff(self.log_prices)
+            vol = float(np.std(moves)) if len(moves) > 1 else 0.01
+        self.vol = vol
+        self._t = np.arange(1, n_sub + 1) / n_sub
+        self._cached = (None, None)
+
+    def __len__(self):
+        return len(self.day_prices)
+
+    def _bridge(self, day):
+        """Prices at sub-ticks 1..n_sub of `day`; the last is exactly the day's price."""
+        rng = np.random.default_rng([self.seed, day])
+        walk = np.cumsum(rng.standard_normal(self.n_sub)) * (self.vol / np.sqrt(self.n_sub))
+        a, b = self.log_prices[day - 1], self.log_prices[day]
+        path = np.exp(a + self._t * (b - a) + walk - self._t * walk[-1])
+        path[-1] = self.day_prices[day]
+        return path
+
+    def day_path(self, day):
+        """Prices at sub-ticks 1..n_sub - 1 of `day` (1 <= day < len(self))."""
+        if self._cached[0] != day:
+            self._cached = (day, self._bridge(day)[:-1])
+        return self._cached[1]
+
+    def price_at(self, day, sub):
+        return float(self.day_path(day)[sub - 1])
+
+    def iter_day(self, day):
+        """Generator of the day's sub-tick prices, generated on first use."""
+        yield from self.day_path(day).tolist()
+
+    def ticks(self, start=1):
+        """Generator of (day, sub, price) over the rest of the session, one day in memory at a time."""
+        for day in range(max(1, start), len(self)):
+            for sub, price in enumerate(self.iter_day(day), 1):
+                yield day, sub, price
+
+
+class IntradayFeed:
+    """Stream a session's sub-ticks into the engine in step with the game clock.
+
+    Args:
+        root (tk.Misc): Widget whose event loop runs the feed.
+        engine (SimulationEngine): Receives the live price (set_live_price).
+        stream (IntradayStream): The session's sub-ticks.
+        clock (GameClock): Where the game is within the current day (progress()).
+        fps (int): Feed frames per second.
+    """
+    def __init__(self, root, engine, stream, clock, fps=FEED_FPS):
+        self.root = root
+        self.engine = engine
+        self.stream = stream
+        self.clock = clock
+        self.frame_ms = max(1, round(1000 / fps))
+        self.streamed = 0           # sub-ticks passed (published or skipped over)
+        self.published = 0          # live prices handed to the engine
+        self._after_id = None
+        self._day = None
+        self._sub = 0
+        self._subticks = None
+
+    def start(self):
+        self.stop()
+        self._after_id = self.root.after(self.frame_ms, self._pump)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _pump(self):
+        self._after_id = self.root.after(self.frame_ms, self._pump)
+        self.pump()
+
+    def pump(self):
+        """Publish the sub-tick the clock has reached, if it moved since the last frame."""
+        engine = self.engine
+        if engine.finished or engine.idx == 0 or self.clock.turbo:
+            return
+        if engine.idx != self._day:  # a new day: start its bridge
+            self._day, self._sub = engine.idx, 0
+            self._subticks = self.stream.iter_day(engine.idx)
+        target = min(int(self.clock.progress() * self.stream.n_sub), self.stream.n_sub - 1)
+        if target <= self._sub:
+            return
+        price = next(islice(self._subticks, target - self._sub - 1, None))
+        self.streamed += target - self._sub
+        self.published += 1
+        self._sub = target
+        engine.set_live_price(price, target)
+
+    def summary(self):
+        return (f"{self.streamed} intraday sub-ticks streamed ({self.stream.n_sub}/day), "
+                f"{self.published} published")
+
+
+if __name__ == "__main__":
+    import random
+    import tracemalloc
+
+    from clock import GameClock
+    from engine import SimulationEngine
+    from pricecache import load_price_df
+
+    class VirtualRoot:
+        """Tk after()/after_cancel() on a virtual clock: run_until() jumps straight to each due callback."""
+        def __init__(self):
+            self.now = 0.0
+            self.timers = {}
+            self._ids = 0
+
+        def after(self, ms, fn):
+            self._ids += 1
+            self.timers[self._ids] = (self.now + ms / 1000.0, self._ids, fn)
+            return self._ids
+
+        def after_cancel(self, timer_id):
+            self.timers.pop(timer_id, None)
+
+        def run_until(self, t):
+            while self.timers:
+                timer_id, (due, _n, fn) = min(self.timers.items(), key=lambda kv: kv[1][:2])
+                if due > t:
+                    break
+                del self.timers[timer_id]
+                self.now = due
+                fn()
+            self.now = max(self.now, t)
+
+    def play(n_sub, seed, directory, speed=1, days_per_s=10, close=None):
+        """A virtual-time game with the feed running and random orders at frame boundaries (close(engine) closes)."""
+        from journal import MODE_2008, SessionJournal
+        df = load_price_df("gold_2008.csv")
+        journal = SessionJournal.for_game("tester", MODE_2008, seed, 100000.0, len(df),
+                                          directory=directory, intraday=n_sub)
+        engine = SimulationEngine(df, random_news=True, seed=seed, journal=journal)
+        root = VirtualRoot()
+        clock = GameClock(root, 1000 / days_per_s, lambda days: engine.step(), time_fn=lambda: root.now)
+        clock.set_speed(speed)
+        feed = IntradayFeed(root, engine, IntradayStream(engine.day_prices, n_sub, seed), clock)
+        rng = random.Random(seed)
+        fills = []
+
+        def trader():
+            root.after(50, trader)
+            r = rng.random()
+            if r < 0.03:
+                engine.buy(rng.randint(1, 5))
+            elif r < 0.06:
+                engine.sell(rng.randint(1, 5))
+            elif r < 0.09 and engine.account.position != 0:
+                (close or SimulationEngine.close)(engine)
+            else:
+                return
+            fills.append(engine.live_sub)
+
+        clock.start()
+        feed.start()
+        root.after(50, trader)
+        while not engine.finished:
+            root.run_until(root.now + 1.0)
+        clock.stop()
+        feed.stop()
+        engine.settle()
+        journal.close(engine.summary()[0])
+        return engine, journal, feed, fills
+
+    if "test" in sys.argv:
+        import tempfile
+        from journal import replay
+        print("Tests begin.")
+
+        df = load_price_df("gold_2008.csv")
+        closes = df['Close'].to_numpy()
+        stream = IntradayStream(closes, 500, seed=7)
+        ends = all(stream._bridge(d)[-1] == closes[d] for d in range(1, len(closes)))
+        first = np.array([stream._bridge(d)[0] for d in range(1, len(closes))])
+        near = np.abs(np.log(first / closes[:-1])).max()
+        print(f"Bridge Test: every day ends on its close, first sub-tick within {near:.2%} of the previous "
+              f"-> {ends and near < 0.01}")
+
+        again = IntradayStream(closes, 500, seed=7)
+        same = all(np.array_equal(again.day_path(d), stream.day_path(d)) for d in (200, 3, 150))
+        other = not np.array_equal(IntradayStream(closes, 500, seed=8).day_path(3), stream.day_path(3))
+        print(f"Determinism Test: same path per (seed, day) in any order, differs by seed -> {same and other}")
+
+        realized = np.diff(np.log(np.concatenate([[closes[0]], stream._bridge(1)])))
+        print(f"Volatility Test: daily vol {stream.vol:.4f}, sub-tick vol {realized.std():.5f} "
+              f"(expect ~{stream.vol / np.sqrt(stream.n_sub):.5f})")
+
+        big = IntradayStream(closes, 10000, seed=1)
+        tracemalloc.start()
+        count = sum(1 for _ in big.ticks())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"Constant Memory Test: {count:,} sub-ticks streamed with a peak of {peak / 1e6:.2f} MB "
+              f"(whole session {count * 8 / 1e6:.1f} MB) -> {peak < count * 8 / 20}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            engine, journal, feed, fills = play(1000, seed=2024, directory=tmp, speed=4)
+            intraday = sum(sub > 0 for sub in fills)
+            result = replay(journal.path)
+            print(f"Live Fill Test: {intraday}/{len(fills)} orders filled at intraday prices -> {intraday > 0}")
+            print(f"Intraday Replay Test: verified={result.verified}, final {result.engine.summary()[0]:.2f} "
+                  f"vs recorded {engine.summary()[0]:.2f}")
+            print(f"Feed Test: {feed.summary()} over {len(df)} days -> "
+                  f"{feed.published < feed.streamed <= len(df) * 1000}")
+
+            # Close through each game's Close button handler, on a stand-in for its Tk window
+            import types
+            import game
+            import game_v2
+            for ui_class in (game.TradingGameUI, game_v2.TradingGameUI):
+                def gui_close(engine, ui_class=ui_class):
+                    view = types.SimpleNamespace(engine=engine, log=lambda msg: None, _ending=False)
+                    view._current_trade_price = types.MethodType(ui_class._current_trade_price, view)
+                    ui_class.close_action(view)
+                engine, journal, _feed, fills = play(1000, seed=77, directory=tmp, speed=4, close=gui_close)
+                result = replay(journal.path)
+                print(f"GUI Close Replay Test ({ui_class.__module__}): {sum(sub > 0 for sub in fills)} intraday "
+                      f"fills, verified={result.verified}, final {result.engine.summary()[0]:.2f} "
+                      f"vs recorded {engine.summary()[0]:.2f}")
+        print("Tests finish.")
+
+    elif "bench" in sys.argv:
+        df = load_price_df("gold_2008.csv")
+        closes = df['Close'].to_numpy()
+        for n_sub in (100, 1000, 10000):
+            stream = IntradayStream(closes, n_sub, seed=1)
+            t = time.perf_counter()
+            count = sum(1 for _ in stream.ticks())
+            elapsed = time.perf_counter() - t
+            print(f"generator, {n_sub:>5} sub-ticks/day: {count / elapsed / 1e6:.2f} M sub-ticks/s")
+
+        # Feed cost per frame at x64 (about 27 days/s): sub-ticks skipped through per Tk callback
+        stream = IntradayStream(closes, 10000, seed=1)
+        engine = SimulationEngine(df, seed=1)
+
+        class Progress:
+            turbo = False
+            value = 0.0
+
+            def progress(self):
+                return self.value
+
+        clock = Progress()
+        feed = IntradayFeed(None, engine, stream, clock)
+        frames = 0
+        t = time.perf_counter()
+        while engine.step() is not None and not engine.finished:
+            for f in range(1, 3):  # ~2 feed frames per day at x64 and 60 fps
+                clock.value = f / 2.2
+                feed.pump()
+                frames += 1
+        elapsed = time.perf_counter() - t
+        print(f"feed at x64: {feed.streamed / elapsed / 1e6:.2f} M sub-ticks/s streamed, "
+              f"{elapsed / frames * 1e6:.0f} us per frame ({frames} frames, engine steps included)")
@@ -0,0 +1,142 @@
+"""Blocking disk and network I/O off the Tk main loop.
+
+Tk is single-threaded: a callback that reads a file, writes the leaderboard
+or waits on the network freezes the whole window until it returns. An
+IOExecutor runs such calls on a background thread and marshals the result
+back onto the Tk thread through a thread-safe queue, which it polls with
+root.after only while work is outstanding:
+
+    self.io = IOExecutor(self.root)
+    self.io.submit(open_store, csv_file, on_done=self.show, on_error=self.fail)
+
+With the default single worker, jobs run (and their callbacks fire) in
+submission order, so a save followed by a query sees its own write.
+
+    python io_worker.py test
+"""
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+class IOExecutor:
+    """Run blocking calls on worker threads; deliver results on the Tk thread.
+
+    Args:
+        root (tk.Misc): Widget whose event loop runs the callbacks.
+        workers (int): Worker threads (1 keeps jobs strictly ordered).
+        poll_ms (int): How often the queue is drained while jobs are pending.
+    """
+    def __init__(self, root, workers=1, poll_ms=20):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="io")
+        self._results = queue.SimpleQueue()
+        self._pending = 0
+        self._poll_id = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) on a worker; then, on the Tk thread, call on_done(result)
+        or on_error(exception). Without on_error, exceptions go to Tk's error reporting.
+
+        Returns:
+            concurrent.futures.Future
+        """
+        def work():
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._results.put((on_error or self._report, e))
+                raise
+            self._results.put((on_done, result))
+            return result
+
+        future = self._pool.submit(work)
+        self._pending += 1
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+        return future
+
+    def _poll(self):
+        self._poll_id = None
+        while True:
+            try:
+                callback, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if callback is not None:
+                callback(value)
+        if self._pending > 0:  # stop polling when idle, so an idle game does no wakeups
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _report(self, e):
+        self.root.report_callback_exception(type(e), e, e.__traceback__)
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs; with wait, block until running ones finish (results are dropped)."""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._pool.shutdown(wait=wait)
+
+
+if __name__ == "__main__":
+    if "test" in sys.argv:
+        import threading
+        import time
+
+        class FakeRoot:
+            """Stand-in for Tk's after() scheduling, driven by run() (no display needed)."""
+            def __init__(self):
+                self.timers = []
+                self.thread = threading.get_ident()
+
+            def after(self, ms, fn):
+                self.timers.append((time.monotonic() + ms / 1000, fn))
+                return fn
+
+            def after_cancel(self, timer_id):
+                self.timers = [t for t in self.timers if t[1] is not timer_id]
+
+            def report_callback_exception(self, *exc):
+                errors.append(exc[1])
+
+            def run(self, seconds):
+                end = time.monotonic() + seconds
+                while time.monotonic() < end and self.timers:
+                    self.timers.sort(key=lambda t: t[0])
+                    due, fn = self.timers[0]
+                    if due > time.monotonic():
+                        time.sleep(due - time.monotonic())
+                    self.timers.pop(0)
+                    fn()
+
+        print("Tests begin.")
+        root = FakeRoot()
+        io = IOExecutor(root, poll_ms=5)
+        seen, errors = [], []
+
+        def slow(x):
+            time.sleep(0.05)
+            return x, threading.get_ident()
+
+        t = time.perf_counter()
+        for i in range(3):
+            io.submit(slow, i, on_done=lambda r: seen.append((r[0], threading.get_ident() == root.thread)))
+        submitted = time.perf_counter() - t
+        print(f"Non-blocking Test: 3 x 50 ms jobs submitted in {submitted * 1000:.2f} ms -> {submitted < 0.01}")
+        io.submit(lambda: 1 / 0, on_error=lambda e: seen.append(type(e).__name__))
+        io.submit(lambda: 1 / 0)
+        root.run(2.0)
+        print(f"Order/Thread Test: {seen} -> "
+              f"{seen == [(0, True), (1, True), (2, True), 'ZeroDivisionError']}")
+        print(f"Unhandled Error Test: reported to Tk -> {len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)}")
+        print(f"Idle Test: polling stopped when idle -> {io.pending == 0 and not root.timers}")
+        io.shutdown()
+        print("Tests finish.")
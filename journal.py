@@ -0,0 +1,286 @@
+"""Binary session journal and headless replay.
+
+Every game records a compact journal of the session under journals/:
+
+    header   64 bytes: magic, version, mode, seed, initial balance, trading days, player,
+             intraday sub-ticks per day (0: daily prices only)
+    records  19 bytes each (numpy structured array, little-endian):
+             kind u1 | news_id i2 | qty i4 | idx i4 | price f8
+
+    kind      TICK (one per simulated day), BUY / SELL / CLOSE / SETTLE (orders),
+              END (price = final balance, written when the game ends)
+    news_id   news.CATALOG code of the day's random (2008) or virtual (hard mode)
+              news, SCHEDULED_NEWS for built-in / custom news, -1 for none;
+              on orders, the intraday sub-tick filled at (intraday.py), -1 at the close
+    idx       trading-day index (orders: the engine index when the order was filled)
+
+Since the engine and the hard-mode path generator are driven by the session
+seed, replay() rebuilds the whole session headless from the seed and the
+recorded orders, checks every tick, fill and the final balance against the
+journal, and returns the engine, whose histories regenerate the charts:
+
+    python journal.py replay journals/<file>.gmj [chart.png]
+    python journal.py test
+"""
+import os
+import random
+import struct
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from engine import SCHEDULED_NEWS, Account, SimulationEngine, new_seed
+from pricecache import load_price_df
+
+JOURNAL_DIR = "journals"
+MAGIC = b"GMJ1"
+VERSION = 3  # 2: news ids are news.CATALOG codes; 3: intraday sub-ticks
+HEADER = struct.Struct("<4sHBxQdI32sI")
+HEADER_V2 = struct.Struct("<4sHBxQdI32s")
+
+MODE_2008, MODE_HARD = 0, 1
+TICK, BUY, SELL, CLOSE, SETTLE, END = range(6)
+KINDS = {"buy": BUY, "sell": SELL, "close": CLOSE, "settle": SETTLE}
+
+RECORD_DTYPE = np.dtype([("kind", "u1"), ("news_id", "<i2"), ("qty", "<i4"),
+                         ("idx", "<i4"), ("price", "<f8")])
+
+
+def session_seed():
+    """Seed for a new game: GOLD_MAGNATE_SEED if set (to reproduce a session), else a fresh one."""
+    env = os.environ.get("GOLD_MAGNATE_SEED")
+    return int(env) if env else new_seed()
+
+
+class SessionJournal:
+    """Append-only writer of one session's journal.
+
+    Args:
+        path (str): Journal file (created; parent directories too).
+        mode (int): MODE_2008 or MODE_HARD.
+        seed (int): The session seed.
+        initial_balance (float): Starting balance of the player's account.
+        total_days (int): Trading days in the session.
+        player (str): Player name (stored truncated to 32 UTF-8 bytes).
+        intraday (int): Intraday sub-ticks per day, 0 if the session moves once a day.
+    """
+    def __init__(self, path, mode, seed, initial_balance, total_days, player="", intraday=0):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._f = open(path, "wb")
+        self._f.write(HEADER.pack(MAGIC, VERSION, mode, seed, float(initial_balance), total_days,
+                                  str(player).encode("utf-8")[:32], intraday))
+        self._rec = np.zeros(1, dtype=RECORD_DTYPE)
+
+    @classmethod
+    def for_game(cls, player, mode, seed, initial_balance, total_days, directory=JOURNAL_DIR, intraday=0):
+        """Journal under directory/ named after the player, mode and start time."""
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        safe = "".join(c if c.isalnum() else "_" for c in str(player)) or "player"
+        name = f"{safe}_{'2008' if mode == MODE_2008 else 'hard'}_{stamp}.gmj"
+        return cls(os.path.join(directory, name), mode, seed, initial_balance, total_days, player, intraday)
+
+    def _write(self, kind, idx, price, qty=0, news_id=-1):
+        if self._f is None:
+            return
+        rec = self._rec[0]
+        rec["kind"], rec["news_id"], rec["qty"], rec["idx"], rec["price"] = kind, news_id, qty, idx, price
+        self._f.write(self._rec.tobytes())
+
+    def record_tick(self, tick):
+        self._write(TICK, tick.idx, tick.price, news_id=tick.news_id)
+
+    def record_order(self, kind, idx, quantity, price, sub=-1):
+        self._write(KINDS[kind], idx, price, qty=quantity, news_id=sub)
+
+    def close(self, final_balance=None):
+        """Write the END record (when the final balance is given) and close the file."""
+        if self._f is None:
+            return
+        if final_balance is not None:
+            self._write(END, -1, final_balance)
+        self._f.close()
+        self._f = None
+
+
+def read_journal(path):
+    """Return (header dict, records structured array) of a journal file."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path}: not a session journal")
+    magic, version = struct.unpack_from("<4sH", raw)
+    if magic != MAGIC or version not in (2, VERSION):
+        raise ValueError(f"{path}: not a session journal (or unsupported version)")
+    if version == 2:
+        header_struct, intraday = HEADER_V2, 0
+        _magic, _version, mode, seed, initial_balance, total_days, player = HEADER_V2.unpack_from(raw)
+    else:
+        header_struct = HEADER
+        _magic, _version, mode, seed, initial_balance, total_days, player, intraday = HEADER.unpack_from(raw)
+    body = raw[header_struct.size:]
+    body = body[:len(body) - len(body) % RECORD_DTYPE.itemsize]  # drop a torn last record
+    header = {"mode": mode, "seed": seed, "initial_balance": initial_balance, "total_days": total_days,
+              "player": player.rstrip(b"\0").decode("utf-8", "replace"), "intraday": intraday}
+    return header, np.frombuffer(body, dtype=RECORD_DTYPE)
+
+
+def build_engine(header, records, csv_file="gold_2008.csv"):
+    """Recreate the session's engine (fresh account, same seed and price path) from a journal."""
+    from pricegen import hard_mode_prices
+
+    price_df = load_price_df(csv_file)
+    ticks = records[records["kind"] == TICK]
+    account = Account(initial_balance=header["initial_balance"], name=header["player"])
+    # Scheduled (built-in/custom) news text is not recorded; it only matters as "no random news that day"
+    scheduled = ticks["idx"][ticks["news_id"] == SCHEDULED_NEWS]
+    news_map = {price_df.index[i].strftime("%Y-%m-%d"): "(scheduled news)" for i in scheduled}
+    if header["mode"] == MODE_HARD:
+        price_df, news_ids = hard_mode_prices(price_df, header["seed"])
+        return SimulationEngine(price_df, account=account, news_map=news_map, seed=header["seed"],
+                                news_ids=news_ids)
+    return SimulationEngine(price_df, account=account, news_map=news_map, random_news=True,
+                            seed=header["seed"])
+
+
+class ReplayResult:
+    def __init__(self, engine, header, mismatches, recorded_final):
+        self.engine = engine
+        self.header = header
+        self.mismatches = mismatches        # [(record number, what differed)]
+        self.recorded_final = recorded_final
+
+    @property
+    def verified(self):
+        return not self.mismatches
+
+
+def replay(path, csv_file="gold_2008.csv"):
+    """Replay a journal headless at full speed and verify it. Returns a ReplayResult."""
+    header, records = read_journal(path)
+    engine = build_engine(header, records, csv_file)
+    stream = None
+    if header["intraday"]:
+        from intraday import IntradayStream
+        stream = IntradayStream(engine.day_prices, header["intraday"], engine.seed)
+    mismatches = []
+    recorded_final = None
+    for n, rec in enumerate(records):
+        kind, idx, price = int(rec["kind"]), int(rec["idx"]), float(rec["price"])
+        if kind == TICK:
+            tick = engine.step()
+            if tick is None or tick.idx != idx or tick.price != price or tick.news_id != rec["news_id"]:
+                mismatches.append((n, f"tick {idx}: recorded {price!r}, replayed "
+                                      f"{None if tick is None else tick.price!r}"))
+                break
+        elif kind in (BUY, SELL, CLOSE):
+            sub = int(rec["news_id"])
+            if stream is not None and sub > 0 and 0 < engine.idx < len(engine.day_prices):
+                engine.set_live_price(stream.price_at(engine.idx, sub), sub)
+            else:  # filled at the close: no live price left over from an earlier order
+                engine.clear_live_price()
+            expected, _day = engine.current_trade_price()
+            if engine.idx != idx or expected != price:
+                mismatches.append((n, f"order at day {idx} @ {price!r}, replay day {engine.idx} @ {expected!r}"))
+            if kind == BUY:
+                _msg, ok = engine.buy(int(rec["qty"]))
+            elif kind == SELL:
+                _msg, ok = engine.sell(int(rec["qty"]))
+            else:
+                ok = engine.account.position != 0
+                engine.close()
+            if not ok:
+                mismatches.append((n, f"order at day {idx} was rejected on replay"))
+        elif kind == SETTLE:
+            settled = engine.settle()
+            if settled is None or settled[1] != price:
+                mismatches.append((n, f"settlement @ {price!r} differs on replay"))
+        elif kind == END:
+            recorded_final = price
+            if engine.summary()[0] != price:
+                mismatches.append((n, f"final balance: recorded {price:.2f}, replayed {engine.summary()[0]:.2f}"))
+    return ReplayResult(engine, header, mismatches, recorded_final)
+
+
+def save_charts(engine, png_file):
+    """Regenerate the price and profit charts of a replayed session as a PNG."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 7), sharex=True)
+    ax1.plot(engine.price_history.indices(), engine.price_history.view(), lw=1.2)
+    ax1.set_title("Gold Price")
+    ax2.plot(engine.profit_history.indices() + 1, engine.profit_history.view(), color="tab:green", lw=1.2)
+    ax2.axhline(0, color="gray", lw=0.8)
+    ax2.set_title("Total Profit")
+    fig.tight_layout()
+    fig.savefig(png_file)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    if "replay" in sys.argv:
+        args = sys.argv[sys.argv.index("replay") + 1:]
+        t = time.perf_counter()
+        result = replay(args[0])
+        elapsed = time.perf_counter() - t
+        h = result.header
+        print(f"{args[0]}: player {h['player']!r}, {'hard' if h['mode'] == MODE_HARD else '2008'} mode, "
+              f"seed {h['seed']}, replayed in {elapsed * 1000:.1f} ms")
+        final_balance, pl, rr = result.engine.summary()
+        print(f"Final balance {final_balance:.2f}, P&L {pl:.2f}, return {rr:.2f}%")
+        print("Verified." if result.verified else f"MISMATCH: {result.mismatches[:5]}")
+        if len(args) > 1:
+            save_charts(result.engine, args[1])
+            print("Charts written to", args[1])
+
+    elif "test" in sys.argv:
+        import tempfile
+        from pricegen import hard_mode_prices
+        print("Tests begin.")
+
+        def trader(seed):
+            rng = random.Random(seed)
+
+            def strategy(engine, tick):
+                r = rng.random()
+                if r < 0.05:
+                    engine.buy(rng.randint(1, 5))
+                elif r < 0.10:
+                    engine.sell(rng.randint(1, 5))
+                elif r < 0.15:
+                    engine.close()
+            return strategy
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for mode in (MODE_2008, MODE_HARD):
+                seed = new_seed()
+                df = load_price_df("gold_2008.csv")
+                news_ids = None
+                if mode == MODE_HARD:
+                    df, news_ids = hard_mode_prices(df, seed)
+                journal = SessionJournal.for_game("tester", mode, seed, 100000.0, len(df), directory=tmp)
+                engine = SimulationEngine(df, news_map={"2008-09-15": "Lehman"}, random_news=(mode == MODE_2008),
+                                          seed=seed, news_ids=news_ids, journal=journal)
+                final_balance, _pl, _rr = engine.run(trader(seed))
+                journal.close(final_balance)
+
+                t = time.perf_counter()
+                result = replay(journal.path)
+                elapsed = time.perf_counter() - t
+                print(f"Mode {mode} Replay Test: verified={result.verified}, "
+                      f"final {result.engine.summary()[0]:.2f} vs recorded {final_balance:.2f}, "
+                      f"{os.path.getsize(journal.path)} bytes, {elapsed * 1000:.1f} ms")
+
+                # Tampering with a fill price is detected
+                raw = bytearray(open(journal.path, "rb").read())
+                _h, recs = read_journal(journal.path)
+                order = int(np.flatnonzero(recs["kind"] == BUY)[0])
+                off = HEADER.size + order * RECORD_DTYPE.itemsize + RECORD_DTYPE.fields["price"][1]
+                raw[off:off + 8] = struct.pack("<d", recs["price"][order] - 50)
+                open(journal.path, "wb").write(bytes(raw))
+                print(f"Mode {mode} Tamper Test: detected={not replay(journal.path).verified}")
+        print("Tests finish.")
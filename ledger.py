@@ -0,0 +1,270 @@
+"""Multi-asset position ledger.
+
+``Account`` in engine.py / game_v2.py holds exactly one net position. The
+ledger here keeps one average-cost position per symbol (gold, silver, USD
+index, ...) and allows scaling in and out:
+
+    - adding to a position moves its average cost,
+    - reducing it realizes P&L on the closed lots against that average and
+      releases their share of the margin,
+    - trading through zero closes the old side and opens the new one.
+
+Fills and marks are O(1): the ledger keeps running totals of floating P&L
+and margin, so the account-wide floating P&L is read without looping over
+positions on every tick.
+
+MultiAssetAccount wraps a ledger with a cash balance and the same
+buy / sell / close_position / floating_pnl interface as Account (for a
+default symbol), so SimulationEngine can use it directly:
+    python ledger.py test
+"""
+import sys
+
+DEFAULT_SYMBOL = "GC"  # COMEX gold
+
+
+class Position:
+    """Net position in one symbol (quantity > 0 long, < 0 short)."""
+    __slots__ = ("symbol", "quantity", "avg_price", "margin", "last_price", "realized_pnl", "closed_lots")
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.quantity = 0
+        self.avg_price = 0.0
+        self.margin = 0.0          # margin held for the open lots
+        self.last_price = 0.0      # last mark
+        self.realized_pnl = 0.0
+        self.closed_lots = 0
+
+    def floating_pnl(self, lot_size):
+        return (self.last_price - self.avg_price) * self.quantity * lot_size
+
+    def realized_per_lot(self):
+        return self.realized_pnl / self.closed_lots if self.closed_lots else 0.0
+
+    def __repr__(self):
+        return (f"Position({self.symbol!r}, quantity={self.quantity}, avg_price={self.avg_price:.2f}, "
+                f"realized_pnl={self.realized_pnl:.2f})")
+
+
+class PositionLedger:
+    """Average-cost positions keyed by symbol with margin accounting.
+
+    Args:
+        margin_rate (float): Fraction of notional (price * quantity) held as margin.
+        lot_size (int): Contract multiplier applied to P&L.
+    """
+    def __init__(self, margin_rate=0.1, lot_size=1):
+        self.margin_rate = margin_rate
+        self.lot_size = lot_size
+        self.positions = {}
+        self.realized_pnl = 0.0
+        self._floating = 0.0       # sum of every position's floating P&L
+        self._margin = 0.0         # sum of every position's margin
+
+    def position(self, symbol):
+        """The position for symbol (created flat on first use)."""
+        pos = self.positions.get(symbol)
+        if pos is None:
+            pos = self.positions[symbol] = Position(symbol)
+        return pos
+
+    def quantity(self, symbol):
+        pos = self.positions.get(symbol)
+        return pos.quantity if pos is not None else 0
+
+    def open_positions(self):
+        return [pos for pos in self.positions.values() if pos.quantity != 0]
+
+    @property
+    def floating_pnl(self):
+        return self._floating
+
+    @property
+    def margin_used(self):
+        return self._margin
+
+    def margin_required(self, symbol, quantity, price):
+        """Extra margin a fill of signed quantity at price would lock (0 when it only reduces)."""
+        current = self.quantity(symbol)
+        new = current + quantity
+        if current == 0 or (current > 0) == (new > 0) and abs(new) > abs(current):
+            added = abs(new) - abs(current)    # opening or adding on the same side
+        elif current * new < 0:
+            added = abs(new)                   # flips: the remainder opens the other side
+        else:
+            added = 0
+        return price * added * self.margin_rate
+
+    # ---------- Updates (O(1)) ----------
+    def mark(self, symbol, price):
+        """Mark a symbol to market; returns the ledger's total floating P&L."""
+        pos = self.positions.get(symbol)
+        if pos is None:
+            return self._floating
+        self._floating += (price - pos.last_price) * pos.quantity * self.lot_size
+        pos.last_price = price
+        return self._floating
+
+    def fill(self, symbol, quantity, price):
+        """
+        Apply a fill of signed quantity (>0 buy, <0 sell) at price.
+
+        Returns:
+            (realized_pnl, margin_delta): P&L realized by lots this fill closed, and the change in
+            margin held (positive when margin is locked, negative when released).
+        """
+        if quantity == 0:
+            return 0.0, 0.0
+        pos = self.position(symbol)
+        before_floating = pos.floating_pnl(self.lot_size) if pos.quantity else 0.0
+        before_margin = pos.margin
+        pos.last_price = price
+        realized = 0.0
+
+        if pos.quantity == 0 or (pos.quantity > 0) == (quantity > 0):
+            # Open or scale in: new average cost
+            new_qty = pos.quantity + quantity
+            pos.avg_price = (pos.avg_price * pos.quantity + price * quantity) / new_qty
+            pos.margin += price * abs(quantity) * self.margin_rate
+            pos.quantity = new_qty
+        else:
+            # Scale out (and possibly flip to the other side)
+            closed = min(abs(quantity), abs(pos.quantity))
+            side = 1 if pos.quantity > 0 else -1
+            realized = (price - pos.avg_price) * closed * side * self.lot_size
+            pos.margin -= pos.margin * closed / abs(pos.quantity)
+            pos.quantity += side * -closed
+            pos.realized_pnl += realized
+            pos.closed_lots += closed
+            self.realized_pnl += realized
+            remainder = quantity + side * closed
+            if pos.quantity == 0:
+                pos.avg_price = 0.0
+                pos.margin = 0.0
+                if remainder:
+                    pos.quantity = remainder
+                    pos.avg_price = price
+                    pos.margin = price * abs(remainder) * self.margin_rate
+
+        self._floating += (pos.floating_pnl(self.lot_size) if pos.quantity else 0.0) - before_floating
+        margin_delta = pos.margin - before_margin
+        self._margin += margin_delta
+        return realized, margin_delta
+
+
+# =============== Account on top of the ledger ===============
+class MultiAssetAccount:
+    """Margin account holding several symbols with scale-in / scale-out.
+
+    Drop-in for Account: buy / sell / close_position / floating_pnl act on the
+    default symbol unless one is given, and position / entry_price report it.
+    Unlike Account, buying while long adds to the position and selling while
+    long reduces it, instead of refusing with "close first".
+    """
+    def __init__(self, initial_balance=100000.0, lot_size=1, name="Player",
+                 margin_rate=0.1, symbol=DEFAULT_SYMBOL):
+        self.name = str(name)
+        self.initial_balance = float(initial_balance)
+        self.balance = float(initial_balance)   # cash not held as margin
+        self.lot_size = lot_size
+        self.symbol = symbol
+        self.ledger = PositionLedger(margin_rate=margin_rate, lot_size=lot_size)
+
+    @property
+    def position(self):
+        return self.ledger.quantity(self.symbol)
+
+    @property
+    def entry_price(self):
+        return self.ledger.position(self.symbol).avg_price if self.position else 0.0
+
+    @property
+    def realized_pnl(self):
+        return self.ledger.realized_pnl
+
+    def equity(self):
+        """Cash + margin held + floating P&L at the latest marks."""
+        return self.balance + self.ledger.margin_used + self.ledger.floating_pnl
+
+    def _trade(self, symbol, quantity, price):
+        symbol = symbol or self.symbol
+        margin = self.ledger.margin_required(symbol, quantity, price)
+        if self.balance < margin:
+            return "Insufficient funds to open a position.", False
+        realized, margin_delta = self.ledger.fill(symbol, quantity, price)
+        self.balance += realized - margin_delta
+        pos = self.ledger.position(symbol)
+        side = "long" if quantity > 0 else "short"
+        msg = f"Successfully {side} {abs(quantity)} {symbol} lots @ {price:.2f}"
+        if margin_delta > 0:
+            msg += f", margin used: {margin_delta:.2f}"
+        if realized:
+            msg += f", realized: {realized:.2f}"
+        return f"{msg}. Net position: {pos.quantity} @ {pos.avg_price:.2f}.", True
+
+    def buy(self, price, quantity, symbol=None):
+        """Buy quantity lots: opens or adds to a long, or reduces / flips a short."""
+        return self._trade(symbol, quantity, price)
+
+    def sell(self, price, quantity, symbol=None):
+        """Sell quantity lots: opens or adds to a short, or reduces / flips a long."""
+        return self._trade(symbol, -quantity, price)
+
+    def close_position(self, current_price, symbol=None):
+        """Close the whole position in a symbol; returns (msg, pnl) like Account.close_position."""
+        symbol = symbol or self.symbol
+        pos_qty = self.ledger.quantity(symbol)
+        if pos_qty == 0:
+            return "No positions to close.", 0.0
+        pnl, margin_delta = self.ledger.fill(symbol, -pos_qty, current_price)
+        self.balance += pnl - margin_delta
+        msg = (f"Position closed successfully ({'long' if pos_qty>0 else 'short'} {abs(pos_qty)} {symbol} lots)! "
+               f"Profit and loss for this period: {pnl:.2f}, released margin: {-margin_delta:.2f}. "
+               f"Account balance: {self.balance:.2f}.")
+        return msg, pnl
+
+    def close_all(self, prices):
+        """Close every open position at prices[symbol]; returns the total realized P&L."""
+        total = 0.0
+        for pos in self.ledger.open_positions():
+            _msg, pnl = self.close_position(prices[pos.symbol], pos.symbol)
+            total += pnl
+        return total
+
+    def mark(self, symbol, price):
+        return self.ledger.mark(symbol, price)
+
+    def floating_pnl(self, current_price, symbol=None):
+        """Mark symbol (default symbol if omitted) and return the account-wide floating P&L."""
+        return self.ledger.mark(symbol or self.symbol, current_price)
+
+
+if __name__ == "__main__":
+    # You can test in terminal with: python ledger.py test
+    if "test" in sys.argv:
+        print("Tests begin.")
+        acc = MultiAssetAccount(initial_balance=10000, lot_size=1)
+
+        msg, ok = acc.buy(1000, 1)
+        msg, ok = acc.buy(1020, 1)
+        print("Scale-in Test:", msg, "Avg:", acc.entry_price, "Balance:", acc.balance)
+
+        print("Floating Profit and Loss:", acc.floating_pnl(1030))
+
+        msg, ok = acc.sell(1040, 1)
+        print("Scale-out Test:", msg, "Realized:", acc.realized_pnl, "Balance:", acc.balance)
+
+        msg, ok = acc.sell(15, 10, symbol="SI")
+        print("Second Symbol Test:", msg, "Margin used:", acc.ledger.margin_used)
+        acc.mark("SI", 14)
+        print("Floating (GC @ 1030, SI @ 14):", acc.floating_pnl(1030))
+
+        total = acc.close_all({"GC": 1050, "SI": 14})
+        print("Close All Test: realized", total, "Balance:", acc.balance,
+              "Equity:", acc.equity(), "Open:", acc.ledger.open_positions())
+
+        msg, ok = acc.buy(1000, 2)
+        msg, ok = acc.sell(990, 3)
+        print("Flip Test:", msg, "Position:", acc.position, "Entry:", acc.entry_price)
+        print("Tests finish.")
@@ -0,0 +1,144 @@
+"""Monte Carlo evaluation of a scripted strategy over generated hard-mode years.
+
+Each session is a hard-mode path (first two real 2008 closes, then the random
+walk with NEWS shocks from pricegen) played by a strategy (see strategies.py)
+under the game's Account margin rules, headless. Sessions run in parallel in
+a process pool; workers only receive seeds and generate their own paths.
+
+Reported per news scale: the return distribution, max drawdown, and the
+probability of ruin (equity falling below --ruin of the starting balance at
+any point). --news-scale takes several values to compare difficulty settings.
+
+    python montecarlo.py --strategy Momentum --paths 5000
+    python montecarlo.py --strategy strategies:NewsTrader --news-scale 0.5,1,2 --csv results.csv
+"""
+import argparse
+import importlib
+import inspect
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import Account, SimulationEngine
+from pricecache import load_price_df
+from pricegen import generate_hard_paths
+
+
+def load_strategy(spec):
+    """Resolve "module:name" (module defaults to strategies) to a class or function."""
+    module, _, name = spec.rpartition(":")
+    return getattr(importlib.import_module(module or "strategies"), name)
+
+
+def make_strategy(strategy, **params):
+    """A fresh strategy for one session: classes are instantiated with params, functions used as-is."""
+    return strategy(**params) if inspect.isclass(strategy) else strategy
+
+
+def play_session(price_df, strategy, news_ids=None, initial_balance=100000.0):
+    """
+    Play a strategy over price_df headless under the Account margin rules.
+
+    Returns:
+        tuple: (return_pct, max_drawdown_pct, min_equity, filled_orders)
+    """
+    account = Account(initial_balance=initial_balance)
+    engine = SimulationEngine(price_df, account=account, news_ids=news_ids, seed=0)
+    trades = [0]
+
+    def counted(order):
+        def wrapper(*args):
+            msg, ok = order(*args)
+            trades[0] += bool(ok)
+            return msg, ok
+        return wrapper
+    engine.buy, engine.sell = counted(engine.buy), counted(engine.sell)
+
+    _final, _pl, rr = engine.run(strategy)
+    equity = initial_balance + engine.profit_history.view()
+    peak = np.maximum.accumulate(np.concatenate(([initial_balance], equity)))[1:]
+    drawdown = float(((peak - equity) / peak).max() * 100.0) if len(equity) else 0.0
+    min_equity = float(equity.min()) if len(equity) else initial_balance
+    return rr, drawdown, min_equity, trades[0]
+
+
+def play_path(price_df, closes, news_ids, strategy, qty=1, initial_balance=100000.0):
+    """Play one generated path (closes replace price_df's); see play_session."""
+    df = price_df.copy()
+    df['Close'] = closes
+    return play_session(df, make_strategy(strategy, qty=qty), news_ids, initial_balance)
+
+
+def _run_chunk(job):
+    """Worker: generate `count` paths from the job's seed and play each one."""
+    strategy_spec, seed, count, news_scale, qty, csv_file = job
+    strategy = load_strategy(strategy_spec)
+    price_df = load_price_df(csv_file)
+    first = price_df['Close'].to_numpy()[:2]
+    paths, news_ids = generate_hard_paths(first, len(price_df), n_paths=count,
+                                          rng=np.random.default_rng(seed), news_scale=news_scale)
+    out = np.empty((count, 4))
+    for i in range(count):
+        out[i] = play_path(price_df, paths[i], news_ids[i], strategy, qty)
+    return out
+
+
+def evaluate(strategy_spec, n_paths=1000, news_scale=1.0, qty=1, seed=None, workers=None,
+             chunk=100, csv_file="gold_2008.csv"):
+    """
+    Play n_paths generated sessions in a process pool.
+
+    Returns:
+        np.ndarray of shape (n_paths, 4): return %, max drawdown %, minimum equity, filled orders.
+    """
+    load_strategy(strategy_spec)  # fail fast on a bad spec, before starting workers
+    counts = [min(chunk, n_paths - start) for start in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    jobs = [(strategy_spec, s, c, news_scale, qty, csv_file) for s, c in zip(seeds, counts)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return np.concatenate(list(pool.map(_run_chunk, jobs)))
+
+
+def report(results, news_scale, ruin_level, initial_balance=100000.0):
+    rr, dd, min_equity, trades = results.T
+    p5, p25, p50, p75, p95 = np.percentile(rr, [5, 25, 50, 75, 95])
+    print(f"news scale {news_scale:g}: {len(rr)} paths")
+    print(f"  return %   mean {rr.mean():+.2f}  std {rr.std():.2f}  "
+          f"p5 {p5:+.2f}  p25 {p25:+.2f}  p50 {p50:+.2f}  p75 {p75:+.2f}  p95 {p95:+.2f}")
+    print(f"  P(loss) {np.mean(rr < 0):.1%}   max drawdown %  mean {dd.mean():.2f}  p95 {np.percentile(dd, 95):.2f}")
+    print(f"  ruin (equity < {ruin_level:.0%} of start) {np.mean(min_equity < ruin_level * initial_balance):.2%}   "
+          f"orders/path {trades.mean():.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo evaluation of a strategy over hard-mode paths.")
+    parser.add_argument("--strategy", default="Momentum", help="strategies.py name or module:name")
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--qty", type=int, default=1, help="lots per order")
+    parser.add_argument("--news-scale", default="1", help="comma-separated NEWS shock scales")
+    parser.add_argument("--ruin", type=float, default=0.5, help="ruin level as a fraction of the start balance")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help=f"default: {os.cpu_count()}")
+    parser.add_argument("--chunk", type=int, default=100, help="paths per worker task")
+    parser.add_argument("--csv", help="write per-path results to this CSV")
+    args = parser.parse_args(argv)
+
+    all_rows = []
+    for scale in (float(s) for s in args.news_scale.split(",")):
+        t = time.perf_counter()
+        results = evaluate(args.strategy, args.paths, scale, args.qty, args.seed, args.workers, args.chunk)
+        elapsed = time.perf_counter() - t
+        report(results, scale, args.ruin)
+        print(f"  {elapsed:.1f} s ({len(results) / elapsed:.0f} paths/s)")
+        all_rows.append(np.column_stack([np.full(len(results), scale), results]))
+
+    if args.csv:
+        np.savetxt(args.csv, np.concatenate(all_rows), delimiter=",", fmt="%.6g",
+                   header="news_scale,return_pct,max_drawdown_pct,min_equity,orders", comments="")
+        print("Per-path results written to", args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""News data shared by both game modes.
+
+Kept free of Tkinter/matplotlib so the headless engine can use it.
+"""
+import json
+from enum import IntEnum
+
+import numpy as np
+
+
+# =============== Built-in historical major events (display only; do NOT change price) ===============
+BUILTIN_NEWS = {
+    "2008-09-07": "The US government takes over Fannie Mae and Freddie Mac, risk aversion rises. (Bullish for gold)",
+    "2008-09-15": "Lehman Brothers bankruptcy triggers global financial crisis. (Strongly bullish for gold)",
+    "2008-09-16": "The Federal Reserve injects huge liquidity into the market. (Bullish for gold)",
+    "2008-09-29": "The US House rejects $700 billion bailout bill. (Strongly bullish for gold)",
+}
+
+# =============== Random breaking news pool (text, direction, impact text, weight) ===============
+RANDOM_NEWS_POOL = [
+    ("Central bank unexpectedly cuts interest rates.",                 "bullish",        "+1%", 10),
+    ("Major bank reports massive losses, market panic rises.",         "strong_bullish", "+2%", 5),
+    ("Oil prices surge sharply, inflation fears increase.",            "bullish",        "+1%", 10),
+    ("Global stock markets rebound strongly.",                         "bearish",        "-1%", 10),
+    ("Dollar strengthens significantly against major currencies.",     "bearish",        "-1%", 10),
+    ("Geopolitical tensions escalate in the Middle East.",             "strong_bullish", "+2%", 5),
+    ("International Monetary Fund warns of global recession.",         "bullish",        "+1%", 10),
+    ("US unemployment rate falls unexpectedly.",                       "bearish",        "-1%", 10),
+    ("Large fund forced liquidation sparks market turbulence.",        "strong_bearish", "-2%", 4),
+]
+
+# =============== Virtual news for hard mode (text -> price multiplier) ===============
+NEWS = {
+    "Fed Raises Interest Rates by 0.25%\n": 0.95,
+    "Fed Raises Interest Rates by 0.5%\n": 0.92,
+    "Fed Raises Interest Rates by 0.75%\n": 0.88,
+    "Fed Cut Interest Rates by 0.25%\n": 1.05,
+    "Fed Cut Interest Rates by 0.5%\n": 1.1,
+    "Fed Cut Interest Rates by 0.75%\n": 1.15,
+    "War Breaks Out\n": 1.1,
+    "Exacerbate Geopolitical Tensions\n": 1.1,
+    "New Rescue Act Onboard\n": 0.9
+}
+
+
+class Impact(IntEnum):
+    """Qualitative news impact, used as an index into IMPACT_TABLE."""
+    NONE = 0
+    BULLISH = 1
+    STRONG_BULLISH = 2
+    BEARISH = 3
+    STRONG_BEARISH = 4
+
+
+IMPACT_TABLE = np.array([1.0, 1.01, 1.02, 0.99, 0.98])  # price multiplier per Impact
+IMPACT_CODES = {"bullish": Impact.BULLISH, "strong_bullish": Impact.STRONG_BULLISH,
+                "bearish": Impact.BEARISH, "strong_bearish": Impact.STRONG_BEARISH}
+IMPACT_COLORS = ["black", "green", "green", "red", "red"]
+
+
+def apply_news_impact(price: float, impact) -> float:
+    """
+    Adjust price based on qualitative news impact.
+
+    Impact mapping:
+        bullish        -> +1%
+        strong_bullish -> +2%
+        bearish        -> -1%
+        strong_bearish -> -2%
+
+    Args:
+        price (float): Current price.
+        impact (str | Impact): One of {"bullish", "strong_bullish", "bearish", "strong_bearish"}, or an Impact.
+
+    Returns:
+        float: Adjusted price after impact multiplier.
+    """
+    code = impact if isinstance(impact, Impact) else IMPACT_CODES.get(impact, Impact.NONE)
+    return price * float(IMPACT_TABLE[code])
+
+
+# =============== News catalog (both modes, integer-coded) ===============
+NO_NEWS = -1
+
+
+class NewsCatalog:
+    """Integer-coded news events with a price multiplier each.
+
+    code -> texts[code], multipliers[code], colors[code]. The lookup table has
+    one extra 1.0 entry at the end, so NO_NEWS (-1) indexes "no change" and a
+    whole path of event codes is applied with a single multiply (apply()).
+    """
+    def __init__(self):
+        self.texts = []
+        self.colors = []
+        self._multipliers = []
+        self._codes = {}          # text -> code
+        self._table = None
+
+    def add(self, text, multiplier=1.0, color="black"):
+        """Register an event (or return the code of an identical text already registered)."""
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self.texts)
+            self.texts.append(text)
+            self.colors.append(color)
+            self._multipliers.append(float(multiplier))
+            self._table = None
+        return code
+
+    def code_of(self, text):
+        return self._codes.get(text, NO_NEWS)
+
+    def __len__(self):
+        return len(self.texts)
+
+    @property
+    def table(self):
+        """Multiplier per code, plus 1.0 at index -1 for NO_NEWS."""
+        if self._table is None:
+            self._table = np.array(self._multipliers + [1.0], dtype=np.float64)
+        return self._table
+
+    @property
+    def multipliers(self):
+        return self.table[:-1]
+
+    def apply(self, prices, codes):
+        """Prices after each day's event (codes aligned with prices; NO_NEWS = unchanged), vectorized."""
+        return np.asarray(prices, dtype=np.float64) * self.table[np.asarray(codes)]
+
+    def add_user_news(self, user_news):
+        """
+        Register user news ("YYYY-MM-DD" -> text, see read_user_news). Display only (multiplier 1.0).
+        Call on the thread that reads the catalog (the Tk thread in the games).
+
+        Returns:
+            dict: "YYYY-MM-DD" -> code.
+        """
+        return {day: self.add(text) for day, text in user_news.items()}
+
+    def load_user_news(self, path="my_news.json", sep=";"):
+        """Read a user news file and register it (see read_user_news / add_user_news)."""
+        return self.add_user_news(read_user_news(path, sep))
+
+
+def read_user_news(path="my_news.json", sep=";"):
+    """
+    Read a JSON file of "YYYY-MM-DD" -> text (or list of texts, joined by sep).
+    Touches no shared state, so it can run on the I/O worker.
+
+    Returns:
+        dict: "YYYY-MM-DD" -> text.
+
+    Raises:
+        OSError / ValueError: File unreadable or not valid JSON.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        user_news = json.load(f)
+    return {day: sep.join(map(str, v)) if isinstance(v, list) else str(v) for day, v in user_news.items()}
+
+
+CATALOG = NewsCatalog()
+# 2008 random breaking news first, so a RANDOM_NEWS_POOL index is its code
+RANDOM_CODES = np.array([CATALOG.add(f"{text} (Impact on gold: {impact_text})",
+                                     IMPACT_TABLE[IMPACT_CODES[impact]], IMPACT_COLORS[IMPACT_CODES[impact]])
+                         for text, impact, impact_text, _weight in RANDOM_NEWS_POOL])
+# Hard-mode virtual news, in NEWS order
+HARD_CODES = np.array([CATALOG.add(text, multiplier) for text, multiplier in NEWS.items()])
+
+
+# =============== Random-news draw table (built once) ===============
+POOL_CUM_WEIGHTS = np.cumsum([item[3] for item in RANDOM_NEWS_POOL], dtype=np.float64)
+
+
+class NewsSchedule:
+    """The random breaking news of a whole session, drawn up front.
+
+    Sparse form: days (day indices), event_ids (CATALOG codes of RANDOM_NEWS_POOL
+    events) and multipliers. Dense form, for O(1) lookups while playing: event_by_day
+    (-1 = no news) and mult_by_day (1.0 = no news).
+
+    The same (n_days, seed, prob, blocked) always gives the same schedule, so
+    an engine, a replay and the network server can share or rebuild it.
+    """
+    def __init__(self, days, event_ids, n_days):
+        self.days = np.asarray(days, dtype=np.int32)
+        self.event_ids = np.asarray(event_ids, dtype=np.int16)
+        self.multipliers = CATALOG.table[self.event_ids]
+        self.event_by_day = np.full(n_days, NO_NEWS, dtype=np.int16)
+        self.event_by_day[self.days] = self.event_ids
+        self.mult_by_day = CATALOG.table[self.event_by_day]
+
+    @classmethod
+    def generate(cls, n_days, seed=None, prob=0.2, blocked=None):
+        """
+        Draw news for n_days: each day fires with probability prob, and the event is
+        picked by weight through the cumulative-weight table (one searchsorted for all days).
+
+        Args:
+            seed: Seed or np.random.Generator.
+            blocked (array of bool): Days that already show scheduled news get no random news.
+                Applied after drawing, so the draws do not depend on it.
+        """
+        rng = np.random.default_rng(seed)
+        fire = rng.random(n_days) < prob
+        picks = np.searchsorted(POOL_CUM_WEIGHTS, rng.random(n_days) * POOL_CUM_WEIGHTS[-1], side="right")
+        if blocked is not None:
+            fire &= ~np.asarray(blocked, dtype=bool)
+        days = np.flatnonzero(fire)
+        return cls(days, RANDOM_CODES[picks[days]], n_days)
+
+    def __len__(self):
+        return len(self.days)
@@ -0,0 +1,215 @@
+"""Adaptive frame pacing for the Tk games.
+
+The clock (clock.py) keeps the timeline on schedule only as long as a frame
+renders faster than a day lasts. On a slow machine a chart frame can cost
+more than that at high speeds, so days pile up behind the redraws and the
+game falls behind its target duration.
+
+FramePacer times every chart render and tracks the median cost of recent
+frames (a median, so the rare full redraw on an axis rescale does not count
+as a slow machine). When it exceeds the budget (a share of the clock's current period) it
+degrades in steps, and recovers once frames are cheap again:
+
+    level 0   full quality
+    level 1   simplified charts (no markers, no antialiasing)
+    level 2   simplified, and only every k-th chart frame is drawn, with k
+              sized from the measured cost; labels still update every frame
+
+A chart frame is a frame with new chart data: the views pass the engine's day
+index, and notifications that bring no new day (trades, intraday sub-ticks)
+are neither drawn nor counted, so skipping stays evenly spaced in days.
+The pacer only trades render quality; it never slows the clock, which keeps
+the session on schedule by itself (see clock.py).
+
+    python pacing.py test
+"""
+import math
+import statistics
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+FULL, SIMPLIFIED, SKIPPING = 0, 1, 2
+
+
+class FramePacer:
+    """Measure render cost and trade chart quality / frames for keeping pace.
+
+    Args:
+        period_fn (callable): Seconds available per frame right now (e.g. the clock's period).
+        budget (float): Share of that period a chart render may take.
+        settle (int): Measured frames between two level changes, so the cost reflects the new level
+            (recovering waits four times as long, to avoid flapping).
+        window (int): Recent renders the median cost is taken over.
+        time_fn (callable): Performance counter in seconds (for tests).
+    """
+    def __init__(self, period_fn, budget=0.5, settle=5, window=9, time_fn=time.perf_counter):
+        self.period_fn = period_fn
+        self.budget = budget
+        self.settle = settle
+        self.time_fn = time_fn
+        self.level = FULL
+        self.skip_every = 1         # draw one chart frame in skip_every (level 2)
+        self.cost = 0.0             # seconds, median of the recent renders
+        self.max_cost = 0.0
+        self.total_cost = 0.0
+        self.frames = 0             # frames offered to the pacer
+        self.drawn = 0
+        self.skipped = 0
+        self.level_changes = 0
+        self._charts = []
+        self._since_change = 0
+        self._since_draw = 0
+        self._version = None        # chart data of the last chart frame
+        self._recent = deque(maxlen=window)
+
+    def add_chart(self, chart):
+        """Register a chart with set_simplified(bool); it follows the pacer's quality level."""
+        self._charts.append(chart)
+        chart.set_simplified(self.level >= SIMPLIFIED)
+
+    def remove_chart(self, chart):
+        if chart in self._charts:
+            self._charts.remove(chart)
+
+    @property
+    def budget_s(self):
+        return self.period_fn() * self.budget
+
+    # ---------- Per frame ----------
+    def should_draw(self, version=None, force=False):
+        """
+        Whether this frame's chart should be drawn (labels are always cheap enough).
+        `version` identifies the chart data (e.g. the day index): a frame with the same
+        version as the previous one is not a chart frame and returns False uncounted.
+        """
+        if version is not None and version == self._version and not force:
+            return False
+        self._version = version
+        self.frames += 1
+        self._since_draw += 1
+        if force or self.level < SKIPPING or self._since_draw >= self.skip_every:
+            self._since_draw = 0
+            return True
+        self.skipped += 1
+        return False
+
+    @contextmanager
+    def measure(self):
+        """Time the chart render inside the block and adapt the level."""
+        t = self.time_fn()
+        try:
+            yield
+        finally:
+            self.record(self.time_fn() - t)
+
+    def record(self, cost):
+        self.drawn += 1
+        self.max_cost = max(self.max_cost, cost)
+        self.total_cost += cost
+        self._recent.append(cost)
+        self.cost = statistics.median(self._recent)
+        self._since_change += 1
+        budget = self.budget_s
+        if self.level == SKIPPING:
+            self.skip_every = max(1, math.ceil(self.cost / budget)) if budget > 0 else 1
+        if self.cost > budget and self.level < SKIPPING and self._since_change >= self.settle:
+            self._set_level(self.level + 1)
+        elif self.cost < budget / 2 and self.level > FULL and self._since_change >= 4 * self.settle:
+            self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.level_changes += 1
+        self._since_change = 0
+        self._recent.clear()  # measure the new level afresh
+        if level < SKIPPING:
+            self.skip_every = 1
+        for chart in self._charts:
+            chart.set_simplified(level >= SIMPLIFIED)
+
+    # ---------- Stats ----------
+    def stats(self):
+        return {"level": self.level, "frames": self.frames, "drawn": self.drawn, "skipped": self.skipped,
+                "skip_every": self.skip_every, "median_ms": self.cost * 1000,
+                "mean_ms": self.total_cost / self.drawn * 1000 if self.drawn else 0.0, "max_ms": self.max_cost * 1000,
+                "budget_ms": self.budget_s * 1000, "level_changes": self.level_changes}
+
+    def summary(self):
+        s = self.stats()
+        return (f"{s['drawn']}/{s['frames']} chart frames drawn ({s['skipped']} skipped), "
+                f"render median {s['median_ms']:.1f} / mean {s['mean_ms']:.1f} / max {s['max_ms']:.1f} ms "
+                f"vs budget {s['budget_ms']:.1f} ms, "
+                f"quality level {s['level']} ({s['level_changes']} changes)")
+
+
+if __name__ == "__main__":
+    if "test" in sys.argv:
+        class FakeChart:
+            def __init__(self):
+                self.simplified = False
+
+            def set_simplified(self, simplified):
+                self.simplified = simplified
+
+        def play(pacer, chart, frames, full_ms, simple_ms):
+            """Offer `frames` frames whose chart costs full_ms (simple_ms when simplified)."""
+            for _ in range(frames):
+                if pacer.should_draw():
+                    pacer.record((simple_ms if chart.simplified else full_ms) / 1000)
+
+        print("Tests begin.")
+        period = [0.100]
+        pacer, chart = FramePacer(lambda: period[0]), FakeChart()
+        pacer.add_chart(chart)
+
+        play(pacer, chart, 100, full_ms=10, simple_ms=5)
+        print(f"Fast Machine Test: level {pacer.level}, nothing skipped -> {pacer.level == FULL and pacer.skipped == 0}")
+
+        period[0] = 0.030  # x64: 15 ms budget; full render 25 ms, simplified 12 ms
+        play(pacer, chart, 100, full_ms=25, simple_ms=12)
+        print(f"Simplify Test: level {pacer.level}, simplified {chart.simplified} -> "
+              f"{pacer.level == SIMPLIFIED and chart.simplified}")
+
+        period[0] = 0.010  # 5 ms budget: even simplified frames (12 ms) are too slow
+        n0, d0 = pacer.frames, pacer.drawn
+        play(pacer, chart, 300, full_ms=25, simple_ms=12)
+        ratio = (pacer.drawn - d0) / (pacer.frames - n0)
+        print(f"Skip Test: level {pacer.level}, drawing 1 in {pacer.skip_every} ({ratio:.0%} of frames) -> "
+              f"{pacer.level == SKIPPING and pacer.skip_every == 3}")
+        print(f"Forced Frame Test: -> {pacer.should_draw(force=True)}")
+
+        period[0] = 2.0  # back to x1: recovers full quality
+        play(pacer, chart, 100, full_ms=10, simple_ms=5)
+        print(f"Recovery Test: level {pacer.level}, simplified {chart.simplified} -> "
+              f"{pacer.level == FULL and not chart.simplified}")
+        print("Stats:", pacer.summary())
+
+        # Intraday mode: sub-tick notifications between days bring no new chart data
+        from engine import SimulationEngine
+        from intraday import IntradayStream
+
+        engine = SimulationEngine.from_csv("gold_2008.csv", seed=1)
+        stream = IntradayStream(engine.day_prices, 50, seed=1)
+        pacer, chart = FramePacer(lambda: 0.010), FakeChart()  # as in the Skip Test: 1 chart frame in 3
+        pacer.add_chart(chart)
+        drawn = []
+
+        def render(_engine, price, day):
+            if pacer.should_draw(engine.idx, force=engine.finished):
+                drawn.append(engine.idx)
+                pacer.record((12 if chart.simplified else 25) / 1000)
+        engine.subscribe(render)
+        notifications = 0
+        while engine.step() is not None:
+            notifications += 1
+            for sub in range(1, 50, 7):
+                if not engine.finished:
+                    engine.set_live_price(stream.price_at(engine.idx, sub), sub)
+                    notifications += 1
+        gaps = set(b - a for a, b in zip(drawn[:-1], drawn[1:-1]) if a > 60)  # the last frame is forced
+        print(f"Intraday Test: {notifications} notifications, {pacer.frames} chart frames for "
+              f"{engine.total_days} days, drawn every {sorted(gaps)} days -> "
+              f"{pacer.frames == engine.total_days and gaps == {pacer.skip_every}}")
+        print("Tests finish.")
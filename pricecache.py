@@ -0,0 +1,156 @@
+"""Binary columnar cache for the daily price CSV files.
+
+Parsing gold_2008.csv with pandas (date parsing + DataFrame construction) on
+every game start is the slowest part of loading. The first load converts the
+CSV into two .npy columns under .price_cache/:
+
+    <name>.dates.npy   int64 nanoseconds since the epoch
+    <name>.close.npy   float64 closes
+
+plus a small <name>.meta.json with checksums. Later loads memory-map the
+columns directly. The cache is rebuilt automatically when the source CSV's
+SHA-256 changes, or when a column no longer matches its CRC32.
+"""
+import csv
+import hashlib
+import json
+import os
+import zlib
+
+import numpy as np
+
+CACHE_DIR = ".price_cache"
+CACHE_VERSION = 1
+
+
+def _cache_paths(csv_file):
+    base = os.path.join(os.path.dirname(os.path.abspath(csv_file)), CACHE_DIR,
+                        os.path.splitext(os.path.basename(csv_file))[0])
+    return base + ".dates.npy", base + ".close.npy", base + ".meta.json"
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _crc32(arr):
+    return zlib.crc32(np.ascontiguousarray(arr).view(np.uint8))
+
+
+def parse_price_csv(csv_file):
+    """Read a '<date>,Close' CSV (as written by DataFrame.to_csv) into (dates_ns, closes) arrays."""
+    stamps, closes = [], []
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        col = header.index('Close') if header and 'Close' in header else 1
+        for row in reader:
+            if len(row) <= col or not row[col]:
+                continue  # same as dropna()
+            try:
+                close = float(row[col])
+            except ValueError:
+                continue
+            if close != close:
+                continue  # NaN
+            stamps.append(row[0])
+            closes.append(close)
+    dates = np.array(stamps, dtype='datetime64[ns]').view(np.int64)
+    return dates, np.array(closes, dtype=np.float64)
+
+
+def build_cache(csv_file):
+    """(Re)build the binary cache for csv_file and return the in-memory (dates_ns, closes)."""
+    dates_path, close_path, meta_path = _cache_paths(csv_file)
+    os.makedirs(os.path.dirname(dates_path), exist_ok=True)
+    dates, closes = parse_price_csv(csv_file)
+    np.save(dates_path, dates)
+    np.save(close_path, closes)
+    st = os.stat(csv_file)
+    meta = {
+        "version": CACHE_VERSION,
+        "source_sha256": _sha256(csv_file),
+        "source_size": st.st_size,
+        "source_mtime_ns": st.st_mtime_ns,
+        "rows": int(len(closes)),
+        "dates_crc32": _crc32(dates),
+        "close_crc32": _crc32(closes),
+    }
+    # Write meta last: a cache without valid meta is simply rebuilt
+    tmp = meta_path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+    return dates, closes
+
+
+def _load_valid(csv_file):
+    """Memory-map the cached columns if they are present and valid for csv_file, else None."""
+    dates_path, close_path, meta_path = _cache_paths(csv_file)
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("version") != CACHE_VERSION:
+            return None
+        if os.path.exists(csv_file):
+            st = os.stat(csv_file)
+            # Size+mtime unchanged is the fast path; otherwise compare content hashes
+            if (st.st_size, st.st_mtime_ns) != (meta["source_size"], meta["source_mtime_ns"]) \
+                    and _sha256(csv_file) != meta["source_sha256"]:
+                return None
+        dates = np.load(dates_path, mmap_mode='r')
+        closes = np.load(close_path, mmap_mode='r')
+        if len(dates) != meta["rows"] or len(closes) != meta["rows"]:
+            return None
+        if _crc32(dates) != meta["dates_crc32"] or _crc32(closes) != meta["close_crc32"]:
+            return None
+        return dates, closes
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_prices(csv_file):
+    """
+    Load (dates_ns int64, closes float64) for a price CSV via the binary cache.
+
+    The arrays are read-only memory maps when the cache is valid; otherwise the
+    cache is rebuilt from the CSV first. If only the cache exists (CSV deleted)
+    it is still used.
+
+    Raises:
+        FileNotFoundError: Neither the CSV nor a valid cache exists.
+    """
+    cached = _load_valid(csv_file)
+    if cached is not None:
+        return cached
+    if not os.path.exists(csv_file):
+        raise FileNotFoundError(csv_file)
+    build_cache(csv_file)
+    cached = _load_valid(csv_file)
+    return cached if cached is not None else parse_price_csv(csv_file)
+
+
+def to_price_df(dates, closes):
+    """Wrap (dates_ns, closes) arrays in the DataFrame the games use ('Close' column, DatetimeIndex)."""
+    import pandas as pd
+    index = pd.DatetimeIndex(np.asarray(dates, dtype=np.int64).view('datetime64[ns]'))
+    return pd.DataFrame({'Close': np.asarray(closes, dtype=np.float64)}, index=index)
+
+
+def load_price_df(csv_file):
+    """Cached prices as a game DataFrame, without date parsing."""
+    return to_price_df(*load_prices(csv_file))
+
+
+def write_price_csv(csv_file, dates, closes):
+    """Write arrays in the same '<date>,Close' layout as DataFrame.to_csv."""
+    stamps = np.datetime_as_string(np.asarray(dates, dtype=np.int64).view('datetime64[ns]'), unit='s')
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['', 'Close'])
+        for stamp, close in zip(stamps, closes):
+            writer.writerow([stamp.replace('T', ' '), repr(float(close))])
@@ -0,0 +1,74 @@
+"""Vectorized random-walk price paths for hard mode.
+
+Hard mode keeps the first two real closes and then lets the price wander:
+every later day is the previous close times |1 - z/100| (z ~ N(0, 1)), and
+on roughly 9% of days a virtual NEWS event multiplies the price as well.
+Because each day builds on the one before, news shocks carry forward, so the
+whole path is a cumulative product and can be generated for many sessions at
+once as a 2-D array.
+"""
+import numpy as np
+
+from news import CATALOG, HARD_CODES, NO_NEWS
+
+
+def generate_hard_paths(first_closes, n_days, n_paths=1, rng=None, news_scale=1.0):
+    """
+    Generate hard-mode price paths.
+
+    News rule (same as the original game loop): draw r uniformly from 1..98;
+    r >= 90 fires news number r % 10 from NEWS.
+
+    Args:
+        first_closes: The two real opening closes (day 0 and day 1) every path starts from.
+        n_days (int): Path length, including the two opening days.
+        n_paths (int): Number of independent paths to generate.
+        rng: np.random.Generator, or a seed for np.random.default_rng (None = fresh entropy).
+        news_scale (float): Scales every news shock (multiplier m becomes 1 + (m - 1) * news_scale),
+            e.g. to tune difficulty; 1.0 is the game as shipped.
+
+    Returns:
+        tuple: (paths, news_ids) where paths is a float64 array of shape
+        (n_paths, n_days) and news_ids is an int64 array of the same shape
+        holding the news.CATALOG code fired on each day, or NO_NEWS (-1).
+    """
+    rng = np.random.default_rng(rng)
+    p0, p1 = float(first_closes[0]), float(first_closes[1])
+
+    paths = np.empty((n_paths, n_days), dtype=np.float64)
+    news_ids = np.full((n_paths, n_days), NO_NEWS, dtype=np.int64)
+    paths[:, 0] = p0
+    if n_days < 2:
+        return paths, news_ids
+    paths[:, 1] = p1
+    if n_days == 2:
+        return paths, news_ids
+
+    shape = (n_paths, n_days - 2)
+    factors = np.abs(1.0 - rng.standard_normal(shape) / 100.0)
+
+    r = rng.integers(1, 99, size=shape)
+    hit = r >= 90
+    news_ids[:, 2:][hit] = HARD_CODES[r[hit] % 10]
+
+    # Every day's news impact in one multiply (NO_NEWS maps to 1.0)
+    table = CATALOG.table if news_scale == 1.0 else 1.0 + (CATALOG.table - 1.0) * news_scale
+    paths[:, 2:] = p1 * np.cumprod(factors * table[news_ids[:, 2:]], axis=1)
+    return paths, news_ids
+
+
+def hard_mode_prices(price_df, seed=None):
+    """
+    One hard-mode session built from real prices: the first two closes are kept, the rest
+    replaced by a generated path. The same seed always gives the same session.
+
+    Returns:
+        tuple: (df, news_ids) - a copy of price_df with the generated 'Close' column, and the
+        per-day news.CATALOG code (NO_NEWS for none).
+    """
+    df = price_df.copy()
+    if len(df) < 2:
+        return df, np.full(len(df), -1, dtype=np.int64)
+    paths, news_ids = generate_hard_paths(df['Close'].to_numpy()[:2], len(df), rng=seed)
+    df['Close'] = paths[0]
+    return df, news_ids[0]
@@ -0,0 +1,343 @@
+"""Pluggable market-data providers (offline first).
+
+Every provider returns daily prices as two arrays, (dates_ns int64, closes
+float64), the same shape pricecache.load_prices uses:
+
+    LocalFileProvider  - a price CSV through the binary cache (no network)
+    HttpChartProvider  - a Yahoo-style /v8/finance/chart endpoint, with
+                         pooled keep-alive connections, timeouts, retries with
+                         backoff and an on-disk response cache
+    ChainProvider      - the first provider that succeeds, e.g. local then HTTP
+
+The games run provider.fetch() on their I/O worker (see io_worker.py), so the
+window never freezes while data loads.
+
+StubChartServer serves a chart response on localhost, so the network path can
+be exercised without internet access:
+    python providers.py test     # parse, retry and cache checks
+    python providers.py bench    # pooled keep-alive vs. a connection per request
+"""
+import abc
+import hashlib
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+from pricecache import CACHE_DIR, load_prices, write_price_csv
+
+# 2008-01-01 00:00 UTC ~ 2008-12-31 23:59 UTC, as requested by the games
+PERIOD_2008 = (1199120400, 1230656400)
+
+
+class ProviderError(Exception):
+    """Raised when a provider cannot deliver prices."""
+
+
+class PriceProvider(abc.ABC):
+    """Base class: fetch() returns (dates_ns, closes) or raises ProviderError/OSError."""
+    name = "provider"
+
+    @abc.abstractmethod
+    def fetch(self):
+        """Return (dates_ns int64, closes float64)."""
+
+
+class LocalFileProvider(PriceProvider):
+    """Prices from a local CSV via the memory-mapped binary cache."""
+    name = "local file"
+
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+
+    def fetch(self):
+        return load_prices(self.csv_file)
+
+
+class ConnectionPool:
+    """Small LIFO pool of keep-alive HTTP(S) connections to one host.
+
+    http.client and ssl are imported on the first connection, not at import
+    time, so the games (which usually read the local CSV) never load them.
+    """
+    def __init__(self, base_url, size=2, timeout=10.0, verify=True):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.verify = verify
+        self.context = None  # TLS context, created with the first HTTPS connection
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            import http.client
+            if self.https:
+                if self.context is None:
+                    import ssl
+                    self.context = ssl.create_default_context() if self.verify else ssl._create_unverified_context()
+                return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.context)
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpChartProvider(PriceProvider):
+    """Daily closes from a Yahoo Finance style chart API.
+
+    Args:
+        symbol (str): Ticker, e.g. "GC=F".
+        period (tuple): (period1, period2) UNIX seconds.
+        base_url (str): Scheme and host of the chart API.
+        timeout (float): Socket timeout per request, seconds.
+        retries (int): Extra attempts after a connection error, 429 or 5xx.
+        backoff (float): First retry delay in seconds; doubles per attempt.
+        cache_dir (str): Where raw responses are cached (None disables the cache).
+        save_csv (str): Also write fetched prices to this CSV, e.g. to seed LocalFileProvider.
+        verify (bool): Verify TLS certificates.
+    """
+    name = "chart API"
+
+    def __init__(self, symbol="GC=F", period=PERIOD_2008, base_url="https://query1.finance.yahoo.com",
+                 timeout=10.0, retries=3, backoff=0.5, cache_dir=os.path.join(CACHE_DIR, "http"),
+                 save_csv=None, verify=True, pool_size=2):
+        self.symbol = symbol
+        self.period = period
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_dir = cache_dir
+        self.save_csv = save_csv
+        self.pool = ConnectionPool(base_url, size=pool_size, timeout=timeout, verify=verify)
+
+    def path(self):
+        query = urlencode({"symbol": self.symbol, "period1": self.period[0],
+                           "period2": self.period[1], "interval": "1d"})
+        return f"/v8/finance/chart/{self.symbol}?{query}"
+
+    def fetch(self):
+        path = self.path()
+        body = self._read_cache(path)
+        if body is not None:
+            try:
+                dates, closes = parse_chart_json(body)
+            except ProviderError:
+                body = None  # a bad cached response: fetch it again
+        if body is None:
+            body = self.get(path)
+            dates, closes = parse_chart_json(body)  # only responses that parse are cached
+            self._write_cache(path, body)
+        if self.save_csv:
+            write_price_csv(self.save_csv, dates, closes)
+        return dates, closes
+
+    def get(self, path):
+        """GET path on a pooled connection, retrying transient failures."""
+        import http.client
+        last_error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+            conn = self.pool.acquire()
+            try:
+                conn.request("GET", path, headers={"User-Agent": "Mozilla/5.0", "Connection": "keep-alive"})
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                last_error = e
+                continue
+            if resp.will_close:
+                conn.close()
+            else:
+                self.pool.release(conn)
+            if resp.status == 200:
+                return body
+            last_error = ProviderError(f"HTTP {resp.status} {resp.reason}")
+            if resp.status != 429 and resp.status < 500:
+                break  # client errors will not fix themselves
+        raise ProviderError(f"{self.base_url}{path}: {last_error}")
+
+    # ---------- on-disk response cache ----------
+    def _cache_file(self, path):
+        key = hashlib.sha1((self.base_url + path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def _read_cache(self, path):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_file(path), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_cache(self, path, body):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        target = self._cache_file(path)
+        with open(target + ".tmp", "wb") as f:
+            f.write(body)
+        os.replace(target + ".tmp", target)
+
+
+class ChainProvider(PriceProvider):
+    """Try providers in order and return the first successful result."""
+    name = "chain"
+
+    def __init__(self, providers):
+        self.providers = list(providers)
+
+    def fetch(self):
+        errors = []
+        for provider in self.providers:
+            try:
+                return provider.fetch()
+            except Exception as e:
+                errors.append(f"{provider.name}: {e}")
+        raise ProviderError("; ".join(errors) or "no providers configured")
+
+
+def parse_chart_json(body):
+    """Parse a chart API response into (dates_ns, closes), dropping missing closes."""
+    try:
+        data = json.loads(body.decode("utf-8") if isinstance(body, bytes) else body)
+    except ValueError as e:  # also UnicodeDecodeError
+        raise ProviderError(f"Chart response is not JSON: {e}")
+    try:
+        result = data['chart']['result'][0]
+        ts = result['timestamp']
+        closes = result['indicators']['quote'][0]['close']
+    except (KeyError, IndexError, TypeError) as e:
+        raise ProviderError(f"Unexpected chart response: {e}")
+    ts = np.asarray(ts, dtype=np.int64)
+    closes = np.array([np.nan if c is None else c for c in closes], dtype=np.float64)
+    keep = ~np.isnan(closes)
+    return ts[keep] * 1_000_000_000, closes[keep]
+
+
+def default_provider(csv_file="gold_2008.csv"):
+    """Offline first: the local 2008 CSV, else Yahoo Finance (which then seeds the CSV)."""
+    return ChainProvider([LocalFileProvider(csv_file), HttpChartProvider(save_csv=csv_file)])
+
+
+# =============== Local stand-in server ===============
+class StubChartServer:
+    """Serve a chart API response for given prices on 127.0.0.1 (HTTP/1.1 keep-alive).
+
+    Args:
+        dates / closes: Prices to serve (dates in ns).
+        fail_first (int): Answer the first N requests with HTTP 503, to exercise retries.
+    """
+    def __init__(self, dates, closes, fail_first=0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        payload = json.dumps({"chart": {"result": [{
+            "timestamp": (np.asarray(dates, dtype=np.int64) // 1_000_000_000).tolist(),
+            "indicators": {"quote": [{"close": np.asarray(closes, dtype=np.float64).tolist()}]},
+        }]}}).encode("utf-8")
+        server = self
+        self.requests = 0
+        self.fail_first = fail_first
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body are separate writes on a kept-alive socket
+
+            def do_GET(self):
+                server.requests += 1
+                if server.requests <= server.fail_first:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    dates, closes = load_prices("gold_2008.csv")
+
+    if "test" in sys.argv:
+        import tempfile
+        print("Tests begin.")
+        with StubChartServer(dates, closes, fail_first=2) as stub, tempfile.TemporaryDirectory() as tmp:
+            http_provider = HttpChartProvider(base_url=stub.base_url, backoff=0.01, cache_dir=tmp)
+            d, c = http_provider.fetch()
+            print("Parse Test:", np.array_equal(d, dates) and np.allclose(c, closes), "Requests:", stub.requests)
+            http_provider.fetch()
+            print("Cache Test: requests after second fetch:", stub.requests)
+            chain = ChainProvider([LocalFileProvider(os.path.join(tmp, "missing.csv")),
+                                   HttpChartProvider(base_url=stub.base_url, cache_dir=None)])
+            print("Fallback Test:", len(chain.fetch()[1]), "closes")
+
+            bad = HttpChartProvider(base_url=stub.base_url, cache_dir=os.path.join(tmp, "bad"))
+            good_get, bad.get = bad.get, lambda path: b'{"chart": {"result": null, "error": "Not Found"}}'
+            try:
+                bad.fetch()
+            except ProviderError:
+                pass
+            print("Error Payload Test: not cached ->", not os.path.exists(bad._cache_file(bad.path())))
+            bad._write_cache(bad.path(), b"<html>oops</html>")
+            bad.get = good_get
+            print("Bad Cache Test: refetched ->", len(bad.fetch()[1]) == len(closes),
+                  parse_chart_json(bad._read_cache(bad.path()))[1].size == len(closes))
+        print("Tests finish.")
+
+    elif "bench" in sys.argv:
+        import urllib.request
+        n = 200
+        with StubChartServer(dates, closes) as stub:
+            pooled = HttpChartProvider(base_url=stub.base_url, cache_dir=None)
+            path = pooled.path()
+            t = time.perf_counter()
+            for _ in range(n):
+                parse_chart_json(pooled.get(path))
+            t_pooled = time.perf_counter() - t
+
+            t = time.perf_counter()
+            for _ in range(n):
+                with urllib.request.urlopen(stub.base_url + path, timeout=10) as resp:
+                    parse_chart_json(resp.read())
+            t_fresh = time.perf_counter() - t
+        print(f"{n} fetches: pooled keep-alive {t_pooled * 1000 / n:.2f} ms/fetch, "
+              f"new connection each {t_fresh * 1000 / n:.2f} ms/fetch")
@@ -0,0 +1,202 @@
+"""Append-only leaderboard storage for the ranking CSV files.
+
+The ranking files (game_rankings_2008.csv / game_rankings_hard_mode.csv) are
+only ever appended to. ``RankingStore`` reads each file once, then keeps:
+
+    - a sorted list of every record's return_rate, so "what rank is this
+      score?" is a bisect, and
+    - a per-player best-score table plus a sorted board of those bests, so the
+      top-K leaderboard is a slice.
+
+Saving a result appends one CSV line under an exclusive file lock instead of
+rewriting the whole file, and before every query the store reads only the
+bytes other game instances appended since it last looked.
+"""
+import bisect
+import csv
+import io
+import os
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+FIELDS = ['player_name', 'final_balance', 'profit_loss', 'return_rate', 'play_date']
+
+
+class _FileLock:
+    """Exclusive (or shared) whole-file lock on an open binary file object."""
+    def __init__(self, f, exclusive=True):
+        self.f = f
+        self.exclusive = exclusive
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+        return self.f
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+        else:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RankingStore:
+    """Indexed, append-only view of one ranking CSV file.
+
+    Args:
+        csv_file (str): Path of the ranking CSV (created on first append).
+    """
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self._offset = 0          # bytes of the file already indexed
+        self._header = None
+        self._returns = []        # every record's return_rate, ascending
+        self._best = {}           # player_name -> best record
+        self._board = []          # (-best return_rate, player_name), ascending
+
+    # ---------- Reading ----------
+    def refresh(self):
+        """Index any lines appended to the file since the last call."""
+        if not os.path.exists(self.csv_file):
+            if self._offset:
+                self._reset()
+            return
+        with open(self.csv_file, 'rb') as f:
+            with _FileLock(f, exclusive=False):
+                self._read_new(f)
+
+    def _read_new(self, f):
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size < self._offset:
+            # File was replaced or truncated: start over
+            self._reset()
+        if size == self._offset:
+            return
+        f.seek(self._offset)
+        chunk = f.read(size - self._offset)
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return  # only a partial line so far
+        self._offset += end
+        for row in csv.reader(io.StringIO(chunk[:end].decode('utf-8'))):
+            if not row:
+                continue
+            if self._header is None:
+                self._header = row
+                continue
+            self._index(dict(zip(self._header, row)))
+
+    def _index(self, raw):
+        try:
+            record = {
+                'player_name': str(raw['player_name']),
+                'final_balance': float(raw['final_balance']),
+                'profit_loss': float(raw['profit_loss']),
+                'return_rate': float(raw['return_rate']),
+                'play_date': raw.get('play_date', ''),
+            }
+        except (KeyError, TypeError, ValueError):
+            return  # skip malformed lines instead of breaking the leaderboard
+        rr = record['return_rate']
+        bisect.insort(self._returns, rr)
+
+        name = record['player_name']
+        best = self._best.get(name)
+        if best is None or rr > best['return_rate']:
+            if best is not None:
+                i = bisect.bisect_left(self._board, (-best['return_rate'], name))
+                del self._board[i]
+            bisect.insort(self._board, (-rr, name))
+            self._best[name] = record
+
+    # ---------- Writing ----------
+    def append(self, player_name, final_balance, pl, rr, play_date=None):
+        """Append one game result (O(1) file write under an exclusive lock) and index it."""
+        record = {
+            'player_name': player_name,
+            'final_balance': final_balance,
+            'profit_loss': pl,
+            'return_rate': rr,
+            'play_date': play_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=FIELDS, lineterminator='\n')
+
+        with open(self.csv_file, 'a+b') as f:
+            with _FileLock(f, exclusive=True):
+                # Pick up results other games appended first, so our offset stays exact
+                self._read_new(f)
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                if size == 0:
+                    writer.writeheader()
+                elif self._offset < size:
+                    buf.write('\n')  # previous writer left no trailing newline
+                writer.writerow(record)
+                f.write(buf.getvalue().encode('utf-8'))
+                f.flush()
+                self._read_new(f)
+        return record
+
+    # ---------- Queries ----------
+    def __len__(self):
+        return len(self._returns)
+
+    def rank_of(self, return_rate):
+        """1-based rank of a return rate among all records (ties share the better rank)."""
+        return len(self._returns) - bisect.bisect_right(self._returns, return_rate) + 1
+
+    def top_players(self, k):
+        """Best record of each of the top-k players, highest return first."""
+        return [self._best[name] for _neg_rr, name in self._board[:k]]
+
+    def player_best(self, player_name):
+        return self._best.get(player_name)
+
+
+# Optional SQLite results database (see results_db.py); CSV files are used when unset
+RESULTS_DB = os.environ.get("GOLD_MAGNATE_DB")
+
+_stores = {}
+
+
+def open_store(csv_file):
+    """Return the shared ranking store for a file, refreshed with any new results.
+
+    With GOLD_MAGNATE_DB set this is the SQLite table for the file's mode instead.
+    """
+    if RESULTS_DB:
+        from results_db import open_table
+        return open_table(RESULTS_DB, csv_file)
+    key = os.path.abspath(csv_file)
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = RankingStore(csv_file)
+    else:
+        store.refresh()
+    return store
+
+
+def load_top_players(csv_file, k):
+    """Best record of each of the top-k players, or None when the ranking file does not exist yet
+    (with GOLD_MAGNATE_DB set, the database is always queried).
+
+    Reads the file, so the games call it on their I/O worker (see io_worker.py).
+    """
+    if not RESULTS_DB and not os.path.exists(csv_file):
+        return None
+    return open_store(csv_file).top_players(k)
@@ -0,0 +1,188 @@
+"""Optional SQLite store for game results.
+
+An alternative to the flat ranking CSVs. Results of every mode live in one
+table indexed on (mode, return_rate) and (player_name), and the database runs
+in WAL mode, so many game instances can record results while others read the
+leaderboard. Leaderboard and rank questions are answered by indexed queries.
+
+Enable it by pointing GOLD_MAGNATE_DB at a database file; rankings.open_store
+then hands out ResultsTable objects, which behave like RankingStore. The
+existing CSV files are imported once, the first time each mode is opened.
+
+One-shot import from the command line:
+    python results_db.py game_results.db
+"""
+import csv
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+# Ranking CSV file -> mode name stored in the database
+MODE_FILES = {
+    "game_rankings_2008.csv": "2008",
+    "game_rankings_hard_mode.csv": "hard_mode",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id            INTEGER PRIMARY KEY,
+    mode          TEXT NOT NULL,
+    player_name   TEXT NOT NULL,
+    final_balance REAL NOT NULL,
+    profit_loss   REAL NOT NULL,
+    return_rate   REAL NOT NULL,
+    play_date     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_mode_return ON results (mode, return_rate);
+CREATE INDEX IF NOT EXISTS idx_results_player ON results (player_name);
+CREATE TABLE IF NOT EXISTS imported_files (
+    path        TEXT PRIMARY KEY,
+    mode        TEXT NOT NULL,
+    rows        INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+def mode_for(csv_file):
+    """Mode name used in the database for a ranking CSV file."""
+    name = os.path.basename(csv_file)
+    return MODE_FILES.get(name, os.path.splitext(name)[0])
+
+
+class ResultsDB:
+    """SQLite-backed game results (WAL journaling, indexed leaderboard queries).
+
+    Args:
+        db_file (str): Database path; created if missing.
+        timeout (float): Seconds to wait for another writer's lock.
+    """
+    def __init__(self, db_file, timeout=10.0):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, timeout=timeout, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- Writing ----------
+    def record(self, mode, player_name, final_balance, pl, rr, play_date=None):
+        """Insert one game result."""
+        play_date = play_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO results (mode, player_name, final_balance, profit_loss, return_rate, play_date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (mode, str(player_name), float(final_balance), float(pl), float(rr), play_date),
+            )
+        return {'player_name': player_name, 'final_balance': final_balance,
+                'profit_loss': pl, 'return_rate': rr, 'play_date': play_date}
+
+    def import_csv(self, csv_file, mode=None):
+        """Import a ranking CSV once; returns rows imported (0 if it was imported before or is missing)."""
+        if not os.path.exists(csv_file):
+            return 0
+        mode = mode or mode_for(csv_file)
+        path = os.path.abspath(csv_file)
+        if self._imported(path):
+            return 0
+        rows = []
+        with open(csv_file, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                try:
+                    rows.append((mode, str(row['player_name']), float(row['final_balance']),
+                                 float(row['profit_loss']), float(row['return_rate']), row.get('play_date', '')))
+                except (KeyError, TypeError, ValueError):
+                    continue
+        with self._lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")  # another game may be importing the same file
+            if self.conn.execute("SELECT 1 FROM imported_files WHERE path = ?", (path,)).fetchone():
+                return 0
+            self.conn.executemany(
+                "INSERT INTO results (mode, player_name, final_balance, profit_loss, return_rate, play_date) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT INTO imported_files VALUES (?, ?, ?, ?)",
+                              (path, mode, len(rows), datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        return len(rows)
+
+    def _imported(self, path):
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM imported_files WHERE path = ?", (path,)).fetchone() is not None
+
+    # ---------- Queries ----------
+    def count(self, mode):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM results WHERE mode = ?", (mode,)).fetchone()[0]
+
+    def rank_of(self, mode, return_rate):
+        """1-based rank of a return rate within a mode (ties share the better rank)."""
+        with self._lock:
+            higher = self.conn.execute(
+                "SELECT COUNT(*) FROM results WHERE mode = ? AND return_rate > ?", (mode, return_rate)
+            ).fetchone()[0]
+        return higher + 1
+
+    def top_players(self, mode, k):
+        """Best result of each of the top-k players in a mode, highest return first."""
+        # SQLite returns the other columns from the row that holds MAX(return_rate)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT player_name, final_balance, profit_loss, MAX(return_rate) AS return_rate, play_date "
+                "FROM results WHERE mode = ? GROUP BY player_name "
+                "ORDER BY return_rate DESC LIMIT ?", (mode, k)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def table(self, mode):
+        return ResultsTable(self, mode)
+
+
+class ResultsTable:
+    """One mode of a ResultsDB, with the same interface as rankings.RankingStore."""
+    def __init__(self, db, mode):
+        self.db = db
+        self.mode = mode
+
+    def refresh(self):
+        pass  # every query reads the live database
+
+    def append(self, player_name, final_balance, pl, rr, play_date=None):
+        return self.db.record(self.mode, player_name, final_balance, pl, rr, play_date)
+
+    def __len__(self):
+        return self.db.count(self.mode)
+
+    def rank_of(self, return_rate):
+        return self.db.rank_of(self.mode, return_rate)
+
+    def top_players(self, k):
+        return self.db.top_players(self.mode, k)
+
+
+_dbs = {}
+
+
+def open_table(db_file, csv_file):
+    """Shared ResultsTable for a ranking CSV's mode; imports that CSV on first use."""
+    key = os.path.abspath(db_file)
+    db = _dbs.get(key)
+    if db is None:
+        db = _dbs[key] = ResultsDB(db_file)
+    db.import_csv(csv_file)
+    return db.table(mode_for(csv_file))
+
+
+if __name__ == "__main__":
+    # One-shot import of the existing ranking CSVs: python results_db.py [db_file]
+    db_file = sys.argv[1] if len(sys.argv) > 1 else "game_results.db"
+    db = ResultsDB(db_file)
+    for csv_file, mode in MODE_FILES.items():
+        print(f"{csv_file} -> {mode}: imported {db.import_csv(csv_file, mode)} rows")
+    db.close()
@@ -0,0 +1,298 @@
+"""Multi-player network mode: one authoritative 2008 clock for many players.
+
+An asyncio TCP server runs a single SimulationEngine and broadcasts every tick
+(and its news) to all connected players at the same moment. Players trade by
+sending orders; their accounts live in one AccountBook, so the server marks
+everyone to market and checks liquidations in one vectorized step per tick.
+
+Protocol: line-delimited JSON (one object per line, UTF-8). Orders fill at the
+price of the last tick broadcast; a line longer than 64 KiB closes the connection.
+
+    client -> server
+        {"op": "hello", "name": "Alice"}           join (or rejoin, once the old connection is gone) as a player
+        {"op": "buy", "qty": 2}                    open a long position
+        {"op": "sell", "qty": 2}                   open a short position
+        {"op": "close"}                            close the position
+        {"op": "leaderboard"}                      ask for the current top 10
+
+    server -> client
+        {"type": "welcome", "id", "name", "total_days", "balance"}
+        {"type": "tick", "idx", "day", "price", "news", "ts"}
+        {"type": "fill", "op", "ok", "msg", "price", "balance", "position"}
+        {"type": "leaderboard", "top": [[name, equity], ...]}
+        {"type": "liquidated", "price", "balance"}
+        {"type": "end", "final_balance", "profit_loss", "return_rate", "rank", "players"}
+        {"type": "error", "msg"}
+
+Usage:
+    python server.py [port] [interval_ms]     serve the 2008 session (default 8765, 1000 ms/day)
+    python server.py bench [clients]          N simulated players over localhost
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from account_book import AccountBook
+from engine import SimulationEngine
+from news import BUILTIN_NEWS
+
+DEFAULT_PORT = 8765
+MAX_QTY = 2**31 - 1  # lots per order; larger sizes would overflow the book's int64 arithmetic
+
+
+def _encode(obj):
+    return (json.dumps(obj, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class GameServer:
+    """Authoritative game clock plus order handling for many TCP clients.
+
+    Args:
+        engine (SimulationEngine): Price/news source; its own account is not used.
+        interval_ms (int): Wall-clock time per trading day.
+        host / port (str / int): Listen address (port 0 picks a free port).
+        min_players (int): Hold the clock until this many players said hello.
+        leaderboard_every (int): Broadcast the leaderboard every N ticks.
+        max_buffer (int): Drop a client whose unsent data exceeds this many bytes,
+            so one slow reader cannot hold back everyone else.
+    """
+    def __init__(self, engine, interval_ms=1000, host="127.0.0.1", port=DEFAULT_PORT, min_players=0,
+                 leaderboard_every=5, max_buffer=1 << 20, initial_balance=100000.0):
+        self.engine = engine
+        self.interval_ms = interval_ms
+        self.host = host
+        self.port = port
+        self.min_players = min_players
+        self.leaderboard_every = leaderboard_every
+        self.max_buffer = max_buffer
+        self.book = AccountBook(initial_balance=initial_balance)
+        self.clients = {}            # StreamWriter -> player id (None until hello)
+        self.finished = False
+        self.last_price = None       # price of the last tick broadcast; orders fill at it
+        self.ticks_sent = 0
+        self.dropped = 0
+        self._server = None
+        self._ready = asyncio.Event()
+
+    # ---------- Lifecycle ----------
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.min_players <= 0:
+            self._ready.set()
+        return self
+
+    async def run(self):
+        """Run the clock to the end of the session, then settle and close."""
+        await self._ready.wait()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while not self.engine.finished:
+            self._tick()
+            # Fixed schedule from the start, so time spent broadcasting does not accumulate as drift
+            deadline += self.interval_ms / 1000.0
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+        self._finish()
+        await self.close()
+
+    async def close(self):
+        for writer in list(self.clients):
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    # ---------- Clock ----------
+    def _tick(self):
+        tick = self.engine.step()
+        self.last_price = tick.price
+        liquidated = self.book.step(tick.price)
+        self.broadcast({"type": "tick", "idx": tick.idx, "day": tick.date,
+                        "price": tick.price, "news": tick.news_text, "ts": time.time()})
+        self.ticks_sent += 1
+        if len(liquidated):
+            gone = set(liquidated.tolist())
+            for writer, pid in list(self.clients.items()):  # _write may drop a slow client
+                if pid in gone:
+                    self.send(writer, {"type": "liquidated", "price": tick.price,
+                                       "balance": float(self.book.balance[pid])})
+        if self.leaderboard_every and tick.idx % self.leaderboard_every == 0:
+            self.broadcast(self._leaderboard())
+
+    def _finish(self):
+        """Close every open position at the last price and send each player their result."""
+        self.finished = True
+        last_price = self.engine.settle_price  # as SimulationEngine.settle
+        self.book.close(np.flatnonzero(self.book.position != 0), last_price)
+        self.book.mark(last_price)
+        final_balance, pl, rr = self.book.summary()
+        # rank 1 = best return; ties share the better rank
+        ranks = np.searchsorted(np.sort(-rr), -rr, side="left") + 1
+        self.broadcast(self._leaderboard())
+        for writer, pid in list(self.clients.items()):  # _write may drop a slow client
+            if pid is not None:
+                self.send(writer, {"type": "end", "final_balance": float(final_balance[pid]),
+                                   "profit_loss": float(pl[pid]), "return_rate": float(rr[pid]),
+                                   "rank": int(ranks[pid]), "players": len(self.book)})
+
+    def _leaderboard(self, k=10):
+        return {"type": "leaderboard", "top": self.book.leaderboard(k)}
+
+    # ---------- Sending ----------
+    def send(self, writer, obj):
+        self._write(writer, _encode(obj))
+
+    def broadcast(self, obj):
+        data = _encode(obj)  # encoded once for every client
+        for writer in list(self.clients):
+            self._write(writer, data)
+
+    def _write(self, writer, data):
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.dropped += 1
+            self.clients.pop(writer, None)
+            writer.close()
+            return
+        writer.write(data)
+
+    # ---------- Orders ----------
+    async def _handle(self, reader, writer):
+        self.clients[writer] = None
+        try:
+            async for line in reader:
+                try:
+                    msg = json.loads(line)
+                    op = msg.get("op")
+                except (ValueError, AttributeError):
+                    self.send(writer, {"type": "error", "msg": "Expected one JSON object per line."})
+                    continue
+                self._dispatch(writer, op, msg)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:  # a line over the reader's limit (asyncio.LimitOverrunError)
+            self.send(writer, {"type": "error", "msg": "Line too long; closing the connection."})
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def _dispatch(self, writer, op, msg):
+        pid = self.clients.get(writer)
+        if op == "hello":
+            name = str(msg.get("name") or f"Player{len(self.book) + 1}")
+            try:
+                taken = self.book.player_id(name)
+            except KeyError:
+                taken = None
+            if taken is not None and any(p == taken and w is not writer for w, p in self.clients.items()):
+                self.send(writer, {"type": "error", "msg": f"{name!r} is already playing on another connection."})
+                return
+            pid = self.clients[writer] = self.book.add_player(name)
+            self.send(writer, {"type": "welcome", "id": pid, "name": self.book.names[pid],
+                               "total_days": self.engine.total_days, "balance": float(self.book.balance[pid])})
+            if sum(p is not None for p in self.clients.values()) >= self.min_players:
+                self._ready.set()
+        elif op == "leaderboard":
+            self.send(writer, self._leaderboard())
+        elif pid is None:
+            self.send(writer, {"type": "error", "msg": "Say hello first."})
+        elif self.finished:
+            self.send(writer, {"type": "error", "msg": "The game is over."})
+        elif op in ("buy", "sell", "close"):
+            self._order(writer, pid, op, msg)
+        else:
+            self.send(writer, {"type": "error", "msg": f"Unknown op: {op!r}"})
+
+    def _order(self, writer, pid, op, msg):
+        account = self.book.account(pid)
+        price = self.last_price
+        if price is None:  # before the first tick: the opening price
+            price, _day = self.engine.current_trade_price()
+        if self.book.liquidated[pid]:
+            text, ok = "Account was liquidated.", False
+        elif op == "close":
+            ok = account.position != 0
+            text, _pnl = account.close_position(price)
+        else:
+            try:
+                qty = int(msg.get("qty", 0))
+            except (TypeError, ValueError):
+                qty = 0
+            if not 0 < qty <= MAX_QTY:
+                text, ok = f"Please enter a valid lot size (1 to {MAX_QTY}).", False
+            elif op == "buy":
+                text, ok = account.buy(price, qty)
+            else:
+                text, ok = account.sell(price, qty)
+        self.send(writer, {"type": "fill", "op": op, "ok": ok, "msg": text, "price": price,
+                           "balance": account.balance, "position": account.position})
+
+
+async def serve(port=DEFAULT_PORT, interval_ms=1000):
+    engine = SimulationEngine.from_csv("gold_2008.csv", news_map=BUILTIN_NEWS, random_news=True)
+    server = await GameServer(engine, interval_ms=interval_ms, port=port).start()
+    print(f"Gold Magnate server on {server.host}:{server.port}, {engine.total_days} days, {interval_ms} ms/day")
+    await server.run()
+
+
+# =============== Load benchmark ===============
+async def _simulated_player(port, name, seed, stats):
+    """Connect, trade at random and record tick fan-out latency until the game ends."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(_encode({"op": "hello", "name": name}))
+    ticks = 0
+    async for line in reader:
+        msg = json.loads(line)
+        kind = msg["type"]
+        if kind == "tick":
+            ticks += 1
+            stats["latency"].append(time.time() - msg["ts"])
+            r = rng.random()
+            if r < 0.05:
+                writer.write(_encode({"op": rng.choice(("buy", "sell")), "qty": rng.randint(1, 5)}))
+            elif r < 0.10:
+                writer.write(_encode({"op": "close"}))
+        elif kind == "fill":
+            stats["fills"] += 1
+        elif kind == "end":
+            stats["ended"] += 1
+            break
+    stats["ticks"].append(ticks)
+    writer.close()
+
+
+async def bench(n_clients=100, interval_ms=10):
+    engine = SimulationEngine.from_csv("gold_2008.csv", news_map=BUILTIN_NEWS, random_news=True)
+    server = await GameServer(engine, interval_ms=interval_ms, port=0, min_players=n_clients).start()
+    stats = {"latency": [], "ticks": [], "fills": 0, "ended": 0}
+    players = [asyncio.create_task(_simulated_player(server.port, f"bot{i}", i, stats)) for i in range(n_clients)]
+    t = time.perf_counter()
+    await server.run()
+    await asyncio.gather(*players)
+    elapsed = time.perf_counter() - t
+
+    lat = np.array(stats["latency"]) * 1000
+    print(f"{n_clients} clients x {server.ticks_sent} ticks @ {interval_ms} ms/day in {elapsed:.2f} s "
+          f"({lat.size / elapsed:.0f} tick deliveries/s, {stats['fills']} order replies)")
+    print(f"fan-out latency: mean {lat.mean():.2f} ms, p50 {np.percentile(lat, 50):.2f} ms, "
+          f"p99 {np.percentile(lat, 99):.2f} ms, max {lat.max():.2f} ms")
+    print("every client saw every tick:", all(n == server.ticks_sent for n in stats["ticks"]),
+          "| results delivered:", stats["ended"], "| dropped:", server.dropped)
+    print("leaderboard:", server.book.leaderboard(3))
+
+
+if __name__ == "__main__":
+    if "bench" in sys.argv:
+        i = sys.argv.index("bench")
+        asyncio.run(bench(int(sys.argv[i + 1]) if len(sys.argv) > i + 1 else 100))
+    else:
+        args = [int(a) for a in sys.argv[1:3]]
+        try:
+            asyncio.run(serve(*args))
+        except KeyboardInterrupt:
+            pass
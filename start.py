@@ -1,8 +1,35 @@
-import game
-import game_v2
-import os
-import pandas as pd
+import subprocess
+import sys
+import threading
 import tkinter as tk
+from tkinter import messagebox
+
+from io_worker import IOExecutor
+from rankings import load_top_players
+
+# The game modules pull in pandas/matplotlib/numpy, which take seconds to import.
+# They are imported lazily (and their heavy dependencies preloaded while the
+# player types a name) so the main menu appears immediately. Only modules that
+# never touch Tk are preloaded: Tk objects must be created on the main thread,
+# so game/game_v2 and the TkAgg backend are imported there, on "Submit".
+PRELOAD_MODULES = ("numpy", "pandas", "matplotlib.figure", "engine", "journal", "pricegen")
+_preload_started = False
+
+
+def preload_game_modules():
+    """Import the games' heavy non-Tk dependencies once, in a background thread."""
+    global _preload_started
+    if _preload_started:
+        return
+    _preload_started = True
+
+    def _load():
+        for module in PRELOAD_MODULES:
+            try:
+                __import__(module)
+            except Exception:
+                pass  # the real import on "Submit" will report the error
+    threading.Thread(target=_load, name="preload-game-modules", daemon=True).start()
 
 
 class TradingGameUI:
@@ -10,6 +37,7 @@ class TradingGameUI:
         self.root = root
         self.root.title("gold magnate 2008")
         self.r = None
+        self.io = IOExecutor(self.root)  # ranking reads run off the Tk thread
 
         self.font_big = ("Microsoft YaHei", 18)
         self.font_title = ("Microsoft YaHei", 20, "bold")
@@ -40,6 +68,8 @@ class TradingGameUI:
         frame = tk.Frame(self.root)
         frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=200, pady=40)
 
+        preload_game_modules()
+
         mainfarme = tk.LabelFrame(frame, text="Player Name (2008 Original)", font=self.font_title, padx=8, pady=8)
         mainfarme.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 8))
 
@@ -61,6 +91,8 @@ class TradingGameUI:
         frame = tk.Frame(self.root)
         frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=80, pady=40)
 
+        preload_game_modules()
+
         mainfarme = tk.LabelFrame(frame, text="Player Name", font=self.font_title, padx=8, pady=8)
         mainfarme.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 8))
 
@@ -92,6 +124,7 @@ class TradingGameUI:
                 self.r.destroy()
             for widget in self.root.winfo_children():
                 widget.destroy()
+            import game
             app = game.TradingGameUI(self.root, name)
             self.root.mainloop()
         return
@@ -99,13 +132,14 @@ class TradingGameUI:
     def start_new_harder_game(self):
         name=self.entry_widget.get("1.0", "end-1c")
         if len(name) < 3:
-            tk.messagebox.showinfo("Warning!","Invalid Name， pls input at least 3 letters")
+            messagebox.showinfo("Warning!","Invalid Name， pls input at least 3 letters")
             return
         else:
             if self.r is not None:
                 self.r.destroy()
             for widget in self.root.winfo_children():
                 widget.destroy()
+            import game_v2
             app = game_v2.TradingGameUI(self.root, name)
             self.root.mainloop()
         return
@@ -129,66 +163,72 @@ class TradingGameUI:
                               font=self.font_title, bg='white', fg='#2c3e50')
         title_label.pack(pady=(0, 20))
         
-        # check if data existed
-        if os.path.exists(csv_file):
-            try:
-                df = pd.read_csv(csv_file)
-                if not df.empty:
-                    # remove duplicated record based investment return rates
-                    df_best = df.loc[df.groupby('player_name')['return_rate'].idxmax()]
-                    df_sorted = df_best.sort_values('return_rate', ascending=False).head(10)
-                    
-                    # create ranking frame
-                    ranking_frame = tk.Frame(main_frame, bg='white')
-                    ranking_frame.pack(fill=tk.BOTH, expand=True)
-                    
-                    # add scroll bar
-                    canvas = tk.Canvas(ranking_frame, bg='white')
-                    scrollbar = tk.Scrollbar(ranking_frame, orient="vertical", command=canvas.yview)
-                    scrollable_frame = tk.Frame(canvas, bg='white')
-                    
-                    scrollable_frame.bind(
-                        "<Configure>",
-                        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-                    )
-                    
-                    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-                    canvas.configure(yscrollcommand=scrollbar.set)
-                    
-                    medals = ['🥇', '🥈', '🥉', '🏅', '🏅', '🎖️', '🎖️', '🎖️', '🎖️', '🎖️']
-                    colors = ['#ffd700', '#c0c0c0', '#cd7f32', '#4a90e2', '#4a90e2', '#7f8c8d', '#7f8c8d', '#7f8c8d', '#7f8c8d', '#7f8c8d']
-                    
-                    for idx, (_, row) in enumerate(df_sorted.iterrows()):
-                        medal = medals[idx] if idx < len(medals) else f"#{idx+1}"
-                        color = colors[idx] if idx < len(colors) else '#7f8c8d'
-                        
-                        # 每个排名的框架
-                        rank_frame = tk.Frame(scrollable_frame, bg='white')
-                        rank_frame.pack(fill=tk.X, pady=5)
-                        
-                        # 排名文本
-                        rank_text = f"{medal} {row['player_name']:>15} | Return: {row['return_rate']:>8.2f}% | Balance: ${row['final_balance']:>10,.2f}"
-                        
-                        rank_label = tk.Label(rank_frame, text=rank_text, 
-                                             font=("Courier New", 14, "bold" if idx < 3 else "normal"),
-                                             bg='white', fg=color, anchor='w')
-                        rank_label.pack(fill=tk.X)
-                    
-                    canvas.pack(side="left", fill="both", expand=True)
-                    scrollbar.pack(side="right", fill="y")
-                    
-                else:
-                    no_data_label = tk.Label(main_frame, text="No game records found.\nPlay the 2008 Original game to see rankings!", 
-                                           font=self.font_big, bg='white', fg='#7f8c8d')
-                    no_data_label.pack()
-            except Exception as e:
-                error_label = tk.Label(main_frame, text=f"Error reading ranking data:\n{str(e)}", 
+        # rankings are read in the background; show "Loading..." until they arrive
+        body_frame = tk.Frame(main_frame, bg='white')
+        body_frame.pack(fill=tk.BOTH, expand=True)
+        loading_label = tk.Label(body_frame, text="Loading rankings...", font=self.font_big, bg='white', fg='#7f8c8d')
+        loading_label.pack()
+
+        def show(top_players):
+            if not ranking_window.winfo_exists():
+                return  # closed while loading
+            loading_label.destroy()
+            if top_players is None:
+                no_file_label = tk.Label(body_frame, text="No ranking file found.\nPlay the 2008 Original game to create rankings!", 
+                                       font=self.font_big, bg='white', fg='#7f8c8d')
+                no_file_label.pack()
+            elif not top_players:
+                no_data_label = tk.Label(body_frame, text="No game records found.\nPlay the 2008 Original game to see rankings!", 
+                                       font=self.font_big, bg='white', fg='#7f8c8d')
+                no_data_label.pack()
+            else:
+                # create ranking frame
+                ranking_frame = tk.Frame(body_frame, bg='white')
+                ranking_frame.pack(fill=tk.BOTH, expand=True)
+
+                # add scroll bar
+                canvas = tk.Canvas(ranking_frame, bg='white')
+                scrollbar = tk.Scrollbar(ranking_frame, orient="vertical", command=canvas.yview)
+                scrollable_frame = tk.Frame(canvas, bg='white')
+
+                scrollable_frame.bind(
+                    "<Configure>",
+                    lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+                )
+
+                canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+                canvas.configure(yscrollcommand=scrollbar.set)
+
+                medals = ['🥇', '🥈', '🥉', '🏅', '🏅', '🎖️', '🎖️', '🎖️', '🎖️', '🎖️']
+                colors = ['#ffd700', '#c0c0c0', '#cd7f32', '#4a90e2', '#4a90e2', '#7f8c8d', '#7f8c8d', '#7f8c8d', '#7f8c8d', '#7f8c8d']
+
+                for idx, row in enumerate(top_players):
+                    medal = medals[idx] if idx < len(medals) else f"#{idx+1}"
+                    color = colors[idx] if idx < len(colors) else '#7f8c8d'
+
+                    # 每个排名的框架
+                    rank_frame = tk.Frame(scrollable_frame, bg='white')
+                    rank_frame.pack(fill=tk.X, pady=5)
+
+                    # 排名文本
+                    rank_text = f"{medal} {row['player_name']:>15} | Return: {row['return_rate']:>8.2f}% | Balance: ${row['final_balance']:>10,.2f}"
+
+                    rank_label = tk.Label(rank_frame, text=rank_text, 
+                                         font=("Courier New", 14, "bold" if idx < 3 else "normal"),
+                                         bg='white', fg=color, anchor='w')
+                    rank_label.pack(fill=tk.X)
+
+                canvas.pack(side="left", fill="both", expand=True)
+                scrollbar.pack(side="right", fill="y")
+
+        def failed(e):
+            if ranking_window.winfo_exists():
+                loading_label.destroy()
+                error_label = tk.Label(body_frame, text=f"Error reading ranking data:\n{str(e)}", 
                                      font=self.font_big, bg='white', fg='#e74c3c')
                 error_label.pack()
-        else:
-            no_file_label = tk.Label(main_frame, text="No ranking file found.\nPlay the 2008 Original game to create rankings!", 
-                                   font=self.font_big, bg='white', fg='#7f8c8d')
-            no_file_label.pack()
+
+        self.io.submit(load_top_players, csv_file, 10, on_done=show, on_error=failed)
         
         # close button
         close_btn = tk.Button(main_frame, text="Close", font=self.font_big, 
@@ -202,7 +242,24 @@ class TradingGameUI:
 
 
 
+def bench_startup(runs=5):
+    """Time, in fresh interpreters, what the menu waits for vs. what is deferred."""
+    cases = [
+        ("launcher (menu)", "import start"),
+        ("game modules (deferred)", "import game, game_v2"),
+    ]
+    for label, stmt in cases:
+        code = f"import time; t = time.perf_counter(); {stmt}; print(time.perf_counter() - t)"
+        times = sorted(float(subprocess.check_output([sys.executable, "-c", code], text=True))
+                       for _ in range(runs))
+        print(f"{label:<26} median {times[runs // 2] * 1000:8.1f} ms   best {times[0] * 1000:8.1f} ms")
+
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = TradingGameUI(root)
-    root.mainloop()
+    # Startup benchmark: python start.py bench
+    if "bench" in sys.argv:
+        bench_startup()
+    else:
+        root = tk.Tk()
+        app = TradingGameUI(root)
+        root.mainloop()
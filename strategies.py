@@ -0,0 +1,86 @@
+"""Scripted trading strategies for headless sessions.
+
+A strategy is called as strategy(engine, tick) after every simulated day
+(see SimulationEngine.run) and trades through engine.buy / engine.sell /
+engine.close, under the same 10% margin and one-position rules as a player.
+
+Stateful strategies are classes: montecarlo.py and backtest.py create a fresh
+instance per session, passing the lot size as ``qty`` (backtest.py also the
+grid's other parameters as keywords). Stateless ones can be plain functions.
+"""
+from news import CATALOG
+
+
+def never_trade(engine, tick):
+    """Baseline: stay flat all year."""
+
+
+class BuyAndHold:
+    """Go long on the first day and hold to the end."""
+    def __init__(self, qty=1):
+        self.qty = qty
+
+    def __call__(self, engine, tick):
+        if engine.account.position == 0 and tick.idx == 0:
+            engine.buy(self.qty)
+
+
+class Momentum:
+    """Hold the side of the last `lookback` days' move; flip when it changes sign."""
+    def __init__(self, qty=1, lookback=10):
+        self.qty = qty
+        self.lookback = lookback
+
+    def __call__(self, engine, tick):
+        prices = engine.price_history.view()
+        if len(prices) <= self.lookback:
+            return
+        side = 1 if prices[-1] > prices[-1 - self.lookback] else -1
+        position = engine.account.position
+        if position * side > 0:
+            return
+        if position != 0:
+            engine.close()
+        (engine.buy if side > 0 else engine.sell)(self.qty)
+
+
+class MeanReversion:
+    """Fade moves away from the moving average: short above +band, long below -band, exit at the mean."""
+    def __init__(self, qty=1, window=20, band=0.03):
+        self.qty = qty
+        self.window = window
+        self.band = band
+
+    def __call__(self, engine, tick):
+        prices = engine.price_history.view()
+        if len(prices) < self.window:
+            return
+        deviation = prices[-1] / prices[-self.window:].mean() - 1.0
+        position = engine.account.position
+        if position == 0:
+            if deviation > self.band:
+                engine.sell(self.qty)
+            elif deviation < -self.band:
+                engine.buy(self.qty)
+        elif position > 0 and deviation >= 0 or position < 0 and deviation <= 0:
+            engine.close()
+
+
+class NewsTrader:
+    """Trade in the direction of each priced news event and exit after `hold` days."""
+    def __init__(self, qty=1, hold=3):
+        self.qty = qty
+        self.hold = hold
+        self.opened = None
+
+    def __call__(self, engine, tick):
+        if self.opened is not None and tick.idx - self.opened >= self.hold:
+            engine.close()
+            self.opened = None
+        if tick.news_id < 0 or engine.account.position != 0:
+            return
+        multiplier = CATALOG.multipliers[tick.news_id]
+        if multiplier != 1.0:
+            _msg, ok = (engine.buy if multiplier > 1.0 else engine.sell)(self.qty)
+            if ok:
+                self.opened = tick.idx
@@ -0,0 +1,48 @@
+"""Frame-batched view updates for the Tk games.
+
+The engine notifies its observers after every step and every trade. Redrawing
+labels and the chart on each notification wastes work when several arrive
+between two frames (a trade right after a tick, or several days per frame
+when fast-forwarding). FrameBatcher keeps only the latest notification and
+renders it once, from Tk's idle queue.
+"""
+
+
+class FrameBatcher:
+    """Coalesce notify(*args) calls into at most one render(*args) per frame.
+
+    Args:
+        root (tk.Tk): Widget whose event loop schedules the render.
+        render (callable): Called with the arguments of the latest notify().
+    """
+    def __init__(self, root, render):
+        self.root = root
+        self.render = render
+        self._args = None
+        self._pending = None       # after_idle id while a render is scheduled
+        self.notifies = 0
+        self.renders = 0
+
+    def notify(self, *args):
+        """Record the latest state; schedule a render if none is pending."""
+        self.notifies += 1
+        self._args = args
+        if self._pending is None:
+            self._pending = self.root.after_idle(self.flush)
+
+    def flush(self):
+        """Render the latest state now (no-op if nothing changed since the last render)."""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        args, self._args = self._args, None
+        if args is not None:
+            self.renders += 1
+            self.render(*args)
+
+    def cancel(self):
+        """Drop any pending render, e.g. before the window is destroyed."""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        self._args = None